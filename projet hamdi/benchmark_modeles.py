@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Mesure du coût de construction des objets Livre et Emprunt lus en base.
+
+Compare l'ancienne représentation (attributs dans un __dict__, validation
+des dates à chaque construction) à la représentation actuelle (__slots__ et
+constructeur depuis_base sans validation).
+
+Emprunt.depuis_base n'est pas plus rapide que l'ancien Emprunt : lu en base,
+celui-ci recevait déjà ses dates et ne les analysait pas, et depuis_base
+renseigne neuf attributs (retard, lecteur et exemplaire compris) contre six.
+Le gain est ailleurs : environ 20 % de mémoire en moins par objet, et un
+retard calculé en SQL au lieu d'analyser les dates à chaque consultation.
+Usage:
+    python benchmark_modeles.py [nombre_objets]   # 200000 par défaut
+"""
+
+import gc
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from models.livre import Livre
+from models.emprunt import Emprunt
+
+class LivreAvant:
+    """Livre tel qu'il était construit avant : __dict__ et validation systématique."""
+    
+    def __init__(self, titre, auteur, date_publication, id=None):
+        self.id = id
+        self.titre = titre
+        self.auteur = auteur
+        self.date_publication = date_publication
+        datetime.strptime(self.date_publication, "%d/%m/%Y")
+
+class EmpruntAvant:
+    """Emprunt tel qu'il était construit avant : __dict__ et dates recalculées si absentes."""
+    
+    def __init__(self, livre_id, emprunteur, date_emprunt=None, date_retour_prevue=None,
+                 date_retour_reelle=None, id=None):
+        self.id = id
+        self.livre_id = livre_id
+        self.emprunteur = emprunteur
+        self.date_emprunt = date_emprunt or datetime.now().strftime("%d/%m/%Y")
+        if date_retour_prevue is None:
+            date_emp = datetime.strptime(self.date_emprunt, "%d/%m/%Y")
+            date_retour_prevue = (date_emp + timedelta(days=14)).strftime("%d/%m/%Y")
+        self.date_retour_prevue = date_retour_prevue
+        self.date_retour_reelle = date_retour_reelle
+
+def mesurer(nom, construire, lignes, repetitions=5):
+    """Affiche le débit de construction (meilleure de plusieurs mesures) et la mémoire occupée par objet."""
+    duree = float("inf")
+    for _ in range(repetitions):
+        gc.collect()
+        debut = time.perf_counter()
+        for ligne in lignes:
+            construire(ligne)
+        duree = min(duree, time.perf_counter() - debut)
+    
+    gc.collect()
+    tracemalloc.start()
+    objets = [construire(ligne) for ligne in lignes]
+    memoire = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # La liste elle-même coûte un pointeur par objet
+    octets = memoire / len(objets) - 8
+    del objets
+    
+    print(f"{nom:32} {len(lignes) / duree:12,.0f} objets/s {octets:8.0f} octets/objet")
+
+def main():
+    nombre = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    lignes_livres = [(i, f"Titre {i}", f"Auteur {i % 1000}", f"{1 + i % 28:02d}/{1 + i % 12:02d}/{1900 + i % 120}")
+                     for i in range(nombre)]
+    lignes_emprunts = [(i, i, f"Lecteur {i % 500}", "01/02/2024", "15/02/2024", None)
+                       for i in range(nombre)]
+    
+    print(f"Construction de {nombre} objets :")
+    mesurer("Livre (avant)", lambda l: LivreAvant(l[1], l[2], l[3], l[0]), lignes_livres)
+    mesurer("Livre.depuis_base", lambda l: Livre.depuis_base(*l), lignes_livres)
+    mesurer("Emprunt (avant)", lambda l: EmpruntAvant(l[1], l[2], l[3], l[4], l[5], l[0]), lignes_emprunts)
+    mesurer("Emprunt.depuis_base", lambda l: Emprunt.depuis_base(*l), lignes_emprunts)
+    print("(Emprunt.depuis_base renseigne 9 attributs contre 6 pour l'ancien Emprunt : "
+          "construction plus lente, mémoire réduite)")
+
+if __name__ == "__main__":
+    main()
@@ -1,76 +1,71 @@
 #!/usr/bin/env python3
 """
-Script pour vérifier et nettoyer la base de données
+Script pour vérifier et nettoyer la base de données.
+
+Par défaut, le script ne modifie rien : il affiche ce qu'il corrigerait
+(dates invalides, titres et auteurs mal formés, doublons, emprunts et
+exemplaires orphelins). Avec --appliquer, les corrections sont faites sur
+place en une seule transaction (voir models.nettoyage).
+Usage:
+    python clean_database.py [chemin_base] [--appliquer] [--rapport fichier.json]
+                             [--processus N] [--taille-lot N]
+        chemin_base    database.db par défaut
+        --appliquer    applique les corrections
+        --rapport      écrit le rapport détaillé au format JSON
+        --processus    nombre de processus de contrôle des livres (0 par défaut)
+        --taille-lot   nombre de livres par lot (10000 par défaut)
 """
 
+import json
 import sqlite3
-from datetime import datetime
+import sys
+from models.bibliotheque import Bibliotheque
+from models.nettoyage import nettoyer
+
+def main(arguments):
+    db_path = "database.db"
+    corriger = False
+    chemin_rapport = None
+    processus = 0
+    taille_lot = 10000
+    try:
+        while arguments:
+            argument = arguments.pop(0)
+            if argument == "--appliquer":
+                corriger = True
+            elif argument == "--rapport":
+                chemin_rapport = arguments.pop(0)
+            elif argument == "--processus":
+                processus = int(arguments.pop(0))
+            elif argument == "--taille-lot":
+                taille_lot = int(arguments.pop(0))
+            else:
+                db_path = argument
+    except (IndexError, ValueError):
+        print(__doc__)
+        return
 
-def nettoyer_base_donnees():
+    bibliotheque = None
     try:
-        # Connexion à la base de données
-        conn = sqlite3.connect("database.db")
-        cursor = conn.cursor()
-        
-        # Créer une nouvelle base de données propre
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS livres_clean (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                titre TEXT NOT NULL,
-                auteur TEXT NOT NULL,
-                date_publication TEXT NOT NULL
-            )
-        ''')
-        
-        # Lire les données existantes
-        cursor.execute("SELECT * FROM livres")
-        livres = cursor.fetchall()
-        
-        print(f"Nombre total de livres : {len(livres)}")
-        
-        # Vérifier et corriger chaque entrée
-        for livre in livres:
-            id, titre, auteur, date = livre
-            print(f"\nTraitement du livre {id}:")
-            print(f"Titre: {titre}")
-            print(f"Auteur: {auteur}")
-            print(f"Date actuelle: {date}")
-            
-            try:
-                # Essayer de parser la date
-                datetime.strptime(date, "%d/%m/%Y")
-                date_valide = date
-            except ValueError:
-                # Si la date est invalide, créer une date par défaut
-                print(f"Date invalide détectée : {date}")
-                date_valide = "01/01/2000"
-                print(f"Utilisation de la date par défaut : {date_valide}")
-            
-            # Insérer les données corrigées
-            cursor.execute(
-                "INSERT INTO livres_clean (id, titre, auteur, date_publication) VALUES (?, ?, ?, ?)",
-                (id, titre, auteur, date_valide)
-            )
-        
-        # Sauvegarder l'ancienne table
-        cursor.execute("ALTER TABLE livres RENAME TO livres_backup")
-        
-        # Mettre en place la nouvelle table
-        cursor.execute("ALTER TABLE livres_clean RENAME TO livres")
-        
-        # Valider les changements
-        conn.commit()
-        print("\nNettoyage de la base de données terminé avec succès!")
-        
-    except sqlite3.Error as e:
+        bibliotheque = Bibliotheque(db_path)
+        rapport = nettoyer(bibliotheque, corriger, processus, taille_lot)
+    except (sqlite3.Error, ValueError) as e:
         print(f"Erreur SQLite : {e}")
-    except Exception as e:
-        print(f"Erreur inattendue : {e}")
+        return
     finally:
-        if conn:
-            conn.close()
+        if bibliotheque:
+            bibliotheque.deconnecter()
+
+    print(rapport)
+    if not corriger and (rapport.corrections or rapport.doublons or rapport.emprunts_orphelins
+                         or rapport.exemplaires_orphelins):
+        print("Aucune modification faite : relancez avec --appliquer pour corriger.")
+    if chemin_rapport:
+        with open(chemin_rapport, "w", encoding="utf-8") as fichier:
+            json.dump(rapport.vers_dict(), fichier, ensure_ascii=False, indent=2)
+        print(f"Rapport détaillé écrit dans {chemin_rapport}")
 
 if __name__ == "__main__":
     print("Début du nettoyage de la base de données...")
-    nettoyer_base_donnees()
-    print("Nettoyage terminé.") 
\ No newline at end of file
+    main(sys.argv[1:])
+    print("Nettoyage terminé.")
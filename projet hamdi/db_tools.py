@@ -3,43 +3,91 @@
 Utilitaire en ligne de commande pour gérer la base de données de la bibliothèque.
 Usage:
     python db_tools.py list                    # Liste tous les livres
-    python db_tools.py add titre auteur année  # Ajoute un livre
-    python db_tools.py delete id               # Supprime un livre par son ID
+    python db_tools.py history [livre_id]      # Affiche l'historique des emprunts
+    python db_tools.py add titre auteur date   # Ajoute un livre (date JJ/MM/AAAA ou année)
+    python db_tools.py delete id [--archiver]  # Supprime un livre par son ID en archivant ses emprunts
+                                               # (refusé s'il est emprunté, sauf avec --archiver)
+    python db_tools.py copies id [nombre]      # Ajoute des exemplaires d'un livre (1 par défaut)
     python db_tools.py search terme            # Recherche des livres
     python db_tools.py clear                   # Vide la base de données
+    python db_tools.py check-index [base]      # Liste les index manquants
+    python db_tools.py import fichier          # Importe un catalogue (.csv ou .jsonl)
+    python db_tools.py export jeu fichier [--since id]
+                                               # Exporte livres, emprunts (en cours) ou historique
+                                               # (.csv, .jsonl, .csv.gz, .jsonl.gz ou .parquet)
+    python db_tools.py diag                    # Affiche les réglages de la connexion
+    python db_tools.py stats [--recalculer]    # Affiche les statistiques de circulation
+    python db_tools.py sweep [--archiver]      # Supprime (ou archive) les emprunts de livres supprimés
+    python db_tools.py archive [jours]         # Archive les emprunts retournés depuis plus de N jours
+                                               # (365 par défaut)
 """
 
+import sqlite3
 import sys
-from models.bibliotheque import Bibliotheque
+from models.bibliotheque import Bibliotheque, AGE_ARCHIVAGE
 from models.livre import Livre
+from models.catalogue import lire_catalogue
+from models.export import exporter
+from models.schema import index_manquants, TABLES_RESUME
+from models.statistiques import Statistiques
 
 def afficher_aide():
     print(__doc__)
 
 def lister_livres(bibliotheque):
-    """Affiche tous les livres de la base de données."""
-    livres = bibliotheque.obtenir_tous_les_livres()
-    if not livres:
+    """Affiche tous les livres de la base de données (lus au fil de l'eau)."""
+    nb_livres = 0
+    for livre in bibliotheque.iter_livres():
+        if nb_livres == 0:
+            print("\nListe des livres :")
+            print("-" * 76)
+            print(f"{'ID':4} | {'Titre':25} | {'Auteur':20} | {'Date':10} | {'Dispo':9}")
+            print("-" * 76)
+        dispo = f"{livre.exemplaires_disponibles}/{livre.nombre_exemplaires}"
+        print(f"{livre.id:4} | {livre.titre[:25]:25} | {livre.auteur[:20]:20} | "
+              f"{livre.date_publication:10} | {dispo:9}")
+        nb_livres += 1
+    
+    if nb_livres == 0:
         print("Aucun livre dans la base de données.")
         return
+    print("-" * 76)
+
+def afficher_historique(bibliotheque, livre_id=None):
+    """Affiche l'historique des emprunts (lu au fil de l'eau)."""
+    try:
+        livre_id = int(livre_id) if livre_id is not None else None
+    except ValueError:
+        print("Erreur : L'ID doit être un nombre entier.")
+        return
     
-    print("\nListe des livres :")
-    print("-" * 60)
-    print(f"{'ID':4} | {'Titre':25} | {'Auteur':20} | {'Année':6}")
-    print("-" * 60)
-    for livre in livres:
-        print(f"{livre.id:4} | {livre.titre[:25]:25} | {livre.auteur[:20]:20} | {livre.annee:6}")
-    print("-" * 60)
+    nb_emprunts = 0
+    for emprunt, livre in bibliotheque.iter_historique(livre_id):
+        if nb_emprunts == 0:
+            print("\nHistorique des emprunts :")
+            print("-" * 88)
+            print(f"{'ID':5} | {'Livre':25} | {'Emprunteur':20} | {'Emprunté le':11} | {'Retourné le':11}")
+            print("-" * 88)
+        retour = emprunt.date_retour_reelle or "-"
+        print(f"{emprunt.id:5} | {livre.titre[:25]:25} | {emprunt.emprunteur[:20]:20} | "
+              f"{emprunt.date_emprunt:11} | {retour:11}")
+        nb_emprunts += 1
+    
+    if nb_emprunts == 0:
+        print("Aucun emprunt trouvé.")
+        return
+    print("-" * 88)
 
-def ajouter_livre(bibliotheque, titre, auteur, annee):
-    """Ajoute un nouveau livre."""
+def ajouter_livre(bibliotheque, titre, auteur, date):
+    """Ajoute un nouveau livre (une année seule est datée du 1er janvier)."""
     try:
-        annee = int(annee)
-        livre = Livre(titre=titre, auteur=auteur, annee=annee)
+        if date.isdigit():
+            date = f"01/01/{int(date):04d}"
+        livre = Livre(titre=titre, auteur=auteur, date_publication=date)
         id = bibliotheque.ajouter_livre(livre)
         print(f"Livre ajouté avec succès ! ID: {id}")
-    except ValueError:
-        print("Erreur : L'année doit être un nombre entier.")
+    except ValueError as e:
+        print(f"Erreur : {e}")
     except Exception as e:
         print(f"Erreur lors de l'ajout du livre : {e}")
 
@@ -47,12 +95,24 @@ def supprimer_livre(bibliotheque, id):
     """Supprime un livre par son ID."""
     try:
         id = int(id)
+    except ValueError:
+        print("Erreur : L'ID doit être un nombre entier.")
+        return
+    try:
         if bibliotheque.supprimer_livre(id):
             print(f"Livre avec ID {id} supprimé avec succès !")
         else:
             print(f"Aucun livre trouvé avec l'ID {id}")
-    except ValueError:
-        print("Erreur : L'ID doit être un nombre entier.")
+    except ValueError as e:
+        print(f"Erreur : {e} (--archiver pour le supprimer en archivant ses emprunts en cours)")
+
+def ajouter_exemplaires(bibliotheque, id, nombre="1"):
+    """Ajoute des exemplaires d'un livre."""
+    try:
+        ids = bibliotheque.ajouter_exemplaires(int(id), int(nombre))
+        print(f"{len(ids)} exemplaire(s) ajouté(s) au livre {id} : {', '.join(map(str, ids))}")
+    except ValueError as e:
+        print(f"Erreur : {e}")
 
 def rechercher_livres(bibliotheque, terme):
     """Recherche des livres par titre ou auteur."""
@@ -62,44 +122,229 @@ def rechercher_livres(bibliotheque, terme):
         return
     
     print(f"\nRésultats de recherche pour '{terme}' :")
-    print("-" * 60)
-    print(f"{'ID':4} | {'Titre':25} | {'Auteur':20} | {'Année':6}")
-    print("-" * 60)
+    print("-" * 64)
+    print(f"{'ID':4} | {'Titre':25} | {'Auteur':20} | {'Date':10}")
+    print("-" * 64)
     for livre in livres:
-        print(f"{livre.id:4} | {livre.titre[:25]:25} | {livre.auteur[:20]:20} | {livre.annee:6}")
-    print("-" * 60)
+        print(f"{livre.id:4} | {livre.titre[:25]:25} | {livre.auteur[:20]:20} | {livre.date_publication:10}")
+    print("-" * 64)
+
+def importer_catalogue(bibliotheque, chemin):
+    """Importe un catalogue CSV ou JSON Lines en masse."""
+    try:
+        lignes = lire_catalogue(chemin)
+    except ValueError as e:
+        print(f"Erreur : {e}")
+        return
+    
+    def afficher_progression(rapport):
+        print(f"\r{rapport.lignes_lues} ligne(s) traitée(s), {rapport.inseres} insérée(s), "
+              f"{rapport.debit:.0f} lignes/s", end="", flush=True)
+    
+    try:
+        rapport = bibliotheque.ajouter_livres(lignes, progression=afficher_progression)
+    except OSError as e:
+        print(f"Erreur lors de la lecture du fichier : {e}")
+        return
+    except ValueError as e:
+        print(f"Erreur : {e}")
+        return
+    print()
+    print(rapport)
+    
+    max_erreurs = 20
+    for numero, message in rapport.erreurs[:max_erreurs]:
+        print(f"  ligne {numero} : {message}")
+    if len(rapport.erreurs) > max_erreurs:
+        print(f"  ... et {len(rapport.erreurs) - max_erreurs} autre(s) erreur(s)")
+
+def exporter_donnees(bibliotheque, jeu, chemin, *options):
+    """Exporte un jeu de données en flux (option --since id pour un export incrémental)."""
+    depuis = None
+    if options:
+        if len(options) != 2 or options[0] != "--since" or not options[1].isdigit():
+            afficher_aide()
+            return
+        depuis = int(options[1])
+    
+    def afficher_progression(rapport):
+        print(f"\r{rapport.lignes} ligne(s) exportée(s), {rapport.debit:.0f} lignes/s",
+              end="", flush=True)
+    
+    try:
+        rapport = exporter(bibliotheque, jeu, chemin, depuis, progression=afficher_progression)
+    except (ValueError, OSError) as e:
+        print(f"Erreur : {e}")
+        return
+    print()
+    print(rapport)
+    if rapport.dernier_id is not None:
+        print(f"Export suivant : --since {rapport.dernier_id}")
+
+def afficher_diagnostic(bibliotheque):
+    """Affiche le profil de connexion et les réglages SQLite effectifs."""
+    print("\nDiagnostic de la connexion :")
+    print("-" * 40)
+    for cle, valeur in bibliotheque.diagnostic().items():
+        print(f"{cle:22} : {valeur}")
+    print("-" * 40)
+
+def afficher_statistiques(bibliotheque, recalculer=False):
+    """Affiche les statistiques de circulation (résumés recalculés si demandé)."""
+    statistiques = Statistiques(bibliotheque)
+    if recalculer and statistiques.resumes:
+        statistiques.recalculer()
+    tableau = statistiques.tableau_de_bord()
+    
+    print("\nStatistiques de circulation :")
+    print("-" * 40)
+    print(f"{'Emprunts':22} : {tableau['emprunts']}")
+    print(f"{'Retours':22} : {tableau['retours']}")
+    print(f"{'En cours':22} : {tableau['en_cours']}")
+    print(f"{'En retard':22} : {tableau['en_retard']}")
+    duree = tableau["duree_moyenne"]
+    print(f"{'Durée moyenne':22} : {'-' if duree is None else f'{duree:.1f} jours'}")
+    
+    print("\nLivres les plus empruntés :")
+    for livre, nombre in tableau["livres_les_plus_empruntes"]:
+        print(f"  {nombre:5} | {livre.titre[:30]:30} | {livre.auteur[:20]}")
+    
+    print("\nEmprunts par mois :")
+    for mois, nombre in tableau["emprunts_par_mois"]:
+        print(f"  {mois} | {nombre}")
+    
+    print("\nEmprunteurs actifs :")
+    for emprunteur, en_cours in tableau["emprunteurs_actifs"]:
+        print(f"  {en_cours:5} | {emprunteur}")
+    print("-" * 40)
+
+def balayer_orphelins(bibliotheque):
+    """Supprime par lots les emprunts dont le livre n'existe plus."""
+    def afficher_progression(dernier_id, total):
+        print(f"\rEmprunts examinés jusqu'à l'ID {dernier_id}, {total} orphelin(s) supprimé(s)",
+              end="", flush=True)
+    
+    total = bibliotheque.balayer_orphelins(progression=afficher_progression)
+    print()
+    action = "archivé(s) puis supprimé(s)" if bibliotheque.suppression == "archiver" else "supprimé(s)"
+    print(f"{total} emprunt(s) orphelin(s) {action}")
+
+def archiver_historique(bibliotheque, jours=None):
+    """Déplace par lots dans l'archive les emprunts retournés depuis longtemps."""
+    try:
+        age_jours = int(jours) if jours is not None else AGE_ARCHIVAGE
+        if age_jours < 0:
+            raise ValueError
+    except ValueError:
+        print("Erreur : Le nombre de jours doit être un entier positif.")
+        return
+    
+    def afficher_progression(dernier_id, total):
+        print(f"\rEmprunts examinés jusqu'à l'ID {dernier_id}, {total} archivé(s)",
+              end="", flush=True)
+    
+    total = bibliotheque.archiver_historique(age_jours, progression=afficher_progression)
+    print()
+    print(f"{total} emprunt(s) retourné(s) depuis plus de {age_jours} jour(s) archivé(s)")
 
 def vider_base_donnees(bibliotheque):
     """Vide complètement la base de données."""
     try:
+        # Les emprunts (et leur archive) d'abord : les clés étrangères interdisent de laisser des orphelins
+        bibliotheque.cursor.execute("DELETE FROM emprunts_archive")
+        bibliotheque.cursor.execute("DELETE FROM emprunts")
         bibliotheque.cursor.execute("DELETE FROM livres")
+        # Les résumés statistiques gardent les emprunts archivés : ils sont vidés aussi
+        tables = {nom for (nom,) in bibliotheque.cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table'"
+        )}
+        for table in TABLES_RESUME:
+            if table in tables:
+                bibliotheque.cursor.execute(f"DELETE FROM {table}")
         bibliotheque.conn.commit()
         print("Base de données vidée avec succès !")
     except Exception as e:
         print(f"Erreur lors de la suppression des données : {e}")
 
-def main():
-    bibliotheque = Bibliotheque()
+def verifier_index(db_path="database.db"):
+    """
+    Signale les index manquants d'une base existante.
+    
+    La base est ouverte en lecture seule : contrairement à Bibliotheque,
+    la vérification ne crée pas les index manquants.
+    """
+    try:
+        conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    except sqlite3.Error as e:
+        print(f"Impossible d'ouvrir {db_path} : {e}")
+        return
+    try:
+        manquants = index_manquants(conn)
+    finally:
+        conn.close()
     
+    if not manquants:
+        print("Tous les index sont présents.")
+        return
+    print(f"{len(manquants)} index manquant(s) :")
+    for nom in manquants:
+        print(f"  - {nom}")
+    print("Ils seront créés au prochain démarrage de l'application.")
+
+def main():
     if len(sys.argv) < 2:
         afficher_aide()
         return
     
     commande = sys.argv[1].lower()
     
+    if commande == "check-index":
+        verifier_index(*sys.argv[2:3])
+        return
+    
+    # Politique de suppression choisie par l'option --archiver (delete, sweep)
+    archiver = commande in ("delete", "sweep") and "--archiver" in sys.argv[2:]
+    if archiver:
+        sys.argv.remove("--archiver")
+    bibliotheque = Bibliotheque(suppression="archiver" if archiver else "bloquer")
+    
     try:
         if commande == "list":
             lister_livres(bibliotheque)
         
+        elif commande == "history" and len(sys.argv) <= 3:
+            afficher_historique(bibliotheque, *sys.argv[2:3])
+        
         elif commande == "add" and len(sys.argv) >= 5:
             ajouter_livre(bibliotheque, sys.argv[2], sys.argv[3], sys.argv[4])
         
         elif commande == "delete" and len(sys.argv) == 3:
             supprimer_livre(bibliotheque, sys.argv[2])
         
+        elif commande == "copies" and len(sys.argv) in (3, 4):
+            ajouter_exemplaires(bibliotheque, *sys.argv[2:4])
+        
         elif commande == "search" and len(sys.argv) == 3:
             rechercher_livres(bibliotheque, sys.argv[2])
         
+        elif commande == "import" and len(sys.argv) == 3:
+            importer_catalogue(bibliotheque, sys.argv[2])
+        
+        elif commande == "export" and len(sys.argv) >= 4:
+            exporter_donnees(bibliotheque, *sys.argv[2:])
+        
+        elif commande == "diag":
+            afficher_diagnostic(bibliotheque)
+        
+        elif commande == "stats" and sys.argv[2:] in ([], ["--recalculer"]):
+            afficher_statistiques(bibliotheque, recalculer=len(sys.argv) == 3)
+        
+        elif commande == "sweep" and len(sys.argv) == 2:
+            balayer_orphelins(bibliotheque)
+        
+        elif commande == "archive" and len(sys.argv) <= 3:
+            archiver_historique(bibliotheque, *sys.argv[2:3])
+        
         elif commande == "clear":
             confirmation = input("Êtes-vous sûr de vouloir vider la base de données ? (oui/non) : ")
             if confirmation.lower() == "oui":
@@ -7,6 +7,8 @@ import sqlite3
 import os
 from datetime import datetime
 import time
+from models.schema import ecrire_version
+from models.migrations import migrer
 
 def initialiser_base_donnees():
     # Essayer de supprimer l'ancienne base de données
@@ -26,6 +28,7 @@ def initialiser_base_donnees():
         # Supprimer les tables si elles existent
         cursor.execute("DROP TABLE IF EXISTS emprunts")
         cursor.execute("DROP TABLE IF EXISTS livres")
+        ecrire_version(conn, 0)
         
         # Créer la table des livres avec contrainte d'unicité
         cursor.execute('''
@@ -70,6 +73,9 @@ def initialiser_base_donnees():
         
         # Valider les changements
         conn.commit()
+        
+        # Mettre le schéma à la dernière version (dates ISO, lecteurs, exemplaires, index)
+        migrer(conn)
         print("Base de données initialisée avec succès!")
         print(f"Nombre de livres ajoutés : {len(livres_test)}")
         
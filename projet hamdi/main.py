@@ -8,8 +8,8 @@ from views.interface_graphique import InterfaceGraphique
 
 def main():
     """Fonction principale de l'application."""
-    # Création de l'instance de la bibliothèque
-    bibliotheque = Bibliotheque()
+    # Création de l'instance de la bibliothèque (seule à écrire : cache activé)
+    bibliotheque = Bibliotheque(cache=True)
     
     # Création et démarrage de l'interface graphique
     interface = InterfaceGraphique(bibliotheque)
@@ -1,72 +1,94 @@
 #!/usr/bin/env python3
 """
-Script de migration pour transférer les données de bibliotheque.db vers database.db
+Script de migration : met le schéma de la base de données à jour et, sur
+demande, y reprend les livres d'une ancienne base (colonne annee).
+
+La mise à jour est faite par lots, chaque lot validé avec son point de
+reprise : un script interrompu reprend là où il s'était arrêté.
+Usage:
+    python migrate_db.py [chemin_base] [--depuis ancienne_base] [--taille-lot N]
+        chemin_base    database.db par défaut
+        --depuis       ancienne base dont les livres sont repris (data/bibliotheque.db
+                       s'il existe et qu'aucune n'est indiquée)
+        --taille-lot   nombre de lignes par transaction (50000 par défaut)
 """
 
-import sqlite3
 import os
+import sqlite3
+import sys
+from models.migrations import migrer
+
+ANCIENNE_BASE = "data/bibliotheque.db"
+
+def reprendre_ancienne_base(conn: sqlite3.Connection, chemin: str) -> int:
+    """
+    Copie les livres d'une ancienne base (titre, auteur, annee) par une seule
+    requête INSERT ... SELECT. Les livres déjà présents sont ignorés : la
+    reprise peut être relancée.
+
+    Args:
+        conn (sqlite3.Connection): Connexion à la base à jour
+        chemin (str): Chemin de l'ancienne base
 
-def migrer_donnees():
-    # Vérifier si l'ancienne base de données existe
-    ancien_chemin = "data/bibliotheque.db"
-    if not os.path.exists(ancien_chemin):
-        print("Aucune ancienne base de données trouvée.")
+    Returns:
+        int: Nombre de livres copiés
+    """
+    conn.execute("ATTACH DATABASE ? AS ancienne", (chemin,))
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        curseur = conn.execute("""
+            INSERT INTO livres (titre, auteur, date_publication)
+            SELECT titre, auteur, printf('%04d-01-01', annee) FROM ancienne.livres
+            WHERE true
+            ON CONFLICT (titre, auteur) DO NOTHING
+        """)
+        conn.commit()
+        return curseur.rowcount
+    except sqlite3.Error:
+        conn.rollback()
+        raise
+    finally:
+        conn.execute("DETACH DATABASE ancienne")
+
+def afficher_progression(rapport):
+    print(f"\r{rapport.lignes} ligne(s), {rapport.lots} lot(s), {rapport.debit:.0f} lignes/s",
+          end="", flush=True)
+
+def main(arguments):
+    db_path = "database.db"
+    ancienne = ANCIENNE_BASE if os.path.exists(ANCIENNE_BASE) else None
+    taille_lot = 50000
+    try:
+        while arguments:
+            argument = arguments.pop(0)
+            if argument == "--depuis":
+                ancienne = arguments.pop(0)
+            elif argument == "--taille-lot":
+                taille_lot = int(arguments.pop(0))
+            else:
+                db_path = argument
+    except (IndexError, ValueError):
+        print(__doc__)
         return
 
-    # Connexion aux deux bases de données
+    conn = None
     try:
-        ancien_db = sqlite3.connect(ancien_chemin)
-        nouveau_db = sqlite3.connect("database.db")
-        
-        # Copier les données
-        ancien_cursor = ancien_db.cursor()
-        nouveau_cursor = nouveau_db.cursor()
-        
-        # Créer la table dans la nouvelle base de données si elle n'existe pas
-        nouveau_cursor.execute('''
-            CREATE TABLE IF NOT EXISTS livres (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                titre TEXT NOT NULL,
-                auteur TEXT NOT NULL,
-                annee INTEGER NOT NULL
-            )
-        ''')
-        
-        # Récupérer les données de l'ancienne base
-        ancien_cursor.execute("SELECT titre, auteur, annee FROM livres")
-        livres = ancien_cursor.fetchall()
-        
-        if not livres:
-            print("Aucune donnée trouvée dans l'ancienne base de données.")
-            return
-        
-        # Insérer les données dans la nouvelle base
-        for livre in livres:
-            nouveau_cursor.execute(
-                "INSERT INTO livres (titre, auteur, annee) VALUES (?, ?, ?)",
-                livre
-            )
-        
-        # Valider les changements
-        nouveau_db.commit()
-        
-        print(f"{len(livres)} livre(s) transféré(s) avec succès!")
-        
-        # Fermer les connexions
-        ancien_db.close()
-        nouveau_db.close()
-        
-        # Sauvegarder l'ancienne base de données avec un nouveau nom
-        backup_path = "data/bibliotheque.db.backup"
-        os.rename(ancien_chemin, backup_path)
-        print(f"L'ancienne base de données a été sauvegardée sous : {backup_path}")
-        
-    except sqlite3.Error as e:
-        print(f"Erreur lors de la migration : {e}")
-    except Exception as e:
-        print(f"Erreur inattendue : {e}")
+        conn = sqlite3.connect(db_path)
+        rapport = migrer(conn, taille_lot, afficher_progression)
+        if rapport.lots:
+            print()
+        print(rapport)
+
+        if ancienne:
+            nb_livres = reprendre_ancienne_base(conn, ancienne)
+            print(f"{nb_livres} livre(s) repris de {ancienne}")
+    except (sqlite3.Error, ValueError) as e:
+        print(f"\nErreur lors de la migration : {e}")
+    finally:
+        if conn:
+            conn.close()
 
 if __name__ == "__main__":
-    print("Début de la migration des données...")
-    migrer_donnees()
-    print("Migration terminée.") 
\ No newline at end of file
+    print("Début de la migration...")
+    main(sys.argv[1:])
+    print("Migration terminée.")
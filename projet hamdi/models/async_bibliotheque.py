@@ -0,0 +1,249 @@
+"""
+Façade asyncio de la bibliothèque, pour un service web asynchrone.
+
+Les opérations de Bibliotheque restent bloquantes : elles sont exécutées
+dans un ensemble borné de threads, sur les connexions de la réserve
+(models.pool). Deux sémaphores protègent la boucle d'événements :
+    - max_en_attente limite le nombre d'opérations acceptées en même temps ;
+      au-delà, les appelants attendent (contre-pression) ou échouent après
+      delai_attente secondes ;
+    - max_ecritures limite les écritures simultanées : une seule connexion
+      écrit, les écritures en trop occuperaient des threads pour rien.
+
+Exemple:
+    async with AsyncBibliotheque("database.db") as bibliotheque:
+        livres = await bibliotheque.rechercher_livre("hugo")
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Callable, List, Optional, Tuple
+from models.bibliotheque import Bibliotheque, AGE_ARCHIVAGE
+from models.connexion import PROFIL_PAR_DEFAUT
+from models.emprunt import Emprunt
+from models.lecteur import Lecteur
+from models.livre import Livre
+
+
+class AsyncBibliotheque:
+    """
+    Version asynchrone (coroutines) des opérations de Bibliotheque.
+
+    Les blocs transaction() ne sont pas proposés : une transaction ne peut
+    pas s'étendre sur plusieurs coroutines qui s'exécutent dans des threads
+    différents.
+    """
+
+    def __init__(self, db_path: str = "database.db", lecteurs: int = 4,
+                 max_travailleurs: Optional[int] = None, max_en_attente: int = 64,
+                 max_ecritures: int = 1, delai_attente: Optional[float] = None,
+                 profil: str = PROFIL_PAR_DEFAUT, suppression: str = "bloquer"):
+        """
+        Ouvre la bibliothèque et prépare les threads d'exécution.
+
+        Args:
+            db_path (str): Chemin vers le fichier de la base de données (ou ":memory:")
+            lecteurs (int): Nombre de connexions de lecture de la réserve
+            max_travailleurs (Optional[int]): Nombre de threads (par défaut lecteurs + 1)
+            max_en_attente (int): Nombre maximal d'opérations acceptées en même temps
+            max_ecritures (int): Nombre maximal d'écritures simultanées
+            delai_attente (Optional[float]): Attente maximale d'une place, en secondes
+                (None : attendre sans limite)
+            profil (str): Profil de la connexion d'écriture (voir models.connexion)
+            suppression (str): Politique de suppression des livres empruntés
+                (voir Bibliotheque)
+        """
+        self.bibliotheque = Bibliotheque(db_path, profil=profil, lecteurs=lecteurs,
+                                         suppression=suppression)
+        self.delai_attente = delai_attente
+        self._executeur = ThreadPoolExecutor(
+            max_workers=max_travailleurs or lecteurs + 1,
+            thread_name_prefix="bibliotheque"
+        )
+        self._places = asyncio.Semaphore(max_en_attente)
+        self._ecritures = asyncio.Semaphore(max_ecritures)
+
+    async def __aenter__(self) -> "AsyncBibliotheque":
+        """Retourne l'instance pour un bloc async with."""
+        return self
+
+    async def __aexit__(self, *exc):
+        """Ferme la bibliothèque à la sortie du bloc async with."""
+        await self.fermer()
+
+    async def fermer(self):
+        """Attend la fin des opérations en cours puis ferme les connexions."""
+        await asyncio.to_thread(self._executeur.shutdown, True)
+        self.bibliotheque.deconnecter()
+
+    async def _reserver(self, semaphore: asyncio.Semaphore):
+        """
+        Attend une place dans un sémaphore.
+
+        Raises:
+            TimeoutError: Si aucune place ne s'est libérée dans le délai d'attente
+        """
+        try:
+            await asyncio.wait_for(semaphore.acquire(), self.delai_attente)
+        except asyncio.TimeoutError:
+            raise TimeoutError("La bibliothèque est surchargée, réessayez plus tard") from None
+
+    async def _executer(self, fonction: Callable, *args, ecriture: bool = False, **kwargs):
+        """
+        Exécute une méthode bloquante dans un thread d'exécution.
+
+        Args:
+            fonction (Callable): Méthode de Bibliotheque à appeler
+            ecriture (bool): L'opération modifie la base (soumise à max_ecritures)
+
+        Returns:
+            Le résultat de la méthode
+        """
+        await self._reserver(self._places)
+        try:
+            if ecriture:
+                await self._reserver(self._ecritures)
+            try:
+                boucle = asyncio.get_running_loop()
+                return await boucle.run_in_executor(self._executeur, partial(fonction, *args, **kwargs))
+            finally:
+                if ecriture:
+                    self._ecritures.release()
+        finally:
+            self._places.release()
+
+    # Écritures
+
+    async def emprunter_livre(self, livre_id: int, emprunteur: str) -> Emprunt:
+        """Voir Bibliotheque.emprunter_livre."""
+        return await self._executer(self.bibliotheque.emprunter_livre, livre_id, emprunteur,
+                                    ecriture=True)
+
+    async def retourner_livre(self, livre_id: int, exemplaire_id: Optional[int] = None) -> bool:
+        """Voir Bibliotheque.retourner_livre."""
+        return await self._executer(self.bibliotheque.retourner_livre, livre_id, exemplaire_id,
+                                    ecriture=True)
+
+    async def ajouter_exemplaires(self, livre_id: int, nombre: int = 1) -> List[int]:
+        """Voir Bibliotheque.ajouter_exemplaires."""
+        return await self._executer(self.bibliotheque.ajouter_exemplaires, livre_id, nombre,
+                                    ecriture=True)
+
+    async def retirer_exemplaire(self, exemplaire_id: int) -> bool:
+        """Voir Bibliotheque.retirer_exemplaire."""
+        return await self._executer(self.bibliotheque.retirer_exemplaire, exemplaire_id, ecriture=True)
+
+    async def ajouter_livre(self, livre: Livre) -> int:
+        """Voir Bibliotheque.ajouter_livre."""
+        return await self._executer(self.bibliotheque.ajouter_livre, livre, ecriture=True)
+
+    async def mettre_a_jour_livre(self, livre: Livre) -> bool:
+        """Voir Bibliotheque.mettre_a_jour_livre."""
+        return await self._executer(self.bibliotheque.mettre_a_jour_livre, livre, ecriture=True)
+
+    async def supprimer_livre(self, id: int) -> bool:
+        """Voir Bibliotheque.supprimer_livre."""
+        return await self._executer(self.bibliotheque.supprimer_livre, id, ecriture=True)
+
+    async def balayer_orphelins(self, taille_lot: int = 1000, pause: float = 0.0) -> int:
+        """
+        Voir Bibliotheque.balayer_orphelins.
+
+        Le balayage réserve la connexion d'écriture lot par lot : il n'occupe
+        pas de place d'écriture (max_ecritures) pendant toute sa durée.
+        """
+        return await self._executer(self.bibliotheque.balayer_orphelins, taille_lot, pause)
+
+    async def archiver_historique(self, age_jours: int = AGE_ARCHIVAGE, taille_lot: int = 1000,
+                                  pause: float = 0.0) -> int:
+        """
+        Voir Bibliotheque.archiver_historique.
+
+        Comme le balayage des orphelins, l'archivage réserve la connexion
+        d'écriture lot par lot.
+        """
+        return await self._executer(self.bibliotheque.archiver_historique, age_jours, taille_lot, pause)
+
+    async def inscrire_lecteur(self, nom: str, limite_emprunts: Optional[int] = None) -> Lecteur:
+        """Voir Bibliotheque.inscrire_lecteur."""
+        return await self._executer(self.bibliotheque.inscrire_lecteur, nom, limite_emprunts,
+                                    ecriture=True)
+
+    async def definir_limite_emprunts(self, lecteur_id: int, limite: Optional[int]) -> bool:
+        """Voir Bibliotheque.definir_limite_emprunts."""
+        return await self._executer(self.bibliotheque.definir_limite_emprunts, lecteur_id, limite,
+                                    ecriture=True)
+
+    # Lectures
+
+    async def rechercher_livre(self, terme: str, limite: Optional[int] = 100) -> List[Livre]:
+        """Voir Bibliotheque.rechercher_livre."""
+        return await self._executer(self.bibliotheque.rechercher_livre, terme, limite)
+
+    async def livre_est_disponible(self, livre_id: int) -> bool:
+        """Voir Bibliotheque.livre_est_disponible."""
+        return await self._executer(self.bibliotheque.livre_est_disponible, livre_id)
+
+    async def compter_livres(self) -> int:
+        """Voir Bibliotheque.compter_livres."""
+        return await self._executer(self.bibliotheque.compter_livres)
+
+    async def compter_emprunts_en_cours(self) -> int:
+        """Voir Bibliotheque.compter_emprunts_en_cours."""
+        return await self._executer(self.bibliotheque.compter_emprunts_en_cours)
+
+    async def trouver_lecteur(self, nom: str) -> Optional[Lecteur]:
+        """Voir Bibliotheque.trouver_lecteur."""
+        return await self._executer(self.bibliotheque.trouver_lecteur, nom)
+
+    async def obtenir_emprunts_en_cours_lecteur(self, lecteur_id: int) -> List[Tuple[Emprunt, Livre]]:
+        """Voir Bibliotheque.obtenir_emprunts_en_cours_lecteur."""
+        return await self._executer(self.bibliotheque.obtenir_emprunts_en_cours_lecteur, lecteur_id)
+
+    async def obtenir_historique_lecteur(self, lecteur_id: int,
+                                         limite: Optional[int] = None) -> List[Tuple[Emprunt, Livre]]:
+        """Voir Bibliotheque.obtenir_historique_lecteur."""
+        return await self._executer(self.bibliotheque.obtenir_historique_lecteur, lecteur_id, limite)
+
+    async def obtenir_livres_page(self, page: int = 0, taille_page: int = 50, tri: str = "id",
+                                  decroissant: bool = False) -> List[Livre]:
+        """Voir Bibliotheque.obtenir_livres_page."""
+        return await self._executer(self.bibliotheque.obtenir_livres_page,
+                                    page, taille_page, tri, decroissant)
+
+    async def obtenir_livres_apres(self, apres: Optional[str] = None, taille_page: int = 50,
+                                   tri: str = "id", decroissant: bool = False
+                                   ) -> Tuple[List[Livre], Optional[str]]:
+        """Voir Bibliotheque.obtenir_livres_apres."""
+        return await self._executer(self.bibliotheque.obtenir_livres_apres,
+                                    apres, taille_page, tri, decroissant)
+
+    async def obtenir_emprunts_en_cours_page(self, page: int = 0, taille_page: int = 50,
+                                             tri: str = "date_retour_prevue",
+                                             decroissant: bool = False) -> List[Tuple[Emprunt, Livre]]:
+        """Voir Bibliotheque.obtenir_emprunts_en_cours_page."""
+        return await self._executer(self.bibliotheque.obtenir_emprunts_en_cours_page,
+                                    page, taille_page, tri, decroissant)
+
+    async def obtenir_emprunts_en_cours_apres(self, apres: Optional[str] = None, taille_page: int = 50,
+                                              tri: str = "date_retour_prevue", decroissant: bool = False
+                                              ) -> Tuple[List[Tuple[Emprunt, Livre]], Optional[str]]:
+        """Voir Bibliotheque.obtenir_emprunts_en_cours_apres."""
+        return await self._executer(self.bibliotheque.obtenir_emprunts_en_cours_apres,
+                                    apres, taille_page, tri, decroissant)
+
+    async def obtenir_historique_page(self, page: int = 0, taille_page: int = 50,
+                                      livre_id: Optional[int] = None, tri: str = "date_emprunt",
+                                      decroissant: bool = True) -> List[Tuple[Emprunt, Livre]]:
+        """Voir Bibliotheque.obtenir_historique_page."""
+        return await self._executer(self.bibliotheque.obtenir_historique_page,
+                                    page, taille_page, livre_id, tri, decroissant)
+
+    async def obtenir_historique_apres(self, apres: Optional[str] = None, taille_page: int = 50,
+                                       livre_id: Optional[int] = None, tri: str = "date_emprunt",
+                                       decroissant: bool = True
+                                       ) -> Tuple[List[Tuple[Emprunt, Livre]], Optional[str]]:
+        """Voir Bibliotheque.obtenir_historique_apres."""
+        return await self._executer(self.bibliotheque.obtenir_historique_apres,
+                                    apres, taille_page, livre_id, tri, decroissant)
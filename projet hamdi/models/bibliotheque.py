@@ -1,239 +1,1051 @@
+import re
 import sqlite3
-from typing import List, Optional, Tuple
-from datetime import datetime
+import threading
+import time
+from contextlib import contextmanager
+from datetime import date, timedelta
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
 from models.livre import Livre
 from models.emprunt import Emprunt
+from models.lecteur import Lecteur, normaliser_nom
+from models.catalogue import RapportImport
+from models.cache import CacheLecture
+from models.evenements import Changement, INSERE, MODIFIE, SUPPRIME
+from models.dates import vers_iso, valider_dates, aujourd_hui_iso, sql_vers_affichage
+from models.schema import (index_manquants, creer_recherche_plein_texte,
+                           recherche_plein_texte_disponible, archiver_emprunts,
+                           unicite_livres_presente)
+from models.migrations import RapportMigration, migrer
+from models.connexion import lire_reglages, PROFIL_PAR_DEFAUT
+from models.pool import PoolConnexions
+from models.pagination import encoder_jeton, decoder_jeton
+
+# Colonnes lues pour construire un Livre (dates converties en JJ/MM/AAAA par SQLite),
+# compteurs d'exemplaires compris
+COLONNES_LIVRE = (
+    f"id, titre, auteur, {sql_vers_affichage('date_publication')}, "
+    f"nombre_exemplaires, exemplaires_disponibles"
+)
+
+# Colonnes lues pour construire un couple (Emprunt, Livre). La dernière est
+# l'indicateur de retard : son paramètre (date du jour, AAAA-MM-JJ) est le
+# premier de la requête
+COLONNES_EMPRUNT_LIVRE = (
+    f"e.id, e.livre_id, e.emprunteur, {sql_vers_affichage('e.date_emprunt')}, "
+    f"{sql_vers_affichage('e.date_retour_prevue')}, {sql_vers_affichage('e.date_retour_reelle')}, "
+    f"l.titre, l.auteur, {sql_vers_affichage('l.date_publication')}, "
+    f"(e.date_retour_reelle IS NULL AND e.date_retour_prevue < ?), e.lecteur_id, e.exemplaire_id"
+)
+
+# Emprunts actifs avec leur livre (source des colonnes COLONNES_EMPRUNT_LIVRE)
+EMPRUNTS_ET_LIVRES = "emprunts e JOIN livres l ON e.livre_id = l.id"
+
+# Historique complet sous l'alias e : emprunts actifs avec leur livre et
+# emprunts archivés avec le livre tel qu'il était à l'archivage
+HISTORIQUE_COMPLET = """(
+    SELECT e.id, e.livre_id, e.emprunteur, e.date_emprunt, e.date_retour_prevue,
+           e.date_retour_reelle, e.lecteur_id, e.exemplaire_id,
+           l.titre, l.auteur, l.date_publication
+    FROM emprunts e JOIN livres l ON e.livre_id = l.id
+    UNION ALL
+    SELECT id, livre_id, emprunteur, date_emprunt, date_retour_prevue, date_retour_reelle,
+           lecteur_id, exemplaire_id, coalesce(titre, ''), coalesce(auteur, ''), date_publication
+    FROM emprunts_archive
+) AS e"""
+
+# Colonnes de HISTORIQUE_COMPLET, dans l'ordre de COLONNES_EMPRUNT_LIVRE
+COLONNES_HISTORIQUE = (
+    f"e.id, e.livre_id, e.emprunteur, {sql_vers_affichage('e.date_emprunt')}, "
+    f"{sql_vers_affichage('e.date_retour_prevue')}, {sql_vers_affichage('e.date_retour_reelle')}, "
+    f"e.titre, e.auteur, {sql_vers_affichage('e.date_publication')}, "
+    f"(e.date_retour_reelle IS NULL AND e.date_retour_prevue < ?), e.lecteur_id, e.exemplaire_id"
+)
+
+# Colonnes lues pour construire un Lecteur
+COLONNES_LECTEUR = "id, nom, limite_emprunts"
+
+# Politiques de suppression d'un livre qui a des emprunts :
+#   bloquer  : refusée tant qu'un emprunt est en cours ; les emprunts retournés
+#              sont d'abord copiés dans emprunts_archive
+#   archiver : acceptée ; tous ses emprunts sont d'abord copiés dans emprunts_archive
+#              (ceux en cours y sont clos à la date de la suppression)
+# Dans les deux cas, l'historique du livre reste lisible après sa suppression.
+POLITIQUES_SUPPRESSION = ("bloquer", "archiver")
+
+# Âge par défaut (en jours depuis leur retour) des emprunts déplacés dans
+# l'archive par Bibliotheque.archiver_historique
+AGE_ARCHIVAGE = 365
 
 class Bibliotheque:
     """
     Classe gérant les opérations de la bibliothèque et la base de données SQLite.
+    
+    Chaque opération utilise son propre curseur. Une même instance peut être
+    partagée entre plusieurs threads : les écritures passent une à une par la
+    connexion d'écriture, les lectures par les connexions de lecture de la
+    réserve (paramètre lecteurs) ou, à défaut, par la connexion d'écriture.
     """
     
-    def __init__(self, db_path: str = "database.db"):
+    # Nombre maximal de correspondances plein texte lues, les plus pertinentes
+    # d'abord : borne le coût d'un préfixe très fréquent (une ou deux lettres saisies)
+    CANDIDATS_RECHERCHE = 1000
+    
+    # Critères de tri autorisés pour les listes paginées (colonnes indexées)
+    TRIS_LIVRES = {
+        "id": "id",
+        "titre": "titre",
+        "auteur": "auteur",
+        "date_publication": "date_publication",
+    }
+    TRIS_EMPRUNTS = {
+        "id": "e.id",
+        "date_emprunt": "e.date_emprunt",
+        "date_retour_prevue": "e.date_retour_prevue",
+        "emprunteur": "e.emprunteur",
+    }
+    
+    def __init__(self, db_path: str = "database.db", arraysize: int = 1000,
+                 profil: str = PROFIL_PAR_DEFAUT, lecteurs: int = 0, cache: bool = False,
+                 suppression: str = "bloquer"):
         """
         Initialise la connexion à la base de données et crée la table si nécessaire.
         
         Args:
             db_path (str): Chemin vers le fichier de la base de données
+            arraysize (int): Nombre de lignes lues à la fois par les méthodes iter_*
+            profil (str): Profil de connexion : "durable", "rapide" ou "lecture_seule"
+                (voir models.connexion)
+            lecteurs (int): Nombre maximal de connexions de lecture partagées entre
+                les threads (0 : les lectures utilisent la connexion d'écriture)
+            cache (bool): Active le cache de lecture (voir models.cache) ; à réserver
+                au cas où cette instance est la seule à écrire dans la base
+            suppression (str): Politique de suppression des livres empruntés :
+                "bloquer" ou "archiver" (voir POLITIQUES_SUPPRESSION)
+        
+        Raises:
+            ValueError: Si la politique de suppression est inconnue
         """
+        if suppression not in POLITIQUES_SUPPRESSION:
+            raise ValueError(f"Politique de suppression inconnue '{suppression}' "
+                             f"(valeurs possibles : {', '.join(POLITIQUES_SUPPRESSION)})")
         self.db_path = db_path
+        self.arraysize = arraysize
+        self.profil = profil
+        self.lecteurs = lecteurs
+        self.cache = CacheLecture() if cache else None
+        self.suppression = suppression
+        self.pool = None
         self.conn = None
         self.cursor = None
+        self.recherche_plein_texte = False
+        self.migration: Optional[RapportMigration] = None
+        self.profondeur_transaction = 0
+        self._proprietaire = None
+        self._abonnes: List[Callable[[Changement], None]] = []
+        self._changements_en_attente: List[Changement] = []
         self.connecter()
-        self.creer_tables()
+        if profil == "lecture_seule":
+            self.recherche_plein_texte = recherche_plein_texte_disponible(self.conn)
+        else:
+            self.creer_tables()
     
     def connecter(self):
-        """Établit la connexion à la base de données."""
-        self.conn = sqlite3.connect(self.db_path)
+        """Établit la connexion à la base de données avec les réglages du profil."""
+        self.pool = PoolConnexions(self.db_path, self.profil, self.lecteurs)
+        self.conn = self.pool.ecrivain
+        # Curseur partagé conservé pour les scripts existants ; les méthodes de
+        # la classe ne l'utilisent pas
         self.cursor = self.conn.cursor()
     
+    @contextmanager
+    def _ecriture(self) -> Iterator[sqlite3.Connection]:
+        """
+        Réserve la connexion d'écriture au thread courant.
+        
+        Yields:
+            sqlite3.Connection: La connexion d'écriture
+        """
+        with self.pool.ecriture() as conn:
+            precedent = self._proprietaire
+            self._proprietaire = threading.get_ident()
+            try:
+                yield conn
+            finally:
+                self._proprietaire = precedent
+    
+    @contextmanager
+    def _lecture(self) -> Iterator[sqlite3.Connection]:
+        """
+        Prête une connexion pour une lecture.
+        
+        Le thread qui détient la connexion d'écriture (transaction en cours)
+        lit sur celle-ci pour voir ses propres modifications non validées.
+        
+        Yields:
+            sqlite3.Connection: Une connexion de lecture ou la connexion d'écriture
+        """
+        if self._proprietaire == threading.get_ident():
+            yield self.conn
+        else:
+            with self.pool.lecteur() as conn:
+                yield conn
+    
+    @contextmanager
+    def _parcours(self) -> Iterator[sqlite3.Connection]:
+        """
+        Prête une connexion pour un parcours par blocs (voir _iterer).
+        
+        Comme _lecture, mais hors transaction du thread courant, le parcours
+        ne réserve pas la connexion d'écriture (voir PoolConnexions.parcours).
+        
+        Yields:
+            sqlite3.Connection: Une connexion de lecture ou la connexion d'écriture
+        """
+        if self._proprietaire == threading.get_ident():
+            yield self.conn
+        else:
+            with self.pool.parcours() as conn:
+                yield conn
+    
+    def diagnostic(self) -> dict:
+        """
+        Décrit la connexion courante.
+        
+        Returns:
+            dict: Profil choisi, réglages SQLite effectifs et version du schéma
+        """
+        return {
+            "db_path": self.db_path,
+            "profil": self.profil,
+            **lire_reglages(self.conn),
+            **self.pool.statistiques(),
+            "recherche_plein_texte": self.recherche_plein_texte,
+            "schema_version": self.conn.execute("PRAGMA user_version").fetchone()[0],
+            "sqlite_version": sqlite3.sqlite_version,
+        }
+    
     def deconnecter(self):
         """Ferme la connexion à la base de données."""
-        if self.conn:
-            self.conn.close()
+        if self.pool:
+            self.pool.fermer()
     
     def creer_tables(self):
-        """Crée les tables si elles n'existent pas."""
-        # Table des livres
-        self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS livres (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                titre TEXT NOT NULL,
-                auteur TEXT NOT NULL,
-                date_publication TEXT NOT NULL,
-                UNIQUE(titre, auteur)
-            )
-        ''')
-        
-        # Table des emprunts
-        self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS emprunts (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                livre_id INTEGER NOT NULL,
-                emprunteur TEXT NOT NULL,
-                date_emprunt TEXT NOT NULL,
-                date_retour_prevue TEXT NOT NULL,
-                date_retour_reelle TEXT,
-                FOREIGN KEY (livre_id) REFERENCES livres (id)
-            )
-        ''')
+        """
+        Crée les tables si elles n'existent pas et met le schéma à jour.
+        
+        Le rapport de la mise à jour (voir models.migrations) est conservé
+        dans self.migration.
+        """
+        self.migration = migrer(self.conn)
+        self.recherche_plein_texte = creer_recherche_plein_texte(self.conn)
+    
+    @contextmanager
+    def transaction(self):
+        """
+        Regroupe plusieurs opérations dans une seule transaction.
+        
+        Les méthodes qui modifient la base ne valident plus elles-mêmes à
+        l'intérieur du bloc : la validation a lieu une seule fois à la sortie,
+        et toute exception annule l'ensemble du bloc. Les blocs imbriqués
+        utilisent des points de sauvegarde (SAVEPOINT) : une erreur dans un
+        bloc interne n'annule que ce bloc. Pendant le bloc, la connexion
+        d'écriture est réservée au thread qui l'a ouvert. Les abonnés sont
+        notifiés des changements du bloc après sa validation.
+        
+        Exemple:
+            with bibliotheque.transaction():
+                bibliotheque.emprunter_livre(1, "Dupont")
+                bibliotheque.emprunter_livre(2, "Dupont")
+        
+        Yields:
+            Bibliotheque: L'instance courante
+        """
+        a_diffuser = []
+        with self._ecriture() as conn:
+            point = None
+            repere = len(self._changements_en_attente)
+            if self.profondeur_transaction == 0:
+                if conn.in_transaction:
+                    conn.commit()
+                conn.execute("BEGIN")
+            else:
+                point = f"point_{self.profondeur_transaction}"
+                conn.execute(f"SAVEPOINT {point}")
+            
+            self.profondeur_transaction += 1
+            try:
+                yield self
+            except BaseException:
+                self.profondeur_transaction -= 1
+                if self.cache is not None:
+                    # Le cache a pu suivre des écritures qui viennent d'être annulées
+                    self.cache.vider()
+                del self._changements_en_attente[repere:]
+                if point is None:
+                    conn.rollback()
+                else:
+                    conn.execute(f"ROLLBACK TO {point}")
+                    conn.execute(f"RELEASE {point}")
+                raise
+            
+            self.profondeur_transaction -= 1
+            if point is None:
+                conn.commit()
+                a_diffuser = self._changements_en_attente
+                self._changements_en_attente = []
+            else:
+                conn.execute(f"RELEASE {point}")
+        self._diffuser(a_diffuser)
+    
+    def _valider(self):
+        """Valide les modifications, sauf à l'intérieur d'un bloc transaction()."""
+        if self.profondeur_transaction == 0:
+            self.conn.commit()
+    
+    def abonner(self, rappel: Callable[[Changement], None]):
+        """
+        Abonne une fonction aux changements validés (voir models.evenements).
+        
+        Le rappel est appelé dans le thread qui a fait l'écriture.
+        
+        Args:
+            rappel (Callable[[Changement], None]): Appelée avec chaque changement
+        """
+        self._abonnes.append(rappel)
+    
+    def desabonner(self, rappel: Callable[[Changement], None]):
+        """
+        Retire un abonnement.
+        
+        Args:
+            rappel (Callable[[Changement], None]): Fonction passée à abonner()
+        """
+        if rappel in self._abonnes:
+            self._abonnes.remove(rappel)
+    
+    def _notifier(self, table: str, action: str, ids: Optional[List[int]]):
+        """Transmet un changement aux abonnés, ou le met en attente dans un bloc transaction()."""
+        if not self._abonnes:
+            return
+        changement = Changement(table, action, ids)
+        if self.profondeur_transaction > 0:
+            self._changements_en_attente.append(changement)
+        else:
+            self._diffuser([changement])
+    
+    def _diffuser(self, changements: List[Changement]):
+        """Appelle les abonnés pour chaque changement."""
+        for changement in changements:
+            for rappel in list(self._abonnes):
+                rappel(changement)
+    
+    def verifier_index(self) -> List[str]:
+        """
+        Vérifie la présence des index attendus.
+        
+        Returns:
+            List[str]: Noms des index manquants (liste vide si tout est en place)
+        """
+        with self._lecture() as conn:
+            return index_manquants(conn)
+    
+    @staticmethod
+    def _emprunt_et_livre(row: tuple) -> Tuple[Emprunt, Livre]:
+        """
+        Construit un couple (Emprunt, Livre) à partir d'une ligne COLONNES_EMPRUNT_LIVRE.
+        
+        L'indicateur de retard calculé en SQL est conservé dans Emprunt.en_retard.
+        
+        Args:
+            row (tuple): Ligne de résultat
+            
+        Returns:
+            Tuple[Emprunt, Livre]: L'emprunt et son livre
+        """
+        return (Emprunt.depuis_base(*row[:6], en_retard=bool(row[9]), lecteur_id=row[10],
+                                    exemplaire_id=row[11]),
+                Livre.depuis_base(row[1], *row[6:9]))
+    
+    @staticmethod
+    def _date_reference(as_of: Optional[str] = None) -> str:
+        """
+        Retourne la date de référence des retards, lue une seule fois par requête.
+        
+        Args:
+            as_of (Optional[str]): Date au format JJ/MM/AAAA (None : aujourd'hui)
+            
+        Returns:
+            str: Date au format AAAA-MM-JJ
+            
+        Raises:
+            ValueError: Si la date n'est pas au format JJ/MM/AAAA
+        """
+        return aujourd_hui_iso() if as_of is None else vers_iso(as_of)
+    
+    def _source_historique(self, conditions: List[str], params: list) -> Tuple[str, str]:
+        """
+        Choisit les colonnes et la clause FROM d'une lecture de l'historique.
+        
+        L'archive n'est lue que si elle contient des emprunts vérifiant les
+        conditions (une recherche par ses index) : sinon l'historique se lit
+        sur la seule table emprunts, comme avant tout archivage.
         
-        self.conn.commit()
+        Args:
+            conditions (List[str]): Conditions WHERE sur les emprunts (alias e)
+            params (list): Paramètres des conditions
+            
+        Returns:
+            Tuple[str, str]: Colonnes (dans l'ordre de COLONNES_EMPRUNT_LIVRE) et source
+        """
+        requete = "SELECT EXISTS (SELECT 1 FROM emprunts_archive e"
+        if conditions:
+            requete += " WHERE " + " AND ".join(conditions)
+        with self._lecture() as conn:
+            archive = conn.execute(requete + ")", params).fetchone()[0]
+        if archive:
+            return COLONNES_HISTORIQUE, HISTORIQUE_COMPLET
+        return COLONNES_EMPRUNT_LIVRE, EMPRUNTS_ET_LIVRES
+    
+    def obtenir_livre(self, livre_id: int) -> Optional[Livre]:
+        """
+        Récupère un livre par son ID.
+        
+        Args:
+            livre_id (int): L'ID du livre
+            
+        Returns:
+            Optional[Livre]: Le livre, ou None s'il n'existe pas
+        """
+        generation = None
+        if self.cache is not None:
+            livre = self.cache.livre(livre_id)
+            if livre is not None:
+                return livre
+            generation = self.cache.generation
+        
+        with self._lecture() as conn:
+            row = conn.execute(f"SELECT {COLONNES_LIVRE} FROM livres WHERE id = ?", (livre_id,)).fetchone()
+        if row is None:
+            return None
+        livre = Livre.depuis_base(*row)
+        if self.cache is not None:
+            self.cache.memoriser_livre(livre, generation)
+        return livre
     
     def livre_est_disponible(self, livre_id: int) -> bool:
         """
-        Vérifie si un livre est disponible pour l'emprunt.
+        Vérifie si un livre a au moins un exemplaire disponible pour l'emprunt.
+        
+        La réponse est lue sur le compteur d'exemplaires disponibles du livre.
+        Avec le cache, elle vient de l'ensemble des livres indisponibles,
+        chargé en une requête indexée au premier appel puis tenu à jour.
         
         Args:
             livre_id (int): L'ID du livre à vérifier
             
         Returns:
-            bool: True si le livre est disponible, False sinon
+            bool: True si le livre est disponible (ou inconnu), False sinon
         """
-        self.cursor.execute(
-            """
-            SELECT COUNT(*) FROM emprunts 
-            WHERE livre_id = ? AND date_retour_reelle IS NULL
-            """,
-            (livre_id,)
-        )
-        return self.cursor.fetchone()[0] == 0
+        if self.cache is not None:
+            emprunte = self.cache.est_emprunte(livre_id)
+            if emprunte is None:
+                generation = self.cache.generation
+                with self._lecture() as conn:
+                    empruntes = {row[0] for row in conn.execute(
+                        "SELECT id FROM livres WHERE exemplaires_disponibles = 0"
+                    )}
+                self.cache.charger_empruntes(empruntes, generation)
+                emprunte = livre_id in empruntes
+            return not emprunte
+        
+        with self._lecture() as conn:
+            row = conn.execute(
+                "SELECT exemplaires_disponibles FROM livres WHERE id = ?", (livre_id,)
+            ).fetchone()
+        return row is None or row[0] > 0
     
     def emprunter_livre(self, livre_id: int, emprunteur: str) -> Emprunt:
         """
         Enregistre l'emprunt d'un livre.
         
+        Le lecteur est retrouvé par son nom normalisé, ou inscrit s'il est
+        nouveau. L'emprunt est ensuite enregistré par une seule requête
+        INSERT ... SELECT qui choisit un exemplaire libre du livre et vérifie
+        en même temps la limite d'emprunts du lecteur, s'il en a une (par les
+        index partiels des emprunts en cours) ; l'index unique sur les emprunts en cours
+        rejette un second emprunt simultané du même exemplaire, même venant
+        d'un autre processus. Le compteur de disponibilité du livre est mis à
+        jour par la base dans la même transaction.
+        
         Args:
             livre_id (int): L'ID du livre à emprunter
             emprunteur (str): Le nom de l'emprunteur
             
         Returns:
-            Emprunt: L'emprunt créé
+            Emprunt: L'emprunt créé, au nom enregistré du lecteur, avec son exemplaire
             
         Raises:
-            ValueError: Si le livre n'existe pas ou n'est pas disponible
+            ValueError: Si le nom est vide, si le livre n'existe pas ou n'est pas
+                disponible, ou si le lecteur a atteint sa limite d'emprunts
         """
-        # Vérifier que le livre existe
-        self.cursor.execute("SELECT id FROM livres WHERE id = ?", (livre_id,))
-        if not self.cursor.fetchone():
-            raise ValueError("Ce livre n'existe pas")
+        lecteur = Lecteur(emprunteur)
         
-        # Vérifier que le livre est disponible
-        if not self.livre_est_disponible(livre_id):
-            raise ValueError("Ce livre n'est pas disponible")
-        
-        # Créer l'emprunt
-        emprunt = Emprunt(livre_id, emprunteur)
-        
-        # Enregistrer l'emprunt
-        self.cursor.execute(
-            """
-            INSERT INTO emprunts (livre_id, emprunteur, date_emprunt, date_retour_prevue)
-            VALUES (?, ?, ?, ?)
-            """,
-            (emprunt.livre_id, emprunt.emprunteur, emprunt.date_emprunt, emprunt.date_retour_prevue)
-        )
-        self.conn.commit()
+        with self._ecriture() as conn:
+            lecteur = self._inscrire_lecteur(conn, lecteur)
+            emprunt = Emprunt(livre_id, lecteur.nom)
+            try:
+                row = conn.execute(
+                    """
+                    INSERT INTO emprunts (livre_id, exemplaire_id, lecteur_id, emprunteur,
+                                          date_emprunt, date_retour_prevue)
+                    SELECT x.livre_id, x.id, r.id, r.nom, ?, ? FROM exemplaires x, lecteurs r
+                    WHERE x.livre_id = ? AND r.id = ?
+                    AND NOT EXISTS (
+                        SELECT 1 FROM emprunts WHERE exemplaire_id = x.id AND date_retour_reelle IS NULL
+                    )
+                    AND (
+                        coalesce(r.limite_emprunts, ?) IS NULL
+                        OR (
+                            SELECT COUNT(*) FROM emprunts
+                            WHERE lecteur_id = r.id AND date_retour_reelle IS NULL
+                        ) < coalesce(r.limite_emprunts, ?)
+                    )
+                    ORDER BY x.id
+                    LIMIT 1
+                    RETURNING id, exemplaire_id
+                    """,
+                    (vers_iso(emprunt.date_emprunt), vers_iso(emprunt.date_retour_prevue),
+                     livre_id, lecteur.id, Lecteur.LIMITE_EMPRUNTS, Lecteur.LIMITE_EMPRUNTS)
+                ).fetchone()
+            except sqlite3.IntegrityError:
+                self._annuler_instruction(conn)
+                raise ValueError("Ce livre n'est pas disponible")
+            
+            if row is None:
+                self._annuler_instruction(conn)
+                # Cas d'erreur uniquement : distinguer livre absent, livre emprunté
+                # et limite atteinte
+                disponibles = conn.execute(
+                    "SELECT exemplaires_disponibles FROM livres WHERE id = ?", (livre_id,)
+                ).fetchone()
+                if disponibles is None:
+                    raise ValueError("Ce livre n'existe pas")
+                if disponibles[0] <= 0:
+                    self._marquer_disponibilite(livre_id, 0)
+                    raise ValueError("Ce livre n'est pas disponible")
+                raise ValueError(f"{lecteur.nom} a atteint sa limite de "
+                                 f"{lecteur.limite_effective} emprunt(s) en cours")
+            self._valider()
+            emprunt.id, emprunt.exemplaire_id = row
+            emprunt.lecteur_id = lecteur.id
+            self._marquer_disponibilite(livre_id)
+            self._notifier("emprunts", INSERE, [emprunt.id])
+            self._notifier("livres", MODIFIE, [livre_id])
         
-        emprunt.id = self.cursor.lastrowid
         return emprunt
     
-    def retourner_livre(self, livre_id: int) -> bool:
+    def retourner_livre(self, livre_id: int, exemplaire_id: Optional[int] = None) -> bool:
         """
-        Enregistre le retour d'un livre.
+        Enregistre le retour d'un livre en une seule requête UPDATE.
+        
+        Sans exemplaire précisé, le retour n'est enregistré que si un seul
+        exemplaire du livre est emprunté.
         
         Args:
             livre_id (int): L'ID du livre à retourner
+            exemplaire_id (Optional[int]): L'ID de l'exemplaire rendu
             
         Returns:
             bool: True si le retour a été enregistré, False sinon
             
         Raises:
-            ValueError: Si le livre n'est pas emprunté
+            ValueError: Si le livre (ou l'exemplaire) n'est pas emprunté, ou si
+                plusieurs exemplaires sont empruntés sans que l'exemplaire soit précisé
         """
-        # Vérifier que le livre est bien emprunté
-        self.cursor.execute(
-            """
-            SELECT id FROM emprunts 
-            WHERE livre_id = ? AND date_retour_reelle IS NULL
-            """,
-            (livre_id,)
-        )
-        emprunt = self.cursor.fetchone()
-        if not emprunt:
-            raise ValueError("Ce livre n'est pas emprunté")
+        if exemplaire_id is None:
+            condition = (
+                "(SELECT COUNT(*) FROM emprunts WHERE livre_id = ? AND date_retour_reelle IS NULL) = 1"
+            )
+            params = (aujourd_hui_iso(), livre_id, livre_id)
+        else:
+            condition = "exemplaire_id = ?"
+            params = (aujourd_hui_iso(), livre_id, exemplaire_id)
         
-        # Enregistrer la date de retour
-        date_retour = datetime.now().strftime("%d/%m/%Y")
-        self.cursor.execute(
-            """
-            UPDATE emprunts 
-            SET date_retour_reelle = ? 
-            WHERE livre_id = ? AND date_retour_reelle IS NULL
-            """,
-            (date_retour, livre_id)
-        )
-        self.conn.commit()
+        with self._ecriture() as conn:
+            row = conn.execute(
+                f"""
+                UPDATE emprunts 
+                SET date_retour_reelle = ? 
+                WHERE livre_id = ? AND date_retour_reelle IS NULL AND {condition}
+                RETURNING id
+                """,
+                params
+            ).fetchone()
+            if row is None:
+                self._annuler_instruction(conn)
+                if exemplaire_id is not None:
+                    raise ValueError("Cet exemplaire n'est pas emprunté")
+                if conn.execute(
+                    "SELECT 1 FROM emprunts WHERE livre_id = ? AND date_retour_reelle IS NULL", (livre_id,)
+                ).fetchone():
+                    raise ValueError("Plusieurs exemplaires de ce livre sont empruntés : "
+                                     "précisez l'exemplaire rendu")
+                raise ValueError("Ce livre n'est pas emprunté")
+            self._valider()
+            self._marquer_disponibilite(livre_id)
+            self._notifier("emprunts", MODIFIE, [row[0]])
+            self._notifier("livres", MODIFIE, [livre_id])
         return True
     
-    def obtenir_emprunts_en_cours(self) -> List[Tuple[Emprunt, Livre]]:
+    def ajouter_exemplaires(self, livre_id: int, nombre: int = 1) -> List[int]:
         """
-        Récupère la liste des emprunts en cours avec les informations des livres.
+        Ajoute des exemplaires d'un livre.
         
+        Args:
+            livre_id (int): L'ID du livre
+            nombre (int): Nombre d'exemplaires ajoutés
+            
         Returns:
-            List[Tuple[Emprunt, Livre]]: Liste des emprunts en cours avec leurs livres
+            List[int]: IDs des nouveaux exemplaires
+            
+        Raises:
+            ValueError: Si le livre n'existe pas ou si le nombre n'est pas positif
         """
-        self.cursor.execute(
-            """
-            SELECT e.id, e.livre_id, e.emprunteur, e.date_emprunt, e.date_retour_prevue,
-                   e.date_retour_reelle, l.titre, l.auteur, l.date_publication
+        if nombre < 1:
+            raise ValueError("Le nombre d'exemplaires doit être positif")
+        with self._ecriture() as conn:
+            if not conn.execute("SELECT 1 FROM livres WHERE id = ?", (livre_id,)).fetchone():
+                raise ValueError("Ce livre n'existe pas")
+            ids = [conn.execute(
+                "INSERT INTO exemplaires (livre_id) VALUES (?) RETURNING id", (livre_id,)
+            ).fetchone()[0] for _ in range(nombre)]
+            self._valider()
+            self._invalider_livres(livre_id)
+            self._marquer_disponibilite(livre_id)
+            self._notifier("livres", MODIFIE, [livre_id])
+        return ids
+    
+    def retirer_exemplaire(self, exemplaire_id: int) -> bool:
+        """
+        Retire un exemplaire (perdu, abîmé...) de l'inventaire.
+        
+        L'historique de ses emprunts est conservé, rattaché au livre seul :
+        leur numéro d'exemplaire est effacé.
+        
+        Args:
+            exemplaire_id (int): L'ID de l'exemplaire
+            
+        Returns:
+            bool: True si l'exemplaire a été retiré, False s'il n'existe pas
+            
+        Raises:
+            ValueError: Si l'exemplaire est emprunté
+        """
+        with self._ecriture() as conn:
+            conn.execute(
+                """
+                UPDATE emprunts SET exemplaire_id = NULL
+                WHERE exemplaire_id = ? AND NOT EXISTS (
+                    SELECT 1 FROM emprunts WHERE exemplaire_id = ? AND date_retour_reelle IS NULL
+                )
+                """,
+                (exemplaire_id, exemplaire_id)
+            )
+            row = conn.execute(
+                """
+                DELETE FROM exemplaires
+                WHERE id = ? AND NOT EXISTS (
+                    SELECT 1 FROM emprunts WHERE exemplaire_id = ? AND date_retour_reelle IS NULL
+                )
+                RETURNING livre_id
+                """,
+                (exemplaire_id, exemplaire_id)
+            ).fetchone()
+            if row is None:
+                self._annuler_instruction(conn)
+                if conn.execute("SELECT 1 FROM exemplaires WHERE id = ?", (exemplaire_id,)).fetchone():
+                    raise ValueError("Cet exemplaire est emprunté")
+                return False
+            self._valider()
+            self._invalider_livres(row[0])
+            self._marquer_disponibilite(row[0])
+            self._notifier("livres", MODIFIE, [row[0]])
+        return True
+    
+    def _marquer_disponibilite(self, livre_id: int, disponibles: Optional[int] = None):
+        """
+        Reporte dans le cache la disponibilité constatée par une écriture.
+        
+        Sans valeur fournie, le compteur est relu sur la connexion d'écriture
+        (déjà réservée par l'appelant).
+        """
+        if self.cache is None:
+            return
+        if disponibles is None:
+            row = self.conn.execute(
+                "SELECT exemplaires_disponibles FROM livres WHERE id = ?", (livre_id,)
+            ).fetchone()
+            if row is None:
+                self.cache.invalider_livres(livre_id)
+                return
+            disponibles = row[0]
+        self.cache.marquer_disponibilite(livre_id, disponibles)
+    
+    def _invalider_livres(self, *livre_ids: int):
+        """Oublie dans le cache ce qui dépend des livres modifiés (voir CacheLecture.invalider_livres)."""
+        if self.cache is not None:
+            self.cache.invalider_livres(*livre_ids)
+    
+    def _annuler_instruction(self, conn: sqlite3.Connection):
+        """Termine la transaction implicite d'une écriture refusée, hors bloc transaction()."""
+        if self.profondeur_transaction == 0 and conn.in_transaction:
+            conn.rollback()
+    
+    def _iterer(self, requete: str, params: tuple = (), arraysize: Optional[int] = None) -> Iterator[tuple]:
+        """
+        Parcourt le résultat d'une requête par blocs de lignes.
+        
+        Chaque parcours utilise son propre curseur : plusieurs itérations
+        peuvent être menées en parallèle. La connexion de lecture reste
+        prêtée jusqu'à la fin (ou l'abandon) du parcours ; ce n'est la
+        connexion d'écriture que pour le thread qui y a une transaction en
+        cours (ou pour une base ":memory:").
+        
+        Args:
+            requete (str): Requête SELECT
+            params (tuple): Paramètres de la requête
+            arraysize (Optional[int]): Taille des blocs (par défaut self.arraysize)
+            
+        Yields:
+            tuple: Une ligne de résultat
+        """
+        with self._parcours() as conn:
+            curseur = conn.cursor()
+            curseur.arraysize = arraysize or self.arraysize
+            try:
+                curseur.execute(requete, params)
+                while True:
+                    lignes = curseur.fetchmany()
+                    if not lignes:
+                        break
+                    yield from lignes
+            finally:
+                curseur.close()
+    
+    def iter_livres(self, arraysize: Optional[int] = None) -> Iterator[Livre]:
+        """
+        Parcourt tous les livres sans les charger en mémoire.
+        
+        Args:
+            arraysize (Optional[int]): Nombre de lignes lues à la fois
+            
+        Yields:
+            Livre: Les livres, un par un
+        """
+        for row in self._iterer(f"SELECT {COLONNES_LIVRE} FROM livres", arraysize=arraysize):
+            yield Livre.depuis_base(*row)
+    
+    def iter_emprunts_en_cours(self, arraysize: Optional[int] = None) -> Iterator[Tuple[Emprunt, Livre]]:
+        """
+        Parcourt les emprunts en cours sans les charger en mémoire.
+        
+        Args:
+            arraysize (Optional[int]): Nombre de lignes lues à la fois
+            
+        Yields:
+            Tuple[Emprunt, Livre]: Chaque emprunt en cours avec son livre
+        """
+        requete = f"""
+            SELECT {COLONNES_EMPRUNT_LIVRE}
             FROM emprunts e
             JOIN livres l ON e.livre_id = l.id
             WHERE e.date_retour_reelle IS NULL
-            """
-        )
-        resultats = []
-        for row in self.cursor.fetchall():
-            emprunt = Emprunt(
-                livre_id=row[1],
-                emprunteur=row[2],
-                date_emprunt=row[3],
-                date_retour_prevue=row[4],
-                date_retour_reelle=row[5],
-                id=row[0]
-            )
-            livre = Livre(
-                titre=row[6],
-                auteur=row[7],
-                date_publication=row[8],
-                id=row[1]
-            )
-            resultats.append((emprunt, livre))
-        return resultats
+        """
+        for row in self._iterer(requete, (self._date_reference(),), arraysize):
+            yield self._emprunt_et_livre(row)
     
-    def obtenir_historique_emprunts(self, livre_id: Optional[int] = None) -> List[Tuple[Emprunt, Livre]]:
+    def iter_historique(self, livre_id: Optional[int] = None,
+                        arraysize: Optional[int] = None) -> Iterator[Tuple[Emprunt, Livre]]:
         """
-        Récupère l'historique des emprunts.
+        Parcourt l'historique des emprunts, du plus récent au plus ancien, sans le charger en mémoire.
+        
+        Les emprunts archivés (voir archiver_historique) sont compris.
         
         Args:
             livre_id (Optional[int]): Si spécifié, limite l'historique à un livre particulier
+            arraysize (Optional[int]): Nombre de lignes lues à la fois
+            
+        Yields:
+            Tuple[Emprunt, Livre]: Chaque emprunt avec son livre
+        """
+        conditions, params = ([], []) if livre_id is None else (["e.livre_id = ?"], [livre_id])
+        colonnes, source = self._source_historique(conditions, params)
+        query = f"SELECT {colonnes} FROM {source}"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY e.date_emprunt DESC, e.id DESC"
+        
+        for row in self._iterer(query, (self._date_reference(), *params), arraysize):
+            yield self._emprunt_et_livre(row)
+    
+    def obtenir_emprunt(self, emprunt_id: int) -> Optional[Tuple[Emprunt, Livre]]:
+        """
+        Récupère un emprunt par son ID.
+        
+        Args:
+            emprunt_id (int): L'ID de l'emprunt
             
         Returns:
-            List[Tuple[Emprunt, Livre]]: Liste des emprunts avec leurs livres
+            Optional[Tuple[Emprunt, Livre]]: L'emprunt et son livre, ou None s'il n'existe pas
+        """
+        with self._lecture() as conn:
+            row = conn.execute(
+                f"""
+                SELECT {COLONNES_EMPRUNT_LIVRE}
+                FROM emprunts e
+                JOIN livres l ON e.livre_id = l.id
+                WHERE e.id = ?
+                """,
+                (self._date_reference(), emprunt_id)
+            ).fetchone()
+        return self._emprunt_et_livre(row) if row else None
+    
+    def obtenir_emprunts_en_cours_livre(self, livre_id: int) -> List[Tuple[Emprunt, Livre]]:
+        """
+        Récupère les emprunts en cours des exemplaires d'un livre.
+        
+        Args:
+            livre_id (int): L'ID du livre
+            
+        Returns:
+            List[Tuple[Emprunt, Livre]]: Les emprunts en cours, par exemplaire
+        """
+        requete = f"""
+            SELECT {COLONNES_EMPRUNT_LIVRE}
+            FROM emprunts e
+            JOIN livres l ON e.livre_id = l.id
+            WHERE e.livre_id = ? AND e.date_retour_reelle IS NULL
+            ORDER BY e.exemplaire_id
+        """
+        return [self._emprunt_et_livre(row)
+                for row in self._iterer(requete, (self._date_reference(), livre_id))]
+    
+    def obtenir_emprunts_en_retard(self, as_of: Optional[str] = None) -> List[Tuple[Emprunt, Livre]]:
+        """
+        Récupère les emprunts en retard, du plus ancien retard au plus récent.
+        
+        La recherche parcourt l'index partiel des échéances des emprunts en
+        cours : seuls les emprunts en retard sont lus.
+        
+        Args:
+            as_of (Optional[str]): Date de référence au format JJ/MM/AAAA (None : aujourd'hui)
+            
+        Returns:
+            List[Tuple[Emprunt, Livre]]: Les emprunts en retard avec leurs livres
+            
+        Raises:
+            ValueError: Si la date de référence n'est pas au format JJ/MM/AAAA
         """
-        query = """
-            SELECT e.id, e.livre_id, e.emprunteur, e.date_emprunt, e.date_retour_prevue,
-                   e.date_retour_reelle, l.titre, l.auteur, l.date_publication
+        date = self._date_reference(as_of)
+        requete = f"""
+            SELECT {COLONNES_EMPRUNT_LIVRE}
             FROM emprunts e
             JOIN livres l ON e.livre_id = l.id
+            WHERE e.date_retour_reelle IS NULL AND e.date_retour_prevue < ?
+            ORDER BY e.date_retour_prevue, e.id
         """
-        params = []
+        return [self._emprunt_et_livre(row) for row in self._iterer(requete, (date, date))]
+    
+    def compter_emprunts_en_retard(self, as_of: Optional[str] = None) -> int:
+        """
+        Compte les emprunts en retard (lu sur l'index partiel des échéances).
         
-        if livre_id is not None:
-            query += " WHERE e.livre_id = ?"
-            params.append(livre_id)
+        Args:
+            as_of (Optional[str]): Date de référence au format JJ/MM/AAAA (None : aujourd'hui)
+            
+        Returns:
+            int: Nombre d'emprunts en retard
+        """
+        with self._lecture() as conn:
+            return conn.execute(
+                "SELECT COUNT(*) FROM emprunts WHERE date_retour_reelle IS NULL AND date_retour_prevue < ?",
+                (self._date_reference(as_of),)
+            ).fetchone()[0]
+    
+    @staticmethod
+    def _inscrire_lecteur(conn: sqlite3.Connection, lecteur: Lecteur) -> Lecteur:
+        """
+        Retrouve un lecteur par sa clé ou l'inscrit (connexion d'écriture déjà réservée).
         
-        query += " ORDER BY e.date_emprunt DESC"
+        Args:
+            conn (sqlite3.Connection): La connexion d'écriture
+            lecteur (Lecteur): Le lecteur recherché (son nom suffit)
+            
+        Returns:
+            Lecteur: Le lecteur enregistré
+        """
+        cle = lecteur.cle
+        row = conn.execute(f"SELECT {COLONNES_LECTEUR} FROM lecteurs WHERE cle = ?", (cle,)).fetchone()
+        if row is None:
+            # DO NOTHING : un autre processus a pu inscrire le même lecteur entre-temps
+            row = conn.execute(
+                f"""
+                INSERT INTO lecteurs (nom, cle, limite_emprunts) VALUES (?, ?, ?)
+                ON CONFLICT (cle) DO NOTHING
+                RETURNING {COLONNES_LECTEUR}
+                """,
+                (lecteur.nom, cle, lecteur.limite_emprunts)
+            ).fetchone() or conn.execute(
+                f"SELECT {COLONNES_LECTEUR} FROM lecteurs WHERE cle = ?", (cle,)
+            ).fetchone()
+        return Lecteur.depuis_base(*row)
+    
+    def inscrire_lecteur(self, nom: str, limite_emprunts: Optional[int] = None) -> Lecteur:
+        """
+        Inscrit un lecteur, ou retrouve celui qui porte déjà ce nom (à la casse,
+        aux accents et aux espaces près).
         
-        self.cursor.execute(query, params)
-        resultats = []
-        for row in self.cursor.fetchall():
-            emprunt = Emprunt(
-                livre_id=row[1],
-                emprunteur=row[2],
-                date_emprunt=row[3],
-                date_retour_prevue=row[4],
-                date_retour_reelle=row[5],
-                id=row[0]
-            )
-            livre = Livre(
-                titre=row[6],
-                auteur=row[7],
-                date_publication=row[8],
-                id=row[1]
-            )
-            resultats.append((emprunt, livre))
-        return resultats
+        Args:
+            nom (str): Le nom du lecteur
+            limite_emprunts (Optional[int]): Sa limite d'emprunts en cours (None : limite par
+                défaut, Lecteur.LIMITE_EMPRUNTS, pour un nouveau lecteur, inchangée pour un
+                lecteur existant)
+            
+        Returns:
+            Lecteur: Le lecteur enregistré
+            
+        Raises:
+            ValueError: Si le nom est vide ou la limite négative
+        """
+        lecteur = Lecteur(nom, limite_emprunts)
+        with self._ecriture() as conn:
+            lecteur = self._inscrire_lecteur(conn, lecteur)
+            if limite_emprunts is not None and lecteur.limite_emprunts != limite_emprunts:
+                conn.execute("UPDATE lecteurs SET limite_emprunts = ? WHERE id = ?",
+                             (limite_emprunts, lecteur.id))
+                lecteur.limite_emprunts = limite_emprunts
+            self._valider()
+        return lecteur
+    
+    def obtenir_lecteur(self, lecteur_id: int) -> Optional[Lecteur]:
+        """
+        Récupère un lecteur par son ID.
+        
+        Args:
+            lecteur_id (int): L'ID du lecteur
+            
+        Returns:
+            Optional[Lecteur]: Le lecteur, ou None s'il n'existe pas
+        """
+        with self._lecture() as conn:
+            row = conn.execute(f"SELECT {COLONNES_LECTEUR} FROM lecteurs WHERE id = ?",
+                               (lecteur_id,)).fetchone()
+        return Lecteur.depuis_base(*row) if row else None
+    
+    def trouver_lecteur(self, nom: str) -> Optional[Lecteur]:
+        """
+        Recherche un lecteur par son nom (à la casse, aux accents et aux espaces près).
+        
+        Args:
+            nom (str): Le nom du lecteur
+            
+        Returns:
+            Optional[Lecteur]: Le lecteur, ou None s'il n'est pas inscrit
+        """
+        with self._lecture() as conn:
+            row = conn.execute(f"SELECT {COLONNES_LECTEUR} FROM lecteurs WHERE cle = ?",
+                               (normaliser_nom(nom),)).fetchone()
+        return Lecteur.depuis_base(*row) if row else None
+    
+    def definir_limite_emprunts(self, lecteur_id: int, limite: Optional[int]) -> bool:
+        """
+        Modifie la limite d'emprunts en cours d'un lecteur.
+        
+        Les emprunts déjà en cours ne sont pas remis en cause : la limite
+        s'applique aux emprunts suivants.
+        
+        Args:
+            lecteur_id (int): L'ID du lecteur
+            limite (Optional[int]): Nouvelle limite (None : limite par défaut,
+                Lecteur.LIMITE_EMPRUNTS, qui est de ne pas limiter)
+            
+        Returns:
+            bool: True si le lecteur a été modifié, False s'il n'existe pas
+            
+        Raises:
+            ValueError: Si la limite est négative
+        """
+        if limite is not None and limite < 0:
+            raise ValueError("La limite d'emprunts doit être positive")
+        with self._ecriture() as conn:
+            curseur = conn.execute("UPDATE lecteurs SET limite_emprunts = ? WHERE id = ?",
+                                   (limite, lecteur_id))
+            self._valider()
+        return curseur.rowcount > 0
+    
+    def obtenir_emprunts_en_cours_lecteur(self, lecteur_id: int) -> List[Tuple[Emprunt, Livre]]:
+        """
+        Récupère les emprunts en cours d'un lecteur (index partiel des emprunts en cours).
+        
+        Args:
+            lecteur_id (int): L'ID du lecteur
+            
+        Returns:
+            List[Tuple[Emprunt, Livre]]: Ses emprunts en cours, par date de retour prévue
+        """
+        requete = f"""
+            SELECT {COLONNES_EMPRUNT_LIVRE}
+            FROM emprunts e
+            JOIN livres l ON e.livre_id = l.id
+            WHERE e.lecteur_id = ? AND e.date_retour_reelle IS NULL
+            ORDER BY e.date_retour_prevue, e.id
+        """
+        return [self._emprunt_et_livre(row)
+                for row in self._iterer(requete, (self._date_reference(), lecteur_id))]
+    
+    def obtenir_historique_lecteur(self, lecteur_id: int,
+                                   limite: Optional[int] = None) -> List[Tuple[Emprunt, Livre]]:
+        """
+        Récupère l'historique des emprunts d'un lecteur, du plus récent au plus ancien.
+        
+        Args:
+            lecteur_id (int): L'ID du lecteur
+            limite (Optional[int]): Nombre maximal d'emprunts retournés
+            
+        Returns:
+            List[Tuple[Emprunt, Livre]]: Ses emprunts, en cours, passés et archivés
+        """
+        colonnes, source = self._source_historique(["e.lecteur_id = ?"], [lecteur_id])
+        requete = f"""
+            SELECT {colonnes}
+            FROM {source}
+            WHERE e.lecteur_id = ?
+            ORDER BY e.date_emprunt DESC, e.id DESC
+            LIMIT ?
+        """
+        params = (self._date_reference(), lecteur_id, -1 if limite is None else limite)
+        return [self._emprunt_et_livre(row) for row in self._iterer(requete, params)]
+    
+    def obtenir_emprunts_en_cours(self) -> List[Tuple[Emprunt, Livre]]:
+        """
+        Récupère la liste des emprunts en cours avec les informations des livres.
+        
+        Returns:
+            List[Tuple[Emprunt, Livre]]: Liste des emprunts en cours avec leurs livres
+        """
+        return list(self.iter_emprunts_en_cours())
+    
+    def obtenir_historique_emprunts(self, livre_id: Optional[int] = None) -> List[Tuple[Emprunt, Livre]]:
+        """
+        Récupère l'historique des emprunts, archives comprises.
+        
+        Args:
+            livre_id (Optional[int]): Si spécifié, limite l'historique à un livre particulier
+            
+        Returns:
+            List[Tuple[Emprunt, Livre]]: Liste des emprunts avec leurs livres
+        """
+        return list(self.iter_historique(livre_id))
     
     def livre_existe(self, titre: str, auteur: str) -> bool:
         """
@@ -246,11 +1058,12 @@ class Bibliotheque:
         Returns:
             bool: True si le livre existe déjà, False sinon
         """
-        self.cursor.execute(
-            "SELECT COUNT(*) FROM livres WHERE titre = ? AND auteur = ?",
-            (titre, auteur)
-        )
-        return self.cursor.fetchone()[0] > 0
+        with self._lecture() as conn:
+            curseur = conn.execute(
+                "SELECT COUNT(*) FROM livres WHERE titre = ? AND auteur = ?",
+                (titre, auteur)
+            )
+            return curseur.fetchone()[0] > 0
     
     def ajouter_livre(self, livre: Livre) -> int:
         """
@@ -268,19 +1081,152 @@ class Bibliotheque:
         # Valider le format de la date avant l'insertion
         livre.valider_date()
         
-        # Vérifier si le livre existe déjà
-        if self.livre_existe(livre.titre, livre.auteur):
-            raise ValueError(f"Le livre '{livre.titre}' de {livre.auteur} existe déjà dans la bibliothèque")
+        with self._ecriture() as conn:
+            # Vérifier si le livre existe déjà
+            if self.livre_existe(livre.titre, livre.auteur):
+                raise ValueError(f"Le livre '{livre.titre}' de {livre.auteur} existe déjà dans la bibliothèque")
+            
+            try:
+                curseur = conn.execute(
+                    "INSERT INTO livres (titre, auteur, date_publication) VALUES (?, ?, ?)",
+                    (livre.titre, livre.auteur, vers_iso(livre.date_publication))
+                )
+                self._valider()
+                self._invalider_livres()
+                self._notifier("livres", INSERE, [curseur.lastrowid])
+                return curseur.lastrowid
+            except sqlite3.IntegrityError:
+                raise ValueError(f"Le livre '{livre.titre}' de {livre.auteur} existe déjà dans la bibliothèque")
+    
+    def ajouter_livres(self, livres: Iterable, taille_lot: int = 5000,
+                       progression: Optional[Callable[[RapportImport], None]] = None) -> RapportImport:
+        """
+        Ajoute des livres en masse.
         
-        try:
-            self.cursor.execute(
-                "INSERT INTO livres (titre, auteur, date_publication) VALUES (?, ?, ?)",
-                (livre.titre, livre.auteur, livre.date_publication)
-            )
-            self.conn.commit()
-            return self.cursor.lastrowid
-        except sqlite3.IntegrityError:
-            raise ValueError(f"Le livre '{livre.titre}' de {livre.auteur} existe déjà dans la bibliothèque")
+        Les lignes sont traitées par lots : les dates d'un lot sont validées
+        ensemble, puis le lot est inséré par un seul executemany dans sa propre
+        transaction. Les doublons sont détectés par la contrainte
+        UNIQUE(titre, auteur) ; un lot qui en contient est rejoué ligne par
+        ligne pour identifier précisément les lignes rejetées. Sans cette
+        contrainte (base pas encore mise à jour), l'import est refusé plutôt
+        que d'insérer les doublons.
+        
+        Args:
+            livres (Iterable): Livres, dictionnaires (titre, auteur, date_publication)
+                ou tuples (titre, auteur, date_publication)
+            taille_lot (int): Nombre de lignes par transaction
+            progression (Callable, optional): Appelée avec le rapport après chaque lot
+            
+        Returns:
+            RapportImport: Bilan de l'import avec une erreur par ligne rejetée
+            
+        Raises:
+            ValueError: Si la base ne garantit pas l'unicité (titre, auteur) des livres
+        """
+        with self._lecture() as conn:
+            if not unicite_livres_presente(conn):
+                raise ValueError("La base ne garantit pas l'unicité des livres (titre, auteur) : "
+                                 "mettez-la à jour avec migrate_db.py avant d'importer")
+        rapport = RapportImport()
+        debut = time.perf_counter()
+        lot = []
+        for numero, element in enumerate(livres, start=1):
+            lot.append((numero, element))
+            if len(lot) >= taille_lot:
+                self._importer_lot(lot, rapport)
+                lot = []
+                rapport.duree = time.perf_counter() - debut
+                if progression:
+                    progression(rapport)
+        
+        if lot:
+            self._importer_lot(lot, rapport)
+        rapport.erreurs.sort()
+        if rapport.inseres:
+            self._invalider_livres()
+            self._notifier("livres", INSERE, None)
+        if self.recherche_plein_texte and rapport.inseres >= taille_lot:
+            # Fusionne les segments créés par l'import pour garder des recherches rapides
+            with self._ecriture() as conn:
+                conn.execute("INSERT INTO livres_fts (livres_fts) VALUES ('optimize')")
+                self._valider()
+        rapport.duree = time.perf_counter() - debut
+        if progression:
+            progression(rapport)
+        return rapport
+    
+    @staticmethod
+    def _extraire_champs(element) -> Tuple[str, str, str]:
+        """
+        Extrait titre, auteur et date d'une ligne à importer.
+        
+        Args:
+            element: Livre, dictionnaire ou tuple
+            
+        Returns:
+            Tuple[str, str, str]: Titre, auteur et date (JJ/MM/AAAA) nettoyés
+            
+        Raises:
+            ValueError: Si la ligne est illisible ou incomplète
+        """
+        if isinstance(element, Livre):
+            champs = (element.titre, element.auteur, element.date_publication)
+        elif isinstance(element, dict):
+            champs = (element.get("titre"), element.get("auteur"), element.get("date_publication"))
+        elif isinstance(element, (tuple, list)) and len(element) == 3:
+            champs = tuple(element)
+        else:
+            raise ValueError("Ligne illisible")
+        
+        titre, auteur, date = (str(c).strip() if c is not None else "" for c in champs)
+        if not titre:
+            raise ValueError("Le titre est obligatoire")
+        if not auteur:
+            raise ValueError("L'auteur est obligatoire")
+        return titre, auteur, date
+    
+    def _importer_lot(self, lot: List[Tuple[int, object]], rapport: RapportImport):
+        """
+        Valide et insère un lot de lignes dans une transaction.
+        
+        Args:
+            lot (List[Tuple[int, object]]): Numéro de ligne et contenu
+            rapport (RapportImport): Rapport à compléter
+        """
+        lignes = []
+        for numero, element in lot:
+            try:
+                lignes.append((numero, *self._extraire_champs(element)))
+            except ValueError as e:
+                rapport.erreurs.append((numero, str(e)))
+        
+        valides = []
+        dates_iso = valider_dates(date for _, _, _, date in lignes)
+        for (numero, titre, auteur, date), date_iso in zip(lignes, dates_iso):
+            if date_iso is None:
+                rapport.erreurs.append((numero, f"Date invalide '{date}' : format attendu JJ/MM/AAAA"))
+            else:
+                valides.append((numero, titre, auteur, date_iso))
+        
+        requete = "INSERT INTO livres (titre, auteur, date_publication) VALUES (?, ?, ?)"
+        with self.transaction():
+            try:
+                with self.transaction():
+                    self.conn.executemany(requete, [ligne[1:] for ligne in valides])
+                rapport.inseres += len(valides)
+            except sqlite3.IntegrityError:
+                # Au moins un doublon : le lot est annulé puis rejoué ligne par
+                # ligne dans la même transaction pour savoir quelles lignes rejeter
+                for numero, titre, auteur, date_iso in valides:
+                    try:
+                        self.conn.execute(requete, (titre, auteur, date_iso))
+                        rapport.inseres += 1
+                    except sqlite3.IntegrityError:
+                        rapport.erreurs.append(
+                            (numero, f"Le livre '{titre}' de {auteur} existe déjà dans la bibliothèque")
+                        )
+        
+        rapport.lignes_lues += len(lot)
     
     def obtenir_tous_les_livres(self) -> List[Livre]:
         """
@@ -289,27 +1235,332 @@ class Bibliotheque:
         Returns:
             List[Livre]: Liste de tous les livres
         """
-        self.cursor.execute("SELECT id, titre, auteur, date_publication FROM livres")
-        return [Livre(titre, auteur, date_publication, id) 
-                for id, titre, auteur, date_publication in self.cursor.fetchall()]
+        return list(self.iter_livres())
     
-    def rechercher_livre(self, terme: str) -> List[Livre]:
+    def compter_livres(self) -> int:
+        """
+        Compte les livres de la bibliothèque.
+        
+        Returns:
+            int: Nombre de livres
+        """
+        generation = None
+        if self.cache is not None:
+            nombre = self.cache.nombre_livres()
+            if nombre is not None:
+                return nombre
+            generation = self.cache.generation
+        
+        with self._lecture() as conn:
+            nombre = conn.execute("SELECT COUNT(*) FROM livres").fetchone()[0]
+        if self.cache is not None:
+            self.cache.memoriser_nombre_livres(nombre, generation)
+        return nombre
+    
+    def compter_emprunts_en_cours(self) -> int:
+        """
+        Compte les emprunts en cours (lu sur l'index partiel des emprunts en cours).
+        
+        Returns:
+            int: Nombre d'emprunts en cours
+        """
+        with self._lecture() as conn:
+            return conn.execute(
+                "SELECT COUNT(*) FROM emprunts WHERE date_retour_reelle IS NULL"
+            ).fetchone()[0]
+    
+    def compter_historique(self, livre_id: Optional[int] = None) -> int:
+        """
+        Compte les emprunts de l'historique, archives comprises.
+        
+        Args:
+            livre_id (Optional[int]): Si spécifié, limite le compte à un livre particulier
+            
+        Returns:
+            int: Nombre d'emprunts
+        """
+        condition, params = ("", ()) if livre_id is None else (" WHERE livre_id = ?", (livre_id,))
+        with self._lecture() as conn:
+            curseur = conn.execute(
+                f"SELECT (SELECT COUNT(*) FROM emprunts{condition}) "
+                f"+ (SELECT COUNT(*) FROM emprunts_archive{condition})",
+                params * 2
+            )
+            return curseur.fetchone()[0]
+    
+    def _lire_page(self, requete: str, conditions: List[str], params: list, colonne_tri: str,
+                   colonne_id: str, decroissant: bool, taille_page: int,
+                   page: Optional[int] = None, apres: Optional[str] = None) -> Tuple[list, Optional[str]]:
+        """
+        Exécute une requête de liste paginée par numéro de page ou par clé.
+        
+        La requête doit sélectionner la clé de tri brute en dernière colonne.
+        Le tri se fait toujours sur (clé, id) pour être stable ; avec un jeton,
+        la page reprend strictement après le couple de la page précédente.
+        
+        Args:
+            requete (str): SELECT ... FROM ... sans WHERE ni ORDER BY
+            conditions (List[str]): Conditions WHERE
+            params (list): Paramètres des conditions
+            colonne_tri (str): Colonne de tri
+            colonne_id (str): Colonne identifiant (départage les égalités)
+            decroissant (bool): Tri décroissant
+            taille_page (int): Nombre de lignes par page
+            page (Optional[int]): Numéro de page (0 pour la première) en pagination par décalage
+            apres (Optional[str]): Jeton de la page précédente en pagination par clé
+            
+        Returns:
+            Tuple[list, Optional[str]]: Lignes (sans la clé de tri) et jeton de la page suivante
+        """
+        conditions = list(conditions)
+        params = list(params)
+        position = decoder_jeton(apres)
+        if position is not None:
+            operateur = "<" if decroissant else ">"
+            if colonne_tri == colonne_id:
+                conditions.append(f"{colonne_id} {operateur} ?")
+                params.append(position[1])
+            else:
+                conditions.append(f"({colonne_tri}, {colonne_id}) {operateur} (?, ?)")
+                params.extend(position)
+        
+        if conditions:
+            requete += " WHERE " + " AND ".join(conditions)
+        sens = "DESC" if decroissant else "ASC"
+        if colonne_tri == colonne_id:
+            requete += f" ORDER BY {colonne_id} {sens}"
+        else:
+            requete += f" ORDER BY {colonne_tri} {sens}, {colonne_id} {sens}"
+        requete += " LIMIT ?"
+        params.append(taille_page)
+        if page is not None:
+            requete += " OFFSET ?"
+            params.append(page * taille_page)
+        
+        with self._lecture() as conn:
+            lignes = conn.execute(requete, params).fetchall()
+        jeton = None
+        if len(lignes) == taille_page:
+            derniere = lignes[-1]
+            jeton = encoder_jeton(derniere[-1], derniere[0])
+        return [ligne[:-1] for ligne in lignes], jeton
+    
+    @staticmethod
+    def _colonne_tri(tris: dict, tri: str) -> str:
+        """
+        Retourne la colonne SQL correspondant à un critère de tri autorisé.
+        
+        Raises:
+            ValueError: Si le critère de tri n'est pas autorisé
+        """
+        if tri not in tris:
+            raise ValueError(f"Tri inconnu '{tri}' (valeurs possibles : {', '.join(tris)})")
+        return tris[tri]
+    
+    def _page_livres(self, tri: str, decroissant: bool, taille_page: int,
+                     page: Optional[int] = None, apres: Optional[str] = None) -> Tuple[List[Livre], Optional[str]]:
+        """Lit une page du catalogue (voir obtenir_livres_page et obtenir_livres_apres)."""
+        colonne = self._colonne_tri(self.TRIS_LIVRES, tri)
+        lignes, jeton = self._lire_page(
+            f"SELECT {COLONNES_LIVRE}, {colonne} FROM livres", [], [],
+            colonne, "id", decroissant, taille_page, page, apres
+        )
+        return [Livre.depuis_base(*ligne) for ligne in lignes], jeton
+    
+    def obtenir_livres_page(self, page: int = 0, taille_page: int = 50, tri: str = "id",
+                            decroissant: bool = False) -> List[Livre]:
+        """
+        Récupère une page du catalogue (pagination par décalage, accès direct à une page).
+        
+        Args:
+            page (int): Numéro de page, 0 pour la première
+            taille_page (int): Nombre de livres par page
+            tri (str): Critère de tri (voir TRIS_LIVRES)
+            decroissant (bool): Tri décroissant
+            
+        Returns:
+            List[Livre]: Les livres de la page
+        """
+        return self._page_livres(tri, decroissant, taille_page, page=page)[0]
+    
+    def obtenir_livres_apres(self, apres: Optional[str] = None, taille_page: int = 50, tri: str = "id",
+                             decroissant: bool = False) -> Tuple[List[Livre], Optional[str]]:
+        """
+        Récupère la page suivante du catalogue (pagination par clé, coût constant).
+        
+        Args:
+            apres (Optional[str]): Jeton retourné par la page précédente (None pour la première)
+            taille_page (int): Nombre de livres par page
+            tri (str): Critère de tri (voir TRIS_LIVRES)
+            decroissant (bool): Tri décroissant
+            
+        Returns:
+            Tuple[List[Livre], Optional[str]]: Les livres et le jeton de la page suivante
+                (None lorsqu'il n'y a plus de page)
+        """
+        return self._page_livres(tri, decroissant, taille_page, apres=apres)
+    
+    def _page_emprunts(self, conditions: List[str], params: list, tri: str, decroissant: bool,
+                       taille_page: int, page: Optional[int] = None, apres: Optional[str] = None,
+                       historique: bool = False) -> Tuple[List[Tuple[Emprunt, Livre]], Optional[str]]:
+        """Lit une page d'emprunts, archives comprises pour l'historique (voir les méthodes *_page et *_apres)."""
+        colonne = self._colonne_tri(self.TRIS_EMPRUNTS, tri)
+        if historique:
+            colonnes, source = self._source_historique(conditions, params)
+        else:
+            colonnes, source = COLONNES_EMPRUNT_LIVRE, EMPRUNTS_ET_LIVRES
+        lignes, jeton = self._lire_page(
+            f"SELECT {colonnes}, {colonne} FROM {source}",
+            conditions, [self._date_reference(), *params], colonne, "e.id", decroissant,
+            taille_page, page, apres
+        )
+        return [self._emprunt_et_livre(ligne) for ligne in lignes], jeton
+    
+    def obtenir_emprunts_en_cours_page(self, page: int = 0, taille_page: int = 50,
+                                       tri: str = "date_retour_prevue",
+                                       decroissant: bool = False) -> List[Tuple[Emprunt, Livre]]:
+        """
+        Récupère une page des emprunts en cours (pagination par décalage).
+        
+        Args:
+            page (int): Numéro de page, 0 pour la première
+            taille_page (int): Nombre d'emprunts par page
+            tri (str): Critère de tri (voir TRIS_EMPRUNTS)
+            decroissant (bool): Tri décroissant
+            
+        Returns:
+            List[Tuple[Emprunt, Livre]]: Les emprunts de la page avec leurs livres
+        """
+        return self._page_emprunts(["e.date_retour_reelle IS NULL"], [], tri, decroissant,
+                                   taille_page, page=page)[0]
+    
+    def obtenir_emprunts_en_cours_apres(self, apres: Optional[str] = None, taille_page: int = 50,
+                                        tri: str = "date_retour_prevue", decroissant: bool = False
+                                        ) -> Tuple[List[Tuple[Emprunt, Livre]], Optional[str]]:
+        """
+        Récupère la page suivante des emprunts en cours (pagination par clé).
+        
+        Args:
+            apres (Optional[str]): Jeton retourné par la page précédente (None pour la première)
+            taille_page (int): Nombre d'emprunts par page
+            tri (str): Critère de tri (voir TRIS_EMPRUNTS)
+            decroissant (bool): Tri décroissant
+            
+        Returns:
+            Tuple[List[Tuple[Emprunt, Livre]], Optional[str]]: Les emprunts et le jeton suivant
+        """
+        return self._page_emprunts(["e.date_retour_reelle IS NULL"], [], tri, decroissant,
+                                   taille_page, apres=apres)
+    
+    def obtenir_historique_page(self, page: int = 0, taille_page: int = 50,
+                                livre_id: Optional[int] = None, tri: str = "date_emprunt",
+                                decroissant: bool = True) -> List[Tuple[Emprunt, Livre]]:
+        """
+        Récupère une page de l'historique des emprunts (pagination par décalage).
+        
+        Args:
+            page (int): Numéro de page, 0 pour la première
+            taille_page (int): Nombre d'emprunts par page
+            livre_id (Optional[int]): Si spécifié, limite l'historique à un livre particulier
+            tri (str): Critère de tri (voir TRIS_EMPRUNTS)
+            decroissant (bool): Tri décroissant (par défaut, les plus récents d'abord)
+            
+        Returns:
+            List[Tuple[Emprunt, Livre]]: Les emprunts de la page avec leurs livres
+        """
+        conditions, params = ([], []) if livre_id is None else (["e.livre_id = ?"], [livre_id])
+        return self._page_emprunts(conditions, params, tri, decroissant, taille_page, page=page,
+                                   historique=True)[0]
+    
+    def obtenir_historique_apres(self, apres: Optional[str] = None, taille_page: int = 50,
+                                 livre_id: Optional[int] = None, tri: str = "date_emprunt",
+                                 decroissant: bool = True
+                                 ) -> Tuple[List[Tuple[Emprunt, Livre]], Optional[str]]:
+        """
+        Récupère la page suivante de l'historique des emprunts (pagination par clé).
+        
+        Args:
+            apres (Optional[str]): Jeton retourné par la page précédente (None pour la première)
+            taille_page (int): Nombre d'emprunts par page
+            livre_id (Optional[int]): Si spécifié, limite l'historique à un livre particulier
+            tri (str): Critère de tri (voir TRIS_EMPRUNTS)
+            decroissant (bool): Tri décroissant (par défaut, les plus récents d'abord)
+            
+        Returns:
+            Tuple[List[Tuple[Emprunt, Livre]], Optional[str]]: Les emprunts et le jeton suivant
+        """
+        conditions, params = ([], []) if livre_id is None else (["e.livre_id = ?"], [livre_id])
+        return self._page_emprunts(conditions, params, tri, decroissant, taille_page, apres=apres,
+                                   historique=True)
+    
+    @staticmethod
+    def _requete_plein_texte(terme: str) -> Optional[str]:
+        """
+        Construit une requête FTS5 à partir d'un terme saisi.
+        
+        Chaque mot devient un préfixe entre guillemets (les caractères spéciaux
+        de la syntaxe FTS5 sont ainsi neutralisés) ; tous les mots doivent
+        être présents.
+        
+        Args:
+            terme (str): Terme de recherche
+            
+        Returns:
+            Optional[str]: Requête MATCH, ou None si le terme ne contient aucun mot
+        """
+        mots = re.findall(r"\w+", terme)
+        if not mots:
+            return None
+        return " ".join(f'"{mot}"*' for mot in mots)
+    
+    def rechercher_livre(self, terme: str, limite: Optional[int] = 100) -> List[Livre]:
         """
         Recherche des livres par titre ou auteur.
         
+        Utilise l'index plein texte (préfixes, sans tenir compte de la casse
+        ni des accents, au plus les CANDIDATS_RECHERCHE correspondances les
+        plus pertinentes, classées par pertinence) lorsque FTS5 est
+        disponible, sinon une recherche LIKE.
+        
         Args:
             terme (str): Terme de recherche
+            limite (Optional[int]): Nombre maximal de résultats (None : pas de limite)
             
         Returns:
             List[Livre]: Liste des livres correspondants
         """
-        terme = f"%{terme}%"
-        self.cursor.execute(
-            "SELECT id, titre, auteur, date_publication FROM livres WHERE titre LIKE ? OR auteur LIKE ?",
-            (terme, terme)
-        )
-        return [Livre(titre, auteur, date_publication, id) 
-                for id, titre, auteur, date_publication in self.cursor.fetchall()]
+        limite = -1 if limite is None else limite
+        generation = None
+        if self.cache is not None:
+            livres = self.cache.recherche(terme, limite)
+            if livres is not None:
+                return livres
+            generation = self.cache.generation
+        
+        if self.recherche_plein_texte:
+            requete = self._requete_plein_texte(terme)
+            if requete is None:
+                return []
+            sql = f"""
+                SELECT {COLONNES_LIVRE}
+                FROM (
+                    SELECT rowid, rank FROM livres_fts
+                    WHERE livres_fts MATCH ? ORDER BY rank LIMIT ?
+                ) AS resultats
+                JOIN livres ON livres.id = resultats.rowid
+                ORDER BY resultats.rank
+                LIMIT ?
+            """
+            params = (requete, self.CANDIDATS_RECHERCHE, limite)
+        else:
+            motif = f"%{terme}%"
+            sql = f"SELECT {COLONNES_LIVRE} FROM livres WHERE titre LIKE ? OR auteur LIKE ? LIMIT ?"
+            params = (motif, motif, limite)
+        with self._lecture() as conn:
+            livres = [Livre.depuis_base(*row) for row in conn.execute(sql, params).fetchall()]
+        if self.cache is not None:
+            self.cache.memoriser_recherche(terme, limite, livres, generation)
+        return livres
     
     def mettre_a_jour_livre(self, livre: Livre) -> bool:
         """
@@ -330,34 +1581,196 @@ class Bibliotheque:
         # Valider le format de la date avant la mise à jour
         livre.valider_date()
         
-        # Vérifier si un autre livre existe déjà avec le même titre et auteur
-        self.cursor.execute(
-            "SELECT id FROM livres WHERE titre = ? AND auteur = ? AND id != ?",
-            (livre.titre, livre.auteur, livre.id)
-        )
-        if self.cursor.fetchone():
-            raise ValueError(f"Un autre livre avec le titre '{livre.titre}' de {livre.auteur} existe déjà")
-        
-        try:
-            self.cursor.execute(
-                "UPDATE livres SET titre = ?, auteur = ?, date_publication = ? WHERE id = ?",
-                (livre.titre, livre.auteur, livre.date_publication, livre.id)
-            )
-            self.conn.commit()
-            return self.cursor.rowcount > 0
-        except sqlite3.IntegrityError:
-            raise ValueError(f"Un autre livre avec le titre '{livre.titre}' de {livre.auteur} existe déjà")
+        with self._ecriture() as conn:
+            # Vérifier si un autre livre existe déjà avec le même titre et auteur
+            if conn.execute(
+                "SELECT id FROM livres WHERE titre = ? AND auteur = ? AND id != ?",
+                (livre.titre, livre.auteur, livre.id)
+            ).fetchone():
+                raise ValueError(f"Un autre livre avec le titre '{livre.titre}' de {livre.auteur} existe déjà")
+            
+            try:
+                curseur = conn.execute(
+                    "UPDATE livres SET titre = ?, auteur = ?, date_publication = ? WHERE id = ?",
+                    (livre.titre, livre.auteur, vers_iso(livre.date_publication), livre.id)
+                )
+                self._valider()
+                self._invalider_livres(livre.id)
+                if curseur.rowcount > 0:
+                    self._notifier("livres", MODIFIE, [livre.id])
+                return curseur.rowcount > 0
+            except sqlite3.IntegrityError:
+                raise ValueError(f"Un autre livre avec le titre '{livre.titre}' de {livre.auteur} existe déjà")
     
     def supprimer_livre(self, id: int) -> bool:
         """
-        Supprime un livre de la base de données.
+        Supprime un livre de la base de données, avec ses exemplaires et ses emprunts.
+        
+        Les emprunts du livre sont d'abord copiés dans l'archive : son
+        historique reste lisible. Selon la politique de suppression
+        (self.suppression), la suppression est refusée tant qu'un emprunt est
+        en cours ("bloquer"), ou les emprunts en cours sont archivés comme
+        retournés ("archiver").
         
         Args:
             id (int): L'ID du livre à supprimer
             
         Returns:
             bool: True si la suppression a réussi, False sinon
+            
+        Raises:
+            ValueError: Si le livre est emprunté et que la politique est "bloquer"
+        """
+        with self._ecriture() as conn:
+            if self.suppression == "bloquer" and conn.execute(
+                "SELECT 1 FROM emprunts WHERE livre_id = ? AND date_retour_reelle IS NULL LIMIT 1",
+                (id,)
+            ).fetchone():
+                raise ValueError("Ce livre a des emprunts en cours")
+            try:
+                archiver_emprunts(conn, "e.livre_id = ?", (id,))
+                en_cours = [
+                    emprunt_id for emprunt_id, ouvert in conn.execute(
+                        "DELETE FROM emprunts WHERE livre_id = ? "
+                        "RETURNING id, date_retour_reelle IS NULL", (id,)
+                    ).fetchall() if ouvert
+                ]
+                curseur = conn.execute("DELETE FROM livres WHERE id = ?", (id,))
+            except sqlite3.Error:
+                self._annuler_instruction(conn)
+                raise
+            self._valider()
+            self._invalider_livres(id)
+            if en_cours:
+                self._notifier("emprunts", SUPPRIME, en_cours)
+            if curseur.rowcount > 0:
+                self._notifier("livres", SUPPRIME, [id])
+        return curseur.rowcount > 0
+    
+    def balayer_orphelins(self, taille_lot: int = 1000, pause: float = 0.0,
+                          progression: Optional[Callable[[int, int], None]] = None) -> int:
+        """
+        Supprime par lots les emprunts dont le livre n'existe plus.
+        
+        Ces emprunts orphelins datent d'avant la vérification des clés
+        étrangères. La table emprunts est parcourue par tranches de sa clé
+        primaire, chaque emprunt étant cherché dans livres par la sienne :
+        un lot coûte le même temps quelle que soit la taille de la table. La
+        connexion d'écriture n'est réservée que le temps d'un lot : le
+        balayage peut tourner en arrière-plan (dans un thread, ou avec
+        AsyncBibliotheque.balayer_orphelins) pendant que l'application écrit.
+        Avec la politique "archiver", les emprunts sont d'abord archivés.
+        
+        Args:
+            taille_lot (int): Nombre d'emprunts examinés par lot
+            pause (float): Attente entre deux lots, en secondes
+            progression (Optional[Callable[[int, int], None]]): Appelée après chaque
+                lot avec le dernier ID examiné et le nombre d'emprunts supprimés
+            
+        Returns:
+            int: Nombre d'emprunts orphelins supprimés
+            
+        Raises:
+            ValueError: Si la taille des lots n'est pas positive
+        """
+        if taille_lot < 1:
+            raise ValueError("La taille des lots doit être positive")
+        orphelin = "NOT EXISTS (SELECT 1 FROM livres WHERE livres.id = {}.livre_id)"
+        dernier_id = 0
+        total = 0
+        while True:
+            with self._ecriture() as conn:
+                fin = conn.execute(
+                    "SELECT MAX(id) FROM (SELECT id FROM emprunts WHERE id > ? ORDER BY id LIMIT ?)",
+                    (dernier_id, taille_lot)
+                ).fetchone()[0]
+                if fin is None:
+                    break
+                try:
+                    if self.suppression == "archiver":
+                        archiver_emprunts(conn, f"e.id > ? AND e.id <= ? AND {orphelin.format('e')}",
+                                          (dernier_id, fin))
+                    ids = [row[0] for row in conn.execute(
+                        f"DELETE FROM emprunts WHERE id > ? AND id <= ? "
+                        f"AND {orphelin.format('emprunts')} RETURNING id",
+                        (dernier_id, fin)
+                    ).fetchall()]
+                except sqlite3.Error:
+                    self._annuler_instruction(conn)
+                    raise
+                self._valider()
+                if ids:
+                    self._notifier("emprunts", SUPPRIME, ids)
+            dernier_id = fin
+            total += len(ids)
+            if progression:
+                progression(dernier_id, total)
+            if pause:
+                time.sleep(pause)
+        return total
+    
+    def archiver_historique(self, age_jours: int = AGE_ARCHIVAGE, taille_lot: int = 1000,
+                            pause: float = 0.0,
+                            progression: Optional[Callable[[int, int], None]] = None) -> int:
+        """
+        Déplace par lots dans l'archive les emprunts retournés depuis plus de age_jours jours.
+        
+        La table emprunts ne garde ainsi que les emprunts en cours et les
+        retours récents : les requêtes courantes (emprunts en cours, retards,
+        disponibilité) portent sur un petit ensemble, tandis que l'historique
+        (iter_historique, obtenir_historique_emprunts...) lit aussi l'archive.
+        Chaque lot est copié puis supprimé de emprunts dans la même
+        transaction ; comme pour balayer_orphelins, la table est parcourue par
+        tranches de sa clé primaire et la connexion d'écriture n'est réservée
+        que le temps d'un lot. Les statistiques de circulation ne changent pas.
+        
+        Args:
+            age_jours (int): Ancienneté minimale du retour, en jours
+            taille_lot (int): Nombre d'emprunts examinés par lot
+            pause (float): Attente entre deux lots, en secondes
+            progression (Optional[Callable[[int, int], None]]): Appelée après chaque
+                lot avec le dernier ID examiné et le nombre d'emprunts archivés
+            
+        Returns:
+            int: Nombre d'emprunts archivés
+            
+        Raises:
+            ValueError: Si l'âge est négatif ou si la taille des lots n'est pas positive
         """
-        self.cursor.execute("DELETE FROM livres WHERE id = ?", (id,))
-        self.conn.commit()
-        return self.cursor.rowcount > 0 
\ No newline at end of file
+        if age_jours < 0:
+            raise ValueError("L'âge d'archivage ne peut pas être négatif")
+        if taille_lot < 1:
+            raise ValueError("La taille des lots doit être positive")
+        limite = (date.today() - timedelta(days=age_jours)).isoformat()
+        ancien = "{0}.date_retour_reelle IS NOT NULL AND {0}.date_retour_reelle < ?"
+        dernier_id = 0
+        total = 0
+        while True:
+            with self._ecriture() as conn:
+                fin = conn.execute(
+                    "SELECT MAX(id) FROM (SELECT id FROM emprunts WHERE id > ? ORDER BY id LIMIT ?)",
+                    (dernier_id, taille_lot)
+                ).fetchone()[0]
+                if fin is None:
+                    break
+                try:
+                    archiver_emprunts(conn, f"e.id > ? AND e.id <= ? AND {ancien.format('e')}",
+                                      (dernier_id, fin, limite))
+                    ids = [row[0] for row in conn.execute(
+                        f"DELETE FROM emprunts WHERE id > ? AND id <= ? "
+                        f"AND {ancien.format('emprunts')} RETURNING id",
+                        (dernier_id, fin, limite)
+                    ).fetchall()]
+                except sqlite3.Error:
+                    self._annuler_instruction(conn)
+                    raise
+                self._valider()
+                if ids:
+                    self._notifier("emprunts", SUPPRIME, ids)
+            dernier_id = fin
+            total += len(ids)
+            if progression:
+                progression(dernier_id, total)
+            if pause:
+                time.sleep(pause)
+        return total
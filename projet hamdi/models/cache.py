@@ -0,0 +1,274 @@
+"""
+Cache de lecture en mémoire pour une instance de Bibliotheque.
+
+Le cache retient :
+    - les livres déjà lus, par id (LRU borné) ;
+    - l'ensemble des livre_id dont aucun exemplaire n'est disponible ;
+    - les résultats des dernières recherches (LRU borné) ;
+    - le nombre de livres.
+
+Il est tenu à jour par les méthodes d'écriture de la même instance. Il ne
+voit pas les écritures faites par un autre processus ou une autre instance :
+à n'activer que lorsque cette instance est la seule à écrire dans la base.
+
+Chaque écriture fait avancer un numéro de génération. Une valeur lue en
+base n'est retenue que si aucune écriture n'a eu lieu depuis le début de
+sa lecture : un thread lent ne peut pas réinstaller une valeur périmée.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Iterable, List, Optional, Tuple
+from models.livre import Livre
+
+# Catégories de lectures suivies par les compteurs
+CATEGORIES = ("livres", "emprunts", "recherches", "compte")
+
+
+def _copier(livre: Livre) -> Livre:
+    """Retourne une copie du livre : l'appelant peut la modifier sans altérer le cache."""
+    return Livre.depuis_base(livre.id, livre.titre, livre.auteur, livre.date_publication,
+                             livre.nombre_exemplaires, livre.exemplaires_disponibles)
+
+
+class CacheLecture:
+    """
+    Cache de lecture partagé par les threads d'une Bibliotheque.
+
+    Attributes:
+        taille_livres (int): Nombre maximal de livres retenus
+        taille_recherches (int): Nombre maximal de recherches retenues
+    """
+
+    def __init__(self, taille_livres: int = 1000, taille_recherches: int = 100):
+        """
+        Initialise un cache vide.
+
+        Args:
+            taille_livres (int): Nombre maximal de livres retenus
+            taille_recherches (int): Nombre maximal de recherches retenues
+        """
+        self.taille_livres = taille_livres
+        self.taille_recherches = taille_recherches
+        self._verrou = threading.Lock()
+        self._livres: "OrderedDict[int, Livre]" = OrderedDict()
+        self._recherches: "OrderedDict[Tuple[str, int], Tuple[Livre, ...]]" = OrderedDict()
+        self._empruntes: Optional[set] = None
+        self._nombre_livres: Optional[int] = None
+        self._succes = dict.fromkeys(CATEGORIES, 0)
+        self._echecs = dict.fromkeys(CATEGORIES, 0)
+        self.generation = 0
+
+    def _compter(self, categorie: str, trouve: bool):
+        """Met à jour les compteurs de succès et d'échecs (verrou déjà pris)."""
+        if trouve:
+            self._succes[categorie] += 1
+        else:
+            self._echecs[categorie] += 1
+
+    # Livres par id
+
+    def livre(self, livre_id: int) -> Optional[Livre]:
+        """
+        Cherche un livre dans le cache.
+
+        Args:
+            livre_id (int): L'ID du livre
+
+        Returns:
+            Optional[Livre]: Une copie du livre, ou None s'il n'est pas en cache
+        """
+        with self._verrou:
+            livre = self._livres.get(livre_id)
+            self._compter("livres", livre is not None)
+            if livre is None:
+                return None
+            self._livres.move_to_end(livre_id)
+            return _copier(livre)
+
+    def memoriser_livre(self, livre: Livre, generation: int):
+        """
+        Ajoute un livre au cache.
+
+        Args:
+            livre (Livre): Le livre lu en base (avec son id)
+            generation (int): Valeur de self.generation avant la lecture
+        """
+        with self._verrou:
+            if generation != self.generation:
+                return
+            self._livres[livre.id] = _copier(livre)
+            self._livres.move_to_end(livre.id)
+            while len(self._livres) > self.taille_livres:
+                self._livres.popitem(last=False)
+
+    # Disponibilité
+
+    def est_emprunte(self, livre_id: int) -> Optional[bool]:
+        """
+        Indique si tous les exemplaires d'un livre sont empruntés d'après le cache.
+
+        Args:
+            livre_id (int): L'ID du livre
+
+        Returns:
+            Optional[bool]: True ou False, ou None si l'ensemble n'est pas encore chargé
+        """
+        with self._verrou:
+            self._compter("emprunts", self._empruntes is not None)
+            if self._empruntes is None:
+                return None
+            return livre_id in self._empruntes
+
+    def charger_empruntes(self, livre_ids: Iterable[int], generation: int):
+        """
+        Remplace l'ensemble des livres indisponibles.
+
+        Args:
+            livre_ids (Iterable[int]): IDs des livres sans exemplaire disponible
+            generation (int): Valeur de self.generation avant la lecture
+        """
+        with self._verrou:
+            if generation != self.generation:
+                return
+            self._empruntes = set(livre_ids)
+
+    def marquer_disponibilite(self, livre_id: int, disponibles: int):
+        """
+        Reporte le nombre d'exemplaires disponibles d'un livre après une écriture.
+
+        Le livre en cache et les résultats de recherche qui le contiennent
+        sont corrigés sur place plutôt qu'oubliés.
+
+        Args:
+            livre_id (int): L'ID du livre
+            disponibles (int): Nombre d'exemplaires disponibles lu en base
+        """
+        with self._verrou:
+            self.generation += 1
+            if self._empruntes is not None:
+                if disponibles > 0:
+                    self._empruntes.discard(livre_id)
+                else:
+                    self._empruntes.add(livre_id)
+            livre = self._livres.get(livre_id)
+            if livre is not None:
+                livre.exemplaires_disponibles = disponibles
+            for livres in self._recherches.values():
+                for livre in livres:
+                    if livre.id == livre_id:
+                        livre.exemplaires_disponibles = disponibles
+
+    # Recherches et nombre de livres
+
+    def recherche(self, terme: str, limite: int) -> Optional[List[Livre]]:
+        """
+        Cherche le résultat d'une recherche récente.
+
+        Args:
+            terme (str): Terme de recherche
+            limite (int): Nombre maximal de résultats demandé
+
+        Returns:
+            Optional[List[Livre]]: Copies des livres trouvés, ou None si la recherche n'est pas en cache
+        """
+        with self._verrou:
+            livres = self._recherches.get((terme, limite))
+            self._compter("recherches", livres is not None)
+            if livres is None:
+                return None
+            self._recherches.move_to_end((terme, limite))
+            return [_copier(livre) for livre in livres]
+
+    def memoriser_recherche(self, terme: str, limite: int, livres: List[Livre], generation: int):
+        """
+        Retient le résultat d'une recherche.
+
+        Args:
+            terme (str): Terme de recherche
+            limite (int): Nombre maximal de résultats demandé
+            livres (List[Livre]): Livres trouvés
+            generation (int): Valeur de self.generation avant la lecture
+        """
+        with self._verrou:
+            if generation != self.generation:
+                return
+            self._recherches[(terme, limite)] = tuple(_copier(livre) for livre in livres)
+            self._recherches.move_to_end((terme, limite))
+            while len(self._recherches) > self.taille_recherches:
+                self._recherches.popitem(last=False)
+
+    def nombre_livres(self) -> Optional[int]:
+        """
+        Retourne le nombre de livres s'il est connu.
+
+        Returns:
+            Optional[int]: Nombre de livres, ou None s'il n'est pas en cache
+        """
+        with self._verrou:
+            self._compter("compte", self._nombre_livres is not None)
+            return self._nombre_livres
+
+    def memoriser_nombre_livres(self, nombre: int, generation: int):
+        """
+        Retient le nombre de livres.
+
+        Args:
+            nombre (int): Nombre de livres lu en base
+            generation (int): Valeur de self.generation avant la lecture
+        """
+        with self._verrou:
+            if generation == self.generation:
+                self._nombre_livres = nombre
+
+    # Invalidation
+
+    def invalider_livres(self, *livre_ids: int):
+        """
+        Oublie ce qui dépend du catalogue après une écriture sur les livres.
+
+        Les recherches et le nombre de livres sont toujours oubliés ; les
+        livres indiqués sont en plus retirés du cache (un ajout n'en indique aucun).
+
+        Args:
+            livre_ids (int): IDs des livres modifiés ou supprimés
+        """
+        with self._verrou:
+            self.generation += 1
+            self._recherches.clear()
+            self._nombre_livres = None
+            for livre_id in livre_ids:
+                self._livres.pop(livre_id, None)
+
+    def vider(self):
+        """Oublie tout le contenu du cache (les compteurs sont conservés)."""
+        with self._verrou:
+            self.generation += 1
+            self._livres.clear()
+            self._recherches.clear()
+            self._empruntes = None
+            self._nombre_livres = None
+
+    def statistiques(self) -> dict:
+        """
+        Retourne les compteurs du cache pour la surveillance.
+
+        Returns:
+            dict: Par catégorie, succès, échecs et taux de succès ; tailles actuelles
+        """
+        with self._verrou:
+            statistiques = {}
+            for categorie in CATEGORIES:
+                succes, echecs = self._succes[categorie], self._echecs[categorie]
+                total = succes + echecs
+                statistiques[categorie] = {
+                    "succes": succes,
+                    "echecs": echecs,
+                    "taux": succes / total if total else 0.0,
+                }
+            statistiques["taille_livres"] = len(self._livres)
+            statistiques["taille_recherches"] = len(self._recherches)
+            statistiques["livres_empruntes"] = (
+                len(self._empruntes) if self._empruntes is not None else None
+            )
+            return statistiques
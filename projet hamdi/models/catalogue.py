@@ -0,0 +1,110 @@
+"""
+Lecture de catalogues de livres (CSV ou JSON Lines) pour l'import en masse.
+
+Les fichiers sont lus en flux : une seule ligne est en mémoire à la fois.
+Colonnes attendues : titre, auteur, date_publication (JJ/MM/AAAA).
+"""
+
+import csv
+import json
+import os
+from typing import Iterator, List, Tuple
+
+
+class RapportImport:
+    """
+    Résultat d'un import en masse.
+
+    Attributes:
+        lignes_lues (int): Nombre de lignes traitées
+        inseres (int): Nombre de livres insérés
+        erreurs (List[Tuple[int, str]]): Numéro de ligne et message pour chaque rejet
+        duree (float): Durée de l'import en secondes
+    """
+
+    def __init__(self):
+        """Initialise un rapport vide."""
+        self.lignes_lues = 0
+        self.inseres = 0
+        self.erreurs: List[Tuple[int, str]] = []
+        self.duree = 0.0
+
+    @property
+    def debit(self) -> float:
+        """
+        Nombre de lignes traitées par seconde.
+
+        Returns:
+            float: Débit de l'import
+        """
+        return self.lignes_lues / self.duree if self.duree > 0 else 0.0
+
+    def __str__(self) -> str:
+        """
+        Retourne un résumé du rapport.
+
+        Returns:
+            str: Résumé de l'import
+        """
+        return (f"{self.lignes_lues} ligne(s) lue(s), {self.inseres} livre(s) inséré(s), "
+                f"{len(self.erreurs)} erreur(s) en {self.duree:.2f} s "
+                f"({self.debit:.0f} lignes/s)")
+
+
+def lire_csv(chemin: str) -> Iterator[dict]:
+    """
+    Lit un catalogue CSV ligne par ligne.
+
+    Args:
+        chemin (str): Chemin du fichier CSV (avec ligne d'en-tête)
+
+    Yields:
+        dict: Une ligne du catalogue
+    """
+    with open(chemin, newline="", encoding="utf-8-sig") as fichier:
+        yield from csv.DictReader(fichier)
+
+
+def lire_jsonl(chemin: str) -> Iterator[dict]:
+    """
+    Lit un catalogue JSON Lines (un objet JSON par ligne).
+
+    Les lignes illisibles sont transmises telles quelles pour être
+    signalées dans le rapport d'import plutôt que d'interrompre la lecture.
+
+    Args:
+        chemin (str): Chemin du fichier JSON Lines
+
+    Yields:
+        dict: Une ligne du catalogue
+    """
+    with open(chemin, encoding="utf-8") as fichier:
+        for ligne in fichier:
+            ligne = ligne.strip()
+            if not ligne:
+                continue
+            try:
+                yield json.loads(ligne)
+            except json.JSONDecodeError:
+                yield ligne
+
+
+def lire_catalogue(chemin: str) -> Iterator[dict]:
+    """
+    Lit un catalogue en choisissant le format d'après l'extension.
+
+    Args:
+        chemin (str): Chemin du fichier (.csv, .jsonl ou .ndjson)
+
+    Returns:
+        Iterator[dict]: Les lignes du catalogue
+
+    Raises:
+        ValueError: Si l'extension n'est pas reconnue
+    """
+    extension = os.path.splitext(chemin)[1].lower()
+    if extension == ".csv":
+        return lire_csv(chemin)
+    if extension in (".jsonl", ".ndjson"):
+        return lire_jsonl(chemin)
+    raise ValueError(f"Format de fichier non reconnu : {extension or chemin}")
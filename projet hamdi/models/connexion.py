@@ -0,0 +1,110 @@
+"""
+Ouverture des connexions SQLite selon un profil de réglages (PRAGMA).
+
+Profils disponibles :
+    durable       : WAL, synchronous=FULL ; aucune transaction validée n'est perdue
+    rapide        : WAL, synchronous=NORMAL, grand cache et mmap ; une coupure de
+                    courant peut perdre les dernières transactions, jamais corrompre
+    lecture_seule : base ouverte en lecture seule (mode=ro, query_only), grand cache
+
+En mode WAL les lecteurs ne bloquent pas l'écrivain (et inversement) : l'interface
+graphique et db_tools.py peuvent travailler en même temps sur database.db.
+
+Quel que soit le profil, les clés étrangères sont vérifiées (PRAGMA foreign_keys).
+"""
+
+import sqlite3
+from pathlib import Path
+
+PROFIL_PAR_DEFAUT = "durable"
+
+PROFILS = {
+    "durable": {
+        "journal_mode": "WAL",
+        "synchronous": "FULL",
+        "cache_size": -8000,            # en Kio (valeur négative) : 8 Mo
+        "mmap_size": 0,
+        "temp_store": "DEFAULT",
+        "busy_timeout": 5000,           # en millisecondes
+    },
+    "rapide": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -65536,           # 64 Mo
+        "mmap_size": 268435456,         # 256 Mo
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,
+    },
+    "lecture_seule": {
+        "query_only": 1,
+        "cache_size": -32768,           # 32 Mo
+        "mmap_size": 268435456,
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,
+    },
+}
+
+NOMS_SYNCHRONOUS = {0: "OFF", 1: "NORMAL", 2: "FULL", 3: "EXTRA"}
+NOMS_TEMP_STORE = {0: "DEFAULT", 1: "FILE", 2: "MEMORY"}
+
+
+def ouvrir_connexion(db_path: str, profil: str = PROFIL_PAR_DEFAUT,
+                     check_same_thread: bool = True) -> sqlite3.Connection:
+    """
+    Ouvre une connexion et lui applique les réglages d'un profil.
+
+    Args:
+        db_path (str): Chemin vers le fichier de la base de données
+        profil (str): Nom du profil (voir PROFILS)
+        check_same_thread (bool): Interdire l'usage de la connexion depuis un autre thread
+
+    Returns:
+        sqlite3.Connection: La connexion configurée
+
+    Raises:
+        ValueError: Si le profil est inconnu ou incompatible avec la base
+    """
+    if profil not in PROFILS:
+        raise ValueError(f"Profil inconnu '{profil}' (valeurs possibles : {', '.join(PROFILS)})")
+    reglages = PROFILS[profil]
+
+    if profil == "lecture_seule":
+        if db_path == ":memory:":
+            raise ValueError("Une base en mémoire ne peut pas être ouverte en lecture seule")
+        uri = Path(db_path).resolve().as_uri() + "?mode=ro"
+        conn = sqlite3.connect(uri, uri=True, check_same_thread=check_same_thread)
+    else:
+        conn = sqlite3.connect(db_path, check_same_thread=check_same_thread)
+
+    for pragma, valeur in reglages.items():
+        conn.execute(f"PRAGMA {pragma} = {valeur}")
+    # Clés étrangères vérifiées sur toutes les connexions, quel que soit le profil
+    conn.execute("PRAGMA foreign_keys = ON")
+    return conn
+
+
+def lire_reglages(conn: sqlite3.Connection) -> dict:
+    """
+    Lit les réglages effectifs d'une connexion.
+
+    Args:
+        conn (sqlite3.Connection): Connexion à inspecter
+
+    Returns:
+        dict: Valeur de chaque PRAGMA réglé par les profils
+    """
+    def pragma(nom):
+        ligne = conn.execute(f"PRAGMA {nom}").fetchone()
+        # Certains réglages (mmap_size) ne renvoient rien pour une base en mémoire
+        return ligne[0] if ligne else None
+
+    return {
+        "journal_mode": pragma("journal_mode"),
+        "synchronous": NOMS_SYNCHRONOUS.get(pragma("synchronous")),
+        "cache_size": pragma("cache_size"),
+        "mmap_size": pragma("mmap_size"),
+        "temp_store": NOMS_TEMP_STORE.get(pragma("temp_store")),
+        "busy_timeout": pragma("busy_timeout"),
+        "query_only": bool(pragma("query_only")),
+        "foreign_keys": bool(pragma("foreign_keys")),
+    }
@@ -0,0 +1,141 @@
+"""
+Conversions entre le format d'affichage des dates (JJ/MM/AAAA) et le format
+de stockage ISO-8601 (AAAA-MM-JJ) utilisé dans la base de données.
+
+Le format ISO est triable lexicographiquement : SQLite peut donc s'appuyer sur
+un index pour les tris et les filtres par période.
+"""
+
+from datetime import datetime
+from typing import Iterable, List, Optional
+
+FORMAT_AFFICHAGE = "%d/%m/%Y"
+FORMAT_STOCKAGE = "%Y-%m-%d"
+
+
+def vers_iso(date: str) -> str:
+    """
+    Convertit une date JJ/MM/AAAA en date ISO AAAA-MM-JJ.
+
+    Args:
+        date (str): Date au format JJ/MM/AAAA
+
+    Returns:
+        str: Date au format AAAA-MM-JJ
+
+    Raises:
+        ValueError: Si la date n'est pas au format JJ/MM/AAAA
+    """
+    try:
+        return datetime.strptime(date, FORMAT_AFFICHAGE).strftime(FORMAT_STOCKAGE)
+    except (TypeError, ValueError):
+        raise ValueError("La date doit être au format JJ/MM/AAAA")
+
+
+def aujourd_hui_iso() -> str:
+    """Retourne la date du jour au format AAAA-MM-JJ."""
+    return datetime.now().strftime(FORMAT_STOCKAGE)
+
+
+def sql_vers_affichage(colonne: str) -> str:
+    """
+    Expression SQL convertissant une colonne ISO en JJ/MM/AAAA.
+
+    Args:
+        colonne (str): Nom (éventuellement qualifié) de la colonne
+
+    Returns:
+        str: Fragment SQL
+    """
+    return f"strftime('%d/%m/%Y', {colonne})"
+
+
+def sql_vers_iso(colonne: str) -> str:
+    """
+    Expression SQL convertissant une colonne JJ/MM/AAAA en AAAA-MM-JJ.
+
+    Args:
+        colonne (str): Nom de la colonne
+
+    Returns:
+        str: Fragment SQL
+    """
+    return (f"substr({colonne}, 7, 4) || '-' || substr({colonne}, 4, 2) "
+            f"|| '-' || substr({colonne}, 1, 2)")
+
+
+def sql_est_format_affichage(colonne: str) -> str:
+    """
+    Condition SQL vraie si la colonne est encore au format JJ/MM/AAAA.
+
+    Args:
+        colonne (str): Nom de la colonne
+
+    Returns:
+        str: Fragment SQL
+    """
+    return f"{colonne} LIKE '__/__/____'"
+
+
+def valider_dates(dates: Iterable[str]) -> List[Optional[str]]:
+    """
+    Valide et convertit un lot de dates JJ/MM/AAAA.
+
+    Chaque valeur distincte n'est analysée qu'une fois par lot, ce qui
+    rend la validation peu coûteuse pour les catalogues où les mêmes dates
+    reviennent souvent.
+
+    Args:
+        dates (Iterable[str]): Dates au format JJ/MM/AAAA
+
+    Returns:
+        List[Optional[str]]: Dates ISO correspondantes, None pour les dates invalides
+    """
+    deja_vues = {}
+    resultats = []
+    for date in dates:
+        if date not in deja_vues:
+            try:
+                deja_vues[date] = vers_iso(date)
+            except ValueError:
+                deja_vues[date] = None
+        resultats.append(deja_vues[date])
+    return resultats
+
+
+def _corriger_date_iso(date) -> Optional[str]:
+    """Retourne la date ISO correspondant à une valeur stockée, ou None si elle est irrécupérable."""
+    texte = str(date).strip() if date is not None else ""
+    if len(texte) == 4 and texte.isdigit():
+        # Ancien schéma : année seule
+        return f"{texte}-01-01"
+    for format_ in (FORMAT_STOCKAGE, FORMAT_AFFICHAGE):
+        try:
+            return datetime.strptime(texte, format_).strftime(FORMAT_STOCKAGE)
+        except ValueError:
+            continue
+    return None
+
+
+def corriger_dates_iso(dates: Iterable) -> List[Optional[str]]:
+    """
+    Contrôle un lot de dates stockées et propose leur forme ISO.
+
+    Une date ISO valide est retournée telle quelle ; une date JJ/MM/AAAA,
+    une année seule ou une date ISO sans zéros (1943-4-6) est convertie.
+    Comme pour valider_dates, chaque valeur distincte n'est analysée qu'une
+    fois par lot.
+
+    Args:
+        dates (Iterable): Valeurs lues dans une colonne de dates
+
+    Returns:
+        List[Optional[str]]: Dates au format AAAA-MM-JJ, None pour les valeurs irrécupérables
+    """
+    deja_vues = {}
+    resultats = []
+    for date in dates:
+        if date not in deja_vues:
+            deja_vues[date] = _corriger_date_iso(date)
+        resultats.append(deja_vues[date])
+    return resultats
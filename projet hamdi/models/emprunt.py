@@ -8,13 +8,22 @@ class Emprunt:
         id (int): Identifiant unique de l'emprunt
         livre_id (int): Identifiant du livre emprunté
         emprunteur (str): Nom de l'emprunteur
+        lecteur_id (int): Identifiant du lecteur (None si l'emprunt n'est pas encore enregistré)
+        exemplaire_id (int): Identifiant de l'exemplaire emprunté (None si l'emprunt n'est pas
+            encore enregistré)
         date_emprunt (str): Date de l'emprunt au format JJ/MM/AAAA
         date_retour_prevue (str): Date de retour prévue au format JJ/MM/AAAA
         date_retour_reelle (str): Date de retour réelle au format JJ/MM/AAAA (None si non retourné)
+        en_retard (Optional[bool]): Retard calculé par la requête qui a lu l'emprunt
+            (None pour un emprunt qui n'a pas été lu en base)
     """
     
     DUREE_PRET = 14  # Durée de prêt en jours
     
+    # Pas de __dict__ par instance : objets plus compacts et plus rapides à créer
+    __slots__ = ("id", "livre_id", "emprunteur", "date_emprunt", "date_retour_prevue", "date_retour_reelle",
+                 "en_retard", "lecteur_id", "exemplaire_id")
+    
     def __init__(self, livre_id: int, emprunteur: str, date_emprunt: str = None,
                  date_retour_prevue: str = None, date_retour_reelle: str = None, id: int = None):
         """
@@ -47,20 +56,65 @@ class Emprunt:
             self.date_retour_prevue = date_retour_prevue
         
         self.date_retour_reelle = date_retour_reelle
+        self.en_retard = None
+        self.lecteur_id = None
+        self.exemplaire_id = None
+    
+    @classmethod
+    def depuis_base(cls, id: int, livre_id: int, emprunteur: str, date_emprunt: str,
+                    date_retour_prevue: str, date_retour_reelle: str = None,
+                    en_retard: bool = None, lecteur_id: int = None,
+                    exemplaire_id: int = None) -> "Emprunt":
+        """
+        Construit un emprunt à partir d'une ligne de la base de données, sans calcul de dates.
+        
+        L'objet est créé par cls.__new__ sans passer par __init__ et ses
+        attributs sont affectés directement, sans validation.
+        
+        Args:
+            id (int): ID de l'emprunt
+            livre_id (int): ID du livre emprunté
+            emprunteur (str): Nom de l'emprunteur
+            date_emprunt (str): Date d'emprunt au format JJ/MM/AAAA
+            date_retour_prevue (str): Date de retour prévue au format JJ/MM/AAAA
+            date_retour_reelle (str, optional): Date de retour réelle. Defaults to None.
+            en_retard (bool, optional): Retard calculé en SQL. Defaults to None.
+            lecteur_id (int, optional): ID du lecteur. Defaults to None.
+            exemplaire_id (int, optional): ID de l'exemplaire. Defaults to None.
+            
+        Returns:
+            Emprunt: L'emprunt
+        """
+        emprunt = cls.__new__(cls)
+        emprunt.id = id
+        emprunt.livre_id = livre_id
+        emprunt.emprunteur = emprunteur
+        emprunt.date_emprunt = date_emprunt
+        emprunt.date_retour_prevue = date_retour_prevue
+        emprunt.date_retour_reelle = date_retour_reelle
+        emprunt.en_retard = en_retard
+        emprunt.lecteur_id = lecteur_id
+        emprunt.exemplaire_id = exemplaire_id
+        return emprunt
     
     @property
     def est_en_retard(self) -> bool:
         """
-        Vérifie si l'emprunt est en retard.
+        Vérifie si l'emprunt est en retard (non retourné après la date de retour prévue).
+        
+        Pour un emprunt lu en base, la valeur calculée par la requête est
+        utilisée sans analyser de date.
         
         Returns:
             bool: True si l'emprunt est en retard, False sinon
         """
+        if self.en_retard is not None:
+            return self.en_retard
         if self.date_retour_reelle is not None:
             return False
         
-        date_retour = datetime.strptime(self.date_retour_prevue, "%d/%m/%Y")
-        return datetime.now() > date_retour
+        date_retour = datetime.strptime(self.date_retour_prevue, "%d/%m/%Y").date()
+        return datetime.now().date() > date_retour
     
     @property
     def est_en_cours(self) -> bool:
@@ -83,9 +137,10 @@ class Emprunt:
         Returns:
             str: Représentation de l'emprunt
         """
-        status = "En cours" if self.est_en_cours else "Retourné"
         if self.est_en_retard:
             status = "En retard"
+        else:
+            status = "En cours" if self.est_en_cours else "Retourné"
         
         return (f"Emprunt {self.id} - Livre {self.livre_id} - {self.emprunteur} - "
                 f"Emprunté le {self.date_emprunt} - Retour prévu le {self.date_retour_prevue} - "
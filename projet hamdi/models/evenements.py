@@ -0,0 +1,53 @@
+"""
+Notifications de changements émises par Bibliotheque après chaque écriture.
+
+Un abonné (voir Bibliotheque.abonner) reçoit un Changement après la
+validation de l'écriture ; les changements faits dans un bloc transaction()
+sont transmis à la validation du bloc et oubliés s'il est annulé.
+"""
+
+from typing import List, Optional
+
+# Actions possibles
+INSERE = "insere"
+MODIFIE = "modifie"
+SUPPRIME = "supprime"
+
+
+class Changement:
+    """
+    Description d'une écriture validée.
+
+    Attributes:
+        table (str): "livres" ou "emprunts"
+        action (str): INSERE, MODIFIE ou SUPPRIME
+        ids (Optional[List[int]]): IDs des lignes concernées de la table (un
+            emprunt ou un retour modifie aussi la disponibilité de son livre :
+            un changement "livres" MODIFIE l'accompagne) ; None lorsque les
+            lignes touchées ne sont pas énumérées (import en masse)
+    """
+
+    __slots__ = ("table", "action", "ids")
+
+    def __init__(self, table: str, action: str, ids: Optional[List[int]]):
+        """
+        Initialise un changement.
+
+        Args:
+            table (str): Table modifiée
+            action (str): INSERE, MODIFIE ou SUPPRIME
+            ids (Optional[List[int]]): IDs des lignes concernées, ou None
+        """
+        self.table = table
+        self.action = action
+        self.ids = ids
+
+    def __str__(self) -> str:
+        """
+        Retourne une représentation textuelle du changement.
+
+        Returns:
+            str: Table, action et IDs
+        """
+        ids = "?" if self.ids is None else ", ".join(map(str, self.ids))
+        return f"{self.table} {self.action} [{ids}]"
@@ -0,0 +1,271 @@
+"""
+Export en flux du catalogue et des emprunts (CSV, JSON Lines ou Parquet).
+
+Les lignes sont lues par blocs sur un curseur et écrites au fur et à mesure :
+la mémoire utilisée ne dépend pas de la taille des tables. Les fichiers dont
+le nom se termine par .gz sont compressés au fil de l'écriture. Le format
+Parquet (colonnes typées, compressées) nécessite le module optionnel pyarrow.
+
+Les dates sont exportées au format JJ/MM/AAAA, celui des imports : un export
+du catalogue peut être réimporté tel quel (voir models.catalogue).
+
+Un export incrémental ne reprend que les lignes d'identifiant supérieur à
+celui du dernier export (RapportExport.dernier_id) : les nouveaux livres et
+les nouveaux emprunts, pas les modifications des lignes déjà exportées.
+"""
+
+import csv
+import gzip
+import json
+import os
+import time
+from typing import Callable, Iterator, List, Optional, Tuple
+from models.dates import sql_vers_affichage
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+# Jeux de données exportables : requête (filtrée sur l'id, triée par id) et
+# colonnes avec leur type ("int" ou "str")
+JEUX = {
+    "livres": (
+        f"""
+        SELECT id, titre, auteur, {sql_vers_affichage('date_publication')},
+               nombre_exemplaires, exemplaires_disponibles
+        FROM livres
+        WHERE id > ?
+        ORDER BY id
+        """,
+        [("id", "int"), ("titre", "str"), ("auteur", "str"), ("date_publication", "str"),
+         ("nombre_exemplaires", "int"), ("exemplaires_disponibles", "int")],
+    ),
+    "emprunts": (
+        f"""
+        SELECT e.id, e.livre_id, e.exemplaire_id, e.lecteur_id, e.emprunteur, l.titre,
+               {sql_vers_affichage('e.date_emprunt')}, {sql_vers_affichage('e.date_retour_prevue')}
+        FROM emprunts e
+        LEFT JOIN livres l ON l.id = e.livre_id
+        WHERE e.id > ? AND e.date_retour_reelle IS NULL
+        ORDER BY e.id
+        """,
+        [("id", "int"), ("livre_id", "int"), ("exemplaire_id", "int"), ("lecteur_id", "int"),
+         ("emprunteur", "str"), ("titre", "str"), ("date_emprunt", "str"),
+         ("date_retour_prevue", "str")],
+    ),
+    # Emprunts actifs et archivés : les deux parties, lues dans l'ordre de leur
+    # clé primaire, sont fusionnées par SQLite sans tri
+    "historique": (
+        f"""
+        SELECT e.id, e.livre_id, e.exemplaire_id, e.lecteur_id, e.emprunteur, l.titre,
+               {sql_vers_affichage('e.date_emprunt')}, {sql_vers_affichage('e.date_retour_prevue')},
+               {sql_vers_affichage('e.date_retour_reelle')}
+        FROM emprunts e
+        LEFT JOIN livres l ON l.id = e.livre_id
+        WHERE e.id > ?1
+        UNION ALL
+        SELECT id, livre_id, exemplaire_id, lecteur_id, emprunteur, titre,
+               {sql_vers_affichage('date_emprunt')}, {sql_vers_affichage('date_retour_prevue')},
+               {sql_vers_affichage('date_retour_reelle')}
+        FROM emprunts_archive
+        WHERE id > ?1
+        ORDER BY 1
+        """,
+        [("id", "int"), ("livre_id", "int"), ("exemplaire_id", "int"), ("lecteur_id", "int"),
+         ("emprunteur", "str"), ("titre", "str"), ("date_emprunt", "str"),
+         ("date_retour_prevue", "str"), ("date_retour_reelle", "str")],
+    ),
+}
+
+
+class RapportExport:
+    """
+    Résultat d'un export.
+
+    Attributes:
+        jeu (str): Jeu de données exporté
+        chemin (str): Fichier écrit
+        lignes (int): Nombre de lignes écrites
+        dernier_id (Optional[int]): Identifiant de la dernière ligne écrite, à
+            passer à l'export incrémental suivant (None si aucune ligne)
+        duree (float): Durée de l'export en secondes
+    """
+
+    def __init__(self, jeu: str, chemin: str):
+        """
+        Initialise un rapport vide.
+
+        Args:
+            jeu (str): Jeu de données exporté
+            chemin (str): Fichier écrit
+        """
+        self.jeu = jeu
+        self.chemin = chemin
+        self.lignes = 0
+        self.dernier_id: Optional[int] = None
+        self.duree = 0.0
+
+    @property
+    def debit(self) -> float:
+        """
+        Nombre de lignes écrites par seconde.
+
+        Returns:
+            float: Débit de l'export
+        """
+        return self.lignes / self.duree if self.duree > 0 else 0.0
+
+    def __str__(self) -> str:
+        """
+        Retourne un résumé du rapport.
+
+        Returns:
+            str: Résumé de l'export
+        """
+        return (f"{self.lignes} ligne(s) de {self.jeu} écrite(s) dans {self.chemin} "
+                f"en {self.duree:.2f} s ({self.debit:.0f} lignes/s)")
+
+
+def format_du_fichier(chemin: str) -> Tuple[str, bool]:
+    """
+    Déduit le format et la compression d'un fichier d'après son extension.
+
+    Args:
+        chemin (str): Chemin du fichier (.csv, .jsonl, .ndjson ou .parquet,
+            suivi de .gz pour compresser un CSV ou un JSON Lines)
+
+    Returns:
+        Tuple[str, bool]: Format et compression gzip
+
+    Raises:
+        ValueError: Si l'extension n'est pas reconnue
+    """
+    nom = chemin.lower()
+    compresse = nom.endswith(".gz")
+    if compresse:
+        nom = nom[:-3]
+    extension = os.path.splitext(nom)[1]
+    if extension == ".csv":
+        return "csv", compresse
+    if extension in (".jsonl", ".ndjson"):
+        return "jsonl", compresse
+    if extension == ".parquet" and not compresse:
+        return "parquet", False
+    raise ValueError(f"Format de fichier non reconnu : {extension or chemin}")
+
+
+def _ouvrir_texte(chemin: str, compresse: bool):
+    """Ouvre un fichier texte UTF-8 en écriture, compressé au fil de l'eau si demandé."""
+    if compresse:
+        return gzip.open(chemin, "wt", encoding="utf-8", newline="")
+    return open(chemin, "w", encoding="utf-8", newline="")
+
+
+def _ecrire_csv(blocs: Iterator[List[tuple]], colonnes: List[str], chemin: str, compresse: bool):
+    """Écrit les blocs de lignes dans un fichier CSV avec ligne d'en-tête."""
+    with _ouvrir_texte(chemin, compresse) as fichier:
+        ecrivain = csv.writer(fichier)
+        ecrivain.writerow(colonnes)
+        for bloc in blocs:
+            ecrivain.writerows(bloc)
+
+
+def _ecrire_jsonl(blocs: Iterator[List[tuple]], colonnes: List[str], chemin: str, compresse: bool):
+    """Écrit les blocs de lignes dans un fichier JSON Lines (un objet par ligne)."""
+    with _ouvrir_texte(chemin, compresse) as fichier:
+        for bloc in blocs:
+            fichier.writelines(
+                json.dumps(dict(zip(colonnes, ligne)), ensure_ascii=False) + "\n" for ligne in bloc
+            )
+
+
+def _ecrire_parquet(blocs: Iterator[List[tuple]], colonnes: List[Tuple[str, str]], chemin: str):
+    """
+    Écrit les blocs de lignes dans un fichier Parquet, un groupe de lignes par bloc.
+
+    Raises:
+        ValueError: Si le module pyarrow n'est pas installé
+    """
+    if pyarrow is None:
+        raise ValueError("Le format Parquet nécessite le module pyarrow (pip install pyarrow)")
+    types = {"int": pyarrow.int64(), "str": pyarrow.string()}
+    schema = pyarrow.schema([(nom, types[type_]) for nom, type_ in colonnes])
+    with pyarrow.parquet.ParquetWriter(chemin, schema) as ecrivain:
+        for bloc in blocs:
+            valeurs = list(zip(*bloc))
+            ecrivain.write_table(pyarrow.Table.from_arrays(
+                [pyarrow.array(colonne, type=champ.type) for colonne, champ in zip(valeurs, schema)],
+                schema=schema
+            ))
+
+
+def exporter(bibliotheque, jeu: str, chemin: str, depuis: Optional[int] = None,
+             taille_lot: int = 10000,
+             progression: Optional[Callable[[RapportExport], None]] = None) -> RapportExport:
+    """
+    Exporte un jeu de données en flux.
+
+    Le fichier est d'abord écrit sous un nom temporaire puis renommé : un
+    export interrompu ne laisse pas de fichier incomplet.
+
+    Args:
+        bibliotheque (Bibliotheque): La bibliothèque exportée
+        jeu (str): "livres", "emprunts" (en cours) ou "historique" (tous les
+            emprunts, archivés compris)
+        chemin (str): Fichier à écrire ; le format est déduit de l'extension
+            (voir format_du_fichier)
+        depuis (Optional[int]): N'exporter que les lignes d'identifiant supérieur
+        taille_lot (int): Nombre de lignes lues et écrites à la fois
+        progression (Optional[Callable[[RapportExport], None]]): Appelée après chaque lot
+
+    Returns:
+        RapportExport: Nombre de lignes écrites et dernier identifiant exporté
+
+    Raises:
+        ValueError: Si le jeu ou le format n'est pas reconnu
+    """
+    if jeu not in JEUX:
+        raise ValueError(f"Jeu de données inconnu '{jeu}' (valeurs possibles : {', '.join(JEUX)})")
+    format_, compresse = format_du_fichier(chemin)
+    requete, colonnes = JEUX[jeu]
+    rapport = RapportExport(jeu, chemin)
+    debut = time.perf_counter()
+
+    def noter(bloc: List[tuple]):
+        """Met le rapport à jour après l'écriture d'un lot."""
+        rapport.lignes += len(bloc)
+        rapport.dernier_id = bloc[-1][0]
+        rapport.duree = time.perf_counter() - debut
+        if progression:
+            progression(rapport)
+
+    def blocs() -> Iterator[List[tuple]]:
+        """Lit la requête par lots de taille_lot lignes."""
+        bloc = []
+        for ligne in bibliotheque._iterer(requete, (depuis or 0,), taille_lot):
+            bloc.append(ligne)
+            if len(bloc) == taille_lot:
+                yield bloc
+                noter(bloc)
+                bloc = []
+        if bloc:
+            yield bloc
+            noter(bloc)
+
+    temporaire = chemin + ".partiel"
+    try:
+        if format_ == "parquet":
+            _ecrire_parquet(blocs(), colonnes, temporaire)
+        elif format_ == "csv":
+            _ecrire_csv(blocs(), [nom for nom, _ in colonnes], temporaire, compresse)
+        else:
+            _ecrire_jsonl(blocs(), [nom for nom, _ in colonnes], temporaire, compresse)
+        os.replace(temporaire, chemin)
+    except BaseException:
+        if os.path.exists(temporaire):
+            os.remove(temporaire)
+        raise
+    rapport.duree = time.perf_counter() - debut
+    return rapport
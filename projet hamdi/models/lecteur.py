@@ -0,0 +1,114 @@
+import unicodedata
+from typing import Optional
+
+def nettoyer_nom(nom: str) -> str:
+    """
+    Retire les espaces superflus d'un nom saisi.
+
+    Args:
+        nom (str): Nom tel que saisi
+
+    Returns:
+        str: Nom sans espaces au début, à la fin ni en double
+    """
+    return " ".join(nom.split())
+
+def normaliser_nom(nom: str) -> str:
+    """
+    Calcule la clé de recherche d'un nom : "Dupont", "dupont " et "DUPONT"
+    désignent le même lecteur.
+
+    Args:
+        nom (str): Nom tel que saisi
+
+    Returns:
+        str: Nom nettoyé, en minuscules et sans accents
+    """
+    decompose = unicodedata.normalize("NFKD", nettoyer_nom(nom).casefold())
+    return "".join(c for c in decompose if not unicodedata.combining(c))
+
+class Lecteur:
+    """
+    Classe représentant un lecteur (emprunteur) inscrit à la bibliothèque.
+
+    Attributes:
+        id (int): Identifiant unique du lecteur
+        nom (str): Nom affiché du lecteur
+        limite_emprunts (int): Nombre maximal d'emprunts en cours (None : LIMITE_EMPRUNTS)
+    """
+
+    # Limite par défaut des emprunts en cours, pour les lecteurs sans limite
+    # propre (None : pas de limite)
+    LIMITE_EMPRUNTS = None
+
+    # Pas de __dict__ par instance : objets plus compacts et plus rapides à créer
+    __slots__ = ("id", "nom", "limite_emprunts")
+
+    def __init__(self, nom: str, limite_emprunts: int = None, id: int = None):
+        """
+        Initialise un nouveau lecteur.
+
+        Args:
+            nom (str): Nom du lecteur
+            limite_emprunts (int, optional): Nombre maximal d'emprunts en cours. Defaults to None.
+            id (int, optional): Identifiant unique du lecteur. Defaults to None.
+
+        Raises:
+            ValueError: Si le nom est vide ou la limite négative
+        """
+        self.id = id
+        self.nom = nettoyer_nom(nom)
+        self.limite_emprunts = limite_emprunts
+
+        if not self.nom:
+            raise ValueError("Le nom du lecteur est obligatoire")
+        if limite_emprunts is not None and limite_emprunts < 0:
+            raise ValueError("La limite d'emprunts doit être positive")
+
+    @classmethod
+    def depuis_base(cls, id: int, nom: str, limite_emprunts: int = None) -> "Lecteur":
+        """
+        Construit un lecteur à partir d'une ligne de la base de données, sans validation.
+
+        Args:
+            id (int): Identifiant unique du lecteur
+            nom (str): Nom du lecteur
+            limite_emprunts (int, optional): Nombre maximal d'emprunts en cours
+
+        Returns:
+            Lecteur: Le lecteur
+        """
+        lecteur = cls.__new__(cls)
+        lecteur.id = id
+        lecteur.nom = nom
+        lecteur.limite_emprunts = limite_emprunts
+        return lecteur
+
+    @property
+    def limite_effective(self) -> Optional[int]:
+        """
+        Retourne la limite d'emprunts qui s'applique au lecteur.
+
+        Returns:
+            Optional[int]: Sa limite propre, ou la limite par défaut (None : pas de limite)
+        """
+        return self.LIMITE_EMPRUNTS if self.limite_emprunts is None else self.limite_emprunts
+
+    @property
+    def cle(self) -> str:
+        """
+        Retourne la clé de recherche du lecteur (voir normaliser_nom).
+
+        Returns:
+            str: Nom normalisé
+        """
+        return normaliser_nom(self.nom)
+
+    def __str__(self) -> str:
+        """
+        Retourne une représentation textuelle du lecteur.
+
+        Returns:
+            str: Format: ID - Nom
+        """
+        return f"{self.id} - {self.nom}"
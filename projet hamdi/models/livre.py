@@ -9,8 +9,14 @@ class Livre:
         titre (str): Titre du livre
         auteur (str): Nom de l'auteur du livre
         date_publication (str): Date de publication au format JJ/MM/AAAA
+        nombre_exemplaires (int): Nombre d'exemplaires (None si non lu en base)
+        exemplaires_disponibles (int): Nombre d'exemplaires disponibles (None si non lu en base)
     """
     
+    # Pas de __dict__ par instance : objets plus compacts et plus rapides à créer
+    __slots__ = ("id", "titre", "auteur", "date_publication", "nombre_exemplaires",
+                 "exemplaires_disponibles")
+    
     def __init__(self, titre: str, auteur: str, date_publication: str, id: int = None):
         """
         Initialise un nouveau livre.
@@ -25,10 +31,42 @@ class Livre:
         self.titre = titre
         self.auteur = auteur
         self.date_publication = date_publication
+        self.nombre_exemplaires = None
+        self.exemplaires_disponibles = None
         
         # Valider le format de la date
         self.valider_date()
     
+    @classmethod
+    def depuis_base(cls, id: int, titre: str, auteur: str, date_publication: str,
+                    nombre_exemplaires: int = None, exemplaires_disponibles: int = None) -> "Livre":
+        """
+        Construit un livre à partir d'une ligne de la base de données, sans validation.
+        
+        Les données lues en base ont déjà été validées à l'écriture : ce
+        constructeur évite de les analyser à nouveau. Les saisies de
+        l'utilisateur doivent passer par le constructeur normal.
+        
+        Args:
+            id (int): Identifiant unique du livre
+            titre (str): Titre du livre
+            auteur (str): Nom de l'auteur
+            date_publication (str): Date de publication au format JJ/MM/AAAA
+            nombre_exemplaires (int, optional): Nombre d'exemplaires. Defaults to None.
+            exemplaires_disponibles (int, optional): Exemplaires disponibles. Defaults to None.
+            
+        Returns:
+            Livre: Le livre
+        """
+        livre = cls.__new__(cls)
+        livre.id = id
+        livre.titre = titre
+        livre.auteur = auteur
+        livre.date_publication = date_publication
+        livre.nombre_exemplaires = nombre_exemplaires
+        livre.exemplaires_disponibles = exemplaires_disponibles
+        return livre
+    
     def valider_date(self) -> bool:
         """
         Valide le format de la date (JJ/MM/AAAA).
@@ -0,0 +1,498 @@
+"""
+Migrations du schéma de la base de données.
+
+La version du schéma est enregistrée dans PRAGMA user_version (voir
+models.schema). Chaque migration fait passer la base d'une version à la
+suivante en trois temps :
+    - préparation : tables et colonnes nouvelles (instructions rapides) ;
+    - passes : requêtes ensemblistes (UPDATE, INSERT ... SELECT) appliquées
+      par lots d'identifiants consécutifs. Chaque lot est validé avec son
+      point de reprise dans la table migrations_progression ;
+    - finalisation : index, déclencheurs et compteurs, puis nouvelle version.
+
+Une migration interrompue (arrêt brutal, erreur) reprend au lot qui suit le
+dernier lot validé : seule la préparation, qui peut être rejouée sans effet,
+est refaite. Les lignes ne sont pas chargées en Python, mais la migration des
+lecteurs appelle, pour chaque emprunt, les fonctions de normalisation des
+noms de models.lecteur, enregistrées comme fonctions SQL.
+"""
+
+import sqlite3
+import time
+from typing import Callable, List, Optional, Tuple
+from models.dates import sql_vers_iso, sql_est_format_affichage
+from models.lecteur import nettoyer_nom, normaliser_nom
+from models.schema import (SCHEMA_VERSION, TABLE_LIVRES, TABLE_EXEMPLAIRES, TABLE_LECTEURS,
+                           TABLE_EMPRUNTS, COLONNES_DATES, INDEX_DATES, INDEX_EMPRUNTS,
+                           INDEX_EXEMPLAIRES, INDEX_ARCHIVE, DECLENCHEURS_EXEMPLAIRES,
+                           TABLE_EMPRUNTS_ARCHIVE, INDEX_UNICITE_LIVRES, unicite_livres_presente,
+                           TABLES_RESUME, DECLENCHEURS_RESUME,
+                           AGREGATS_RESUME, lire_version, ecrire_version, creer_index,
+                           recalculer_disponibilites, resumes_statistiques_presents)
+
+# Tables du schéma courant, dans l'ordre de leurs références
+TABLES = (TABLE_LIVRES, TABLE_EXEMPLAIRES, TABLE_LECTEURS, TABLE_EMPRUNTS, TABLE_EMPRUNTS_ARCHIVE)
+
+# Points de reprise des migrations en cours : dernier id traité par passe
+TABLE_PROGRESSION = """
+    CREATE TABLE IF NOT EXISTS migrations_progression (
+        version INTEGER NOT NULL,
+        passe INTEGER NOT NULL,
+        dernier_id INTEGER NOT NULL,
+        PRIMARY KEY (version, passe)
+    )
+"""
+
+
+class Migration:
+    """
+    Passage du schéma à une version.
+
+    Attributes:
+        version (int): Version atteinte une fois la migration appliquée
+        nom (str): Description courte
+        preparation (Callable[[sqlite3.Connection], None]): Instructions rejouables
+            exécutées avant les passes (et à chaque reprise)
+        passes (List[Tuple[str, str]]): Table parcourue et requête de chaque passe ;
+            la requête reçoit les bornes (exclue, incluse) des id du lot
+        finalisation (Callable[[sqlite3.Connection], None]): Instructions exécutées
+            après les passes, dans la transaction qui enregistre la version
+    """
+
+    __slots__ = ("version", "nom", "preparation", "passes", "finalisation")
+
+    def __init__(self, version: int, nom: str, preparation: Callable[[sqlite3.Connection], None],
+                 passes: List[Tuple[str, str]], finalisation: Callable[[sqlite3.Connection], None]):
+        """
+        Initialise une migration.
+
+        Args:
+            version (int): Version atteinte
+            nom (str): Description courte
+            preparation (Callable[[sqlite3.Connection], None]): Instructions préalables
+            passes (List[Tuple[str, str]]): Table et requête de chaque passe
+            finalisation (Callable[[sqlite3.Connection], None]): Instructions finales
+        """
+        self.version = version
+        self.nom = nom
+        self.preparation = preparation
+        self.passes = passes
+        self.finalisation = finalisation
+
+
+class RapportMigration:
+    """
+    Résultat d'une mise à jour du schéma.
+
+    Attributes:
+        version_initiale (int): Version de la base avant la mise à jour
+        version_finale (int): Version de la base après la mise à jour
+        migrations (List[str]): Noms des migrations appliquées
+        lignes (int): Nombre de lignes modifiées ou insérées par les passes
+        lots (int): Nombre de lots validés
+        duree (float): Durée de la mise à jour en secondes
+    """
+
+    def __init__(self, version_initiale: int):
+        """
+        Initialise un rapport vide.
+
+        Args:
+            version_initiale (int): Version de la base avant la mise à jour
+        """
+        self.version_initiale = version_initiale
+        self.version_finale = version_initiale
+        self.migrations: List[str] = []
+        self.lignes = 0
+        self.lots = 0
+        self.duree = 0.0
+
+    @property
+    def debit(self) -> float:
+        """
+        Nombre de lignes traitées par seconde.
+
+        Returns:
+            float: Débit de la migration
+        """
+        return self.lignes / self.duree if self.duree > 0 else 0.0
+
+    def __str__(self) -> str:
+        """
+        Retourne un résumé du rapport.
+
+        Returns:
+            str: Résumé de la mise à jour
+        """
+        if not self.migrations:
+            return f"Schéma à jour (version {self.version_finale})"
+        return (f"Schéma mis à jour de la version {self.version_initiale} à la version "
+                f"{self.version_finale} ({', '.join(self.migrations)}) : {self.lignes} ligne(s) "
+                f"en {self.lots} lot(s), {self.duree:.2f} s ({self.debit:.0f} lignes/s)")
+
+
+def _colonnes(conn: sqlite3.Connection, table: str) -> set:
+    """Retourne les noms des colonnes d'une table."""
+    return {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+
+
+# Version 1 : dates ISO
+
+def _preparer_dates_iso(conn: sqlite3.Connection):
+    """Renomme l'ancienne colonne annee et supprime les index de dates pendant la conversion."""
+    colonnes = _colonnes(conn, "livres")
+    if "annee" in colonnes and "date_publication" not in colonnes:
+        conn.execute("ALTER TABLE livres RENAME COLUMN annee TO date_publication")
+    for nom in INDEX_DATES:
+        conn.execute(f"DROP INDEX IF EXISTS {nom}")
+
+
+def _finaliser_dates_iso(conn: sqlite3.Connection):
+    """Reconstruit les index de dates en une passe."""
+    for sql in INDEX_DATES.values():
+        conn.execute(sql)
+
+
+def _passes_dates_iso() -> List[Tuple[str, str]]:
+    """Retourne les passes de conversion des dates JJ/MM/AAAA (et des années seules)."""
+    passes = [(
+        "livres",
+        """
+        UPDATE livres SET date_publication = printf('%04d-01-01', date_publication)
+        WHERE id > ? AND id <= ? AND typeof(date_publication) = 'integer'
+        """,
+    )]
+    for table, colonnes in COLONNES_DATES.items():
+        affectations = ", ".join(
+            f"{col} = CASE WHEN {sql_est_format_affichage(col)} "
+            f"THEN {sql_vers_iso(col)} ELSE {col} END"
+            for col in colonnes
+        )
+        condition = " OR ".join(sql_est_format_affichage(col) for col in colonnes)
+        passes.append((
+            table,
+            f"UPDATE {table} SET {affectations} WHERE id > ? AND id <= ? AND ({condition})",
+        ))
+    return passes
+
+
+# Version 2 : lecteurs
+
+def _preparer_lecteurs(conn: sqlite3.Connection):
+    """Crée la table des lecteurs et enregistre les fonctions de normalisation des noms."""
+    conn.create_function("nettoyer_nom", 1, nettoyer_nom, deterministic=True)
+    conn.create_function("normaliser_nom", 1, normaliser_nom, deterministic=True)
+    conn.execute(TABLE_LECTEURS)
+    if "lecteur_id" not in _colonnes(conn, "emprunts"):
+        conn.execute("ALTER TABLE emprunts ADD COLUMN lecteur_id INTEGER REFERENCES lecteurs (id)")
+
+
+def _finaliser_lecteurs(conn: sqlite3.Connection):
+    """Recalcule le résumé par emprunteur, dont les noms ont changé."""
+    if resumes_statistiques_presents(conn):
+        conn.execute("DELETE FROM stats_emprunteurs")
+        conn.execute(f"INSERT INTO stats_emprunteurs {AGREGATS_RESUME['stats_emprunteurs']}")
+
+
+PASSES_LECTEURS = [
+    # Un lecteur par clé normalisée ; les lots sont parcourus dans l'ordre des
+    # id, le nom retenu est donc la dernière orthographe saisie (MAX(id) choisit
+    # la ligne dont le nom est lu dans le lot)
+    (
+        "emprunts",
+        """
+        INSERT INTO lecteurs (nom, cle)
+        SELECT nettoyer_nom(emprunteur), cle FROM (
+            SELECT emprunteur, normaliser_nom(emprunteur) AS cle, MAX(id)
+            FROM emprunts WHERE id > ? AND id <= ? AND lecteur_id IS NULL
+            GROUP BY cle
+        )
+        WHERE cle <> ''
+        ON CONFLICT (cle) DO UPDATE SET nom = excluded.nom
+        """,
+    ),
+    # Rattachement des emprunts, une fois tous les noms définitifs
+    (
+        "emprunts",
+        """
+        UPDATE emprunts SET lecteur_id = l.id, emprunteur = l.nom
+        FROM lecteurs AS l
+        WHERE emprunts.id > ? AND emprunts.id <= ? AND emprunts.lecteur_id IS NULL
+        AND l.cle = normaliser_nom(emprunts.emprunteur)
+        """,
+    ),
+]
+
+
+# Version 3 : exemplaires
+
+def _preparer_exemplaires(conn: sqlite3.Connection):
+    """Crée la table des exemplaires, les colonnes qui s'y rapportent et les index des passes."""
+    conn.execute(TABLE_EXEMPLAIRES)
+    # Index utilisés par les passes et le calcul des compteurs (un livre
+    # parcourt ses exemplaires et ses emprunts)
+    conn.execute(INDEX_EXEMPLAIRES["idx_exemplaires_livre"])
+    conn.execute(INDEX_EMPRUNTS["idx_emprunts_livre_id"])
+    colonnes_livres = _colonnes(conn, "livres")
+    for colonne in ("nombre_exemplaires", "exemplaires_disponibles"):
+        if colonne not in colonnes_livres:
+            conn.execute(f"ALTER TABLE livres ADD COLUMN {colonne} INTEGER NOT NULL DEFAULT 0")
+    if "exemplaire_id" not in _colonnes(conn, "emprunts"):
+        conn.execute("ALTER TABLE emprunts ADD COLUMN exemplaire_id INTEGER REFERENCES exemplaires (id)")
+
+
+def _finaliser_exemplaires(conn: sqlite3.Connection):
+    """Calcule les compteurs de disponibilité puis crée les déclencheurs qui les tiennent à jour."""
+    recalculer_disponibilites(conn)
+    for sql in DECLENCHEURS_EXEMPLAIRES.values():
+        conn.execute(sql)
+
+
+PASSES_EXEMPLAIRES = [
+    # Chaque livre reçoit un exemplaire de même identifiant...
+    (
+        "livres",
+        """
+        INSERT INTO exemplaires (id, livre_id)
+        SELECT id, id FROM livres
+        WHERE id > ? AND id <= ?
+        AND NOT EXISTS (SELECT 1 FROM exemplaires x WHERE x.livre_id = livres.id)
+        """,
+    ),
+    # ... ce qui permet de rattacher les emprunts sans jointure
+    (
+        "emprunts",
+        """
+        UPDATE emprunts SET exemplaire_id = livre_id
+        WHERE id > ? AND id <= ? AND exemplaire_id IS NULL
+        AND livre_id IN (SELECT id FROM exemplaires)
+        """,
+    ),
+]
+
+
+# Version 4 : archive des emprunts
+
+def _preparer_archive(conn: sqlite3.Connection):
+    """Crée la table d'archive des emprunts."""
+    conn.execute(TABLE_EMPRUNTS_ARCHIVE)
+
+
+def _finaliser_archive(conn: sqlite3.Connection):
+    """Crée les index de la table d'archive."""
+    for sql in INDEX_ARCHIVE.values():
+        conn.execute(sql)
+
+
+# Version 5 : unicité des livres
+#
+# Les bases créées avant la contrainte UNIQUE(titre, auteur) peuvent contenir
+# des livres en double : chacun est fusionné dans le livre de même titre et
+# même auteur de plus petit id (ses exemplaires et ses emprunts, archivés
+# compris, lui sont rattachés), puis un index unique est créé.
+
+# Plus petit id des livres de même titre et même auteur que le livre d'id {}
+_LIVRE_GARDE = """(
+    SELECT MIN(g.id) FROM livres l JOIN livres g ON g.titre = l.titre AND g.auteur = l.auteur
+    WHERE l.id = {}
+)"""
+
+# Livres du lot qui doublent un livre de plus petit id
+_DOUBLONS_DU_LOT = """
+    SELECT l.id FROM livres l
+    WHERE l.id > ? AND l.id <= ?
+    AND EXISTS (SELECT 1 FROM livres g WHERE g.titre = l.titre AND g.auteur = l.auteur AND g.id < l.id)
+"""
+
+
+def _preparer_unicite_livres(conn: sqlite3.Connection):
+    """Indexe (titre, auteur) le temps de la fusion si aucun index unique ne le fait."""
+    if not unicite_livres_presente(conn):
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_livres_doublons ON livres (titre, auteur)")
+
+
+def _finaliser_unicite_livres(conn: sqlite3.Connection):
+    """Crée l'index unique et recalcule ce qui dépend des livres fusionnés."""
+    conn.execute("DROP INDEX IF EXISTS idx_livres_doublons")
+    if unicite_livres_presente(conn):
+        return
+    conn.execute(INDEX_UNICITE_LIVRES)
+    recalculer_disponibilites(conn)
+    if resumes_statistiques_presents(conn):
+        conn.execute("DELETE FROM stats_livres")
+        conn.execute(f"INSERT INTO stats_livres {AGREGATS_RESUME['stats_livres']}")
+
+
+# Toutes les passes parcourent les livres : seuls les enfants des doublons
+# sont lus (par les index sur livre_id), puis les doublons sont supprimés
+PASSES_UNICITE_LIVRES = [
+    (
+        "livres",
+        f"""
+        UPDATE {table} SET livre_id = {_LIVRE_GARDE.format(f'{table}.livre_id')}
+        WHERE livre_id IN ({_DOUBLONS_DU_LOT})
+        """,
+    )
+    for table in ("exemplaires", "emprunts", "emprunts_archive")
+] + [
+    ("livres", f"DELETE FROM livres WHERE id IN ({_DOUBLONS_DU_LOT})"),
+]
+
+
+# Version 6 : suppression des emprunts dans les résumés statistiques
+
+def _preparer_resumes(conn: sqlite3.Connection):
+    """Rien à préparer : la migration n'a pas de passe."""
+
+
+def _finaliser_resumes(conn: sqlite3.Connection):
+    """
+    Crée le déclencheur de suppression des résumés, s'ils existent, puis les
+    recalcule : les suppressions passées y ont laissé des emprunts en cours.
+    """
+    tables = {nom for (nom,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    if not all(table in tables for table in TABLES_RESUME):
+        return
+    for sql in DECLENCHEURS_RESUME.values():
+        conn.execute(sql)
+    for table, requete in AGREGATS_RESUME.items():
+        conn.execute(f"DELETE FROM {table}")
+        conn.execute(f"INSERT INTO {table} {requete}")
+
+
+# Version 7 : clôture des emprunts archivés en cours
+
+def _finaliser_cloture_archive(conn: sqlite3.Connection):
+    """
+    Clôt à leur date d'archivage les emprunts archivés encore en cours, puis
+    remplace le déclencheur de suppression des résumés (qui compte désormais
+    ces emprunts comme retournés) et recalcule les résumés, s'ils existent.
+    """
+    conn.execute("UPDATE emprunts_archive SET date_retour_reelle = date_archivage "
+                 "WHERE date_retour_reelle IS NULL")
+    tables = {nom for (nom,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    if not all(table in tables for table in TABLES_RESUME):
+        return
+    conn.execute("DROP TRIGGER IF EXISTS stats_emprunt_suppression")
+    conn.execute(DECLENCHEURS_RESUME["stats_emprunt_suppression"])
+    for table, requete in AGREGATS_RESUME.items():
+        conn.execute(f"DELETE FROM {table}")
+        conn.execute(f"INSERT INTO {table} {requete}")
+
+
+# Migrations dans l'ordre des versions
+MIGRATIONS = [
+    Migration(1, "dates ISO", _preparer_dates_iso, _passes_dates_iso(), _finaliser_dates_iso),
+    Migration(2, "lecteurs", _preparer_lecteurs, PASSES_LECTEURS, _finaliser_lecteurs),
+    Migration(3, "exemplaires", _preparer_exemplaires, PASSES_EXEMPLAIRES, _finaliser_exemplaires),
+    Migration(4, "archive des emprunts", _preparer_archive, [], _finaliser_archive),
+    Migration(5, "unicité des livres", _preparer_unicite_livres, PASSES_UNICITE_LIVRES,
+              _finaliser_unicite_livres),
+    Migration(6, "résumés statistiques", _preparer_resumes, [], _finaliser_resumes),
+    Migration(7, "clôture des emprunts archivés", _preparer_resumes, [], _finaliser_cloture_archive),
+]
+
+
+def _fin_du_lot(conn: sqlite3.Connection, table: str, dernier_id: int,
+                taille_lot: int) -> Optional[int]:
+    """Retourne l'id de la dernière ligne du lot suivant, ou None si la table est parcourue."""
+    row = conn.execute(
+        f"SELECT id FROM {table} WHERE id > ? ORDER BY id LIMIT 1 OFFSET ?",
+        (dernier_id, taille_lot - 1)
+    ).fetchone()
+    if row:
+        return row[0]
+    row = conn.execute(f"SELECT MAX(id) FROM {table} WHERE id > ?", (dernier_id,)).fetchone()
+    return row[0]
+
+
+def _appliquer(conn: sqlite3.Connection, migration: Migration, taille_lot: int,
+               rapport: RapportMigration, noter: Callable[[], None]):
+    """Applique une migration, en reprenant ses passes au dernier lot validé."""
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        conn.execute(TABLE_PROGRESSION)
+        migration.preparation(conn)
+        conn.commit()
+
+        for numero, (table, requete) in enumerate(migration.passes):
+            row = conn.execute(
+                "SELECT dernier_id FROM migrations_progression WHERE version = ? AND passe = ?",
+                (migration.version, numero)
+            ).fetchone()
+            dernier_id = row[0] if row else 0
+            while True:
+                fin = _fin_du_lot(conn, table, dernier_id, taille_lot)
+                if fin is None:
+                    break
+                conn.execute("BEGIN IMMEDIATE")
+                curseur = conn.execute(requete, (dernier_id, fin))
+                conn.execute("""
+                    INSERT INTO migrations_progression (version, passe, dernier_id) VALUES (?, ?, ?)
+                    ON CONFLICT (version, passe) DO UPDATE SET dernier_id = excluded.dernier_id
+                """, (migration.version, numero, fin))
+                conn.commit()
+                dernier_id = fin
+                rapport.lignes += max(curseur.rowcount, 0)
+                rapport.lots += 1
+                noter()
+
+        conn.execute("BEGIN IMMEDIATE")
+        migration.finalisation(conn)
+        conn.execute("DELETE FROM migrations_progression WHERE version = ?", (migration.version,))
+        ecrire_version(conn, migration.version)
+        conn.commit()
+    except sqlite3.Error:
+        conn.rollback()
+        raise
+
+
+def migrer(conn: sqlite3.Connection, taille_lot: int = 50000,
+           progression: Optional[Callable[[RapportMigration], None]] = None) -> RapportMigration:
+    """
+    Crée les tables manquantes et applique les migrations en attente.
+
+    Une base neuve est créée dans sa forme courante puis passe par toutes
+    les migrations, sans ligne à traiter. Les index manquants sont créés à
+    la fin (voir models.schema.creer_index).
+
+    Args:
+        conn (sqlite3.Connection): Connexion d'écriture à la base de données
+        taille_lot (int): Nombre de lignes traitées par transaction
+        progression (Optional[Callable[[RapportMigration], None]]): Appelée après chaque lot
+
+    Returns:
+        RapportMigration: Versions, migrations appliquées et débit
+
+    Raises:
+        ValueError: Si la taille des lots n'est pas positive ou si la base a
+            été créée par une version plus récente de l'application
+        sqlite3.Error: Si une migration échoue (elle reprendra au dernier lot validé)
+    """
+    if taille_lot < 1:
+        raise ValueError("La taille des lots doit être positive")
+    rapport = RapportMigration(lire_version(conn))
+    if rapport.version_initiale > SCHEMA_VERSION:
+        raise ValueError(f"La base de données est en version {rapport.version_initiale}, "
+                         f"cette application ne connaît que la version {SCHEMA_VERSION}")
+    debut = time.perf_counter()
+
+    def noter():
+        """Met la durée du rapport à jour et le transmet à l'appelant."""
+        rapport.duree = time.perf_counter() - debut
+        if progression:
+            progression(rapport)
+
+    for sql in TABLES:
+        conn.execute(sql)
+    conn.commit()
+
+    for migration in MIGRATIONS:
+        if migration.version > lire_version(conn):
+            _appliquer(conn, migration, taille_lot, rapport, noter)
+            rapport.migrations.append(migration.nom)
+    creer_index(conn)
+
+    rapport.version_finale = lire_version(conn)
+    rapport.duree = time.perf_counter() - debut
+    return rapport
@@ -0,0 +1,338 @@
+"""
+Contrôle et nettoyage des données de la bibliothèque.
+
+L'analyse ne modifie rien :
+    - les livres sont lus par lots ; chaque lot est contrôlé par verifier_lot
+      (dates, espaces et forme Unicode des titres et auteurs), dans le
+      processus courant ou dans un groupe de processus ;
+    - les doublons (même titre et même auteur à la casse, aux accents et aux
+      espaces près) et les lignes orphelines (emprunts ou exemplaires d'un
+      livre supprimé) sont trouvés par des requêtes GROUP BY ;
+    - les dates invalides des emprunts sont comptées en SQL.
+
+Les corrections sont appliquées ensuite sur place, dans une seule
+transaction : les tables ne sont pas reconstruites, leurs contraintes et
+leurs index restent en place.
+"""
+
+import time
+import unicodedata
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Tuple
+from models.dates import corriger_dates_iso
+from models.evenements import MODIFIE, SUPPRIME
+from models.lecteur import nettoyer_nom, normaliser_nom
+from models.schema import (COLONNES_DATES, AGREGATS_RESUME, recalculer_disponibilites,
+                           resumes_statistiques_presents)
+
+# Correction proposée : id du livre, colonne, valeur actuelle, valeur corrigée
+Correction = Tuple[int, str, object, str]
+
+# Valeur sans correction possible : id du livre, colonne, valeur actuelle
+Anomalie = Tuple[int, str, object]
+
+
+class RapportNettoyage:
+    """
+    Résultat d'une analyse, et des corrections si elles ont été appliquées.
+
+    Attributes:
+        livres_verifies (int): Nombre de livres contrôlés
+        corrections (List[Correction]): Valeurs de livres à corriger
+        anomalies (List[Anomalie]): Valeurs de livres invalides sans correction possible
+        doublons (List[List[int]]): IDs des livres de chaque groupe de doublons,
+            le premier étant conservé
+        emprunts_orphelins (Dict[int, int]): Nombre d'emprunts par livre supprimé
+        exemplaires_orphelins (Dict[int, int]): Nombre d'exemplaires par livre supprimé
+        dates_emprunts_invalides (Dict[str, int]): Nombre de dates invalides par colonne d'emprunts
+        applique (bool): True si les corrections ont été appliquées
+        compteurs_corriges (int): Livres dont les compteurs d'exemplaires ont été recalculés
+        duree (float): Durée de l'analyse (et des corrections) en secondes
+    """
+
+    def __init__(self):
+        """Initialise un rapport vide."""
+        self.livres_verifies = 0
+        self.corrections: List[Correction] = []
+        self.anomalies: List[Anomalie] = []
+        self.doublons: List[List[int]] = []
+        self.emprunts_orphelins: Dict[int, int] = {}
+        self.exemplaires_orphelins: Dict[int, int] = {}
+        self.dates_emprunts_invalides: Dict[str, int] = {}
+        self.applique = False
+        self.compteurs_corriges = 0
+        self.duree = 0.0
+
+    @property
+    def debit(self) -> float:
+        """
+        Nombre de livres contrôlés par seconde.
+
+        Returns:
+            float: Débit de l'analyse
+        """
+        return self.livres_verifies / self.duree if self.duree > 0 else 0.0
+
+    def vers_dict(self) -> dict:
+        """
+        Retourne le rapport sous une forme sérialisable en JSON.
+
+        Returns:
+            dict: Compteurs et détail de chaque problème trouvé
+        """
+        return {
+            "applique": self.applique,
+            "livres_verifies": self.livres_verifies,
+            "duree": round(self.duree, 3),
+            "corrections": [
+                {"id": id, "colonne": colonne, "avant": avant, "apres": apres}
+                for id, colonne, avant, apres in self.corrections
+            ],
+            "anomalies": [
+                {"id": id, "colonne": colonne, "valeur": valeur}
+                for id, colonne, valeur in self.anomalies
+            ],
+            "doublons": self.doublons,
+            "emprunts_orphelins": [
+                {"livre_id": livre_id, "emprunts": nombre}
+                for livre_id, nombre in self.emprunts_orphelins.items()
+            ],
+            "exemplaires_orphelins": [
+                {"livre_id": livre_id, "exemplaires": nombre}
+                for livre_id, nombre in self.exemplaires_orphelins.items()
+            ],
+            "dates_emprunts_invalides": self.dates_emprunts_invalides,
+            "compteurs_corriges": self.compteurs_corriges,
+        }
+
+    def __str__(self) -> str:
+        """
+        Retourne un résumé du rapport.
+
+        Returns:
+            str: Résumé de l'analyse
+        """
+        resume = (
+            f"{self.livres_verifies} livre(s) contrôlé(s) en {self.duree:.2f} s "
+            f"({self.debit:.0f} livres/s) : {len(self.corrections)} correction(s), "
+            f"{len(self.anomalies)} valeur(s) invalide(s), {len(self.doublons)} groupe(s) "
+            f"de doublons, {sum(self.emprunts_orphelins.values())} emprunt(s) et "
+            f"{sum(self.exemplaires_orphelins.values())} exemplaire(s) orphelin(s), "
+            f"{sum(self.dates_emprunts_invalides.values())} date(s) d'emprunt invalide(s)"
+        )
+        if self.applique:
+            resume += f" ; corrections appliquées, {self.compteurs_corriges} compteur(s) recalculé(s)"
+        return resume
+
+
+def nettoyer_texte(texte: str) -> str:
+    """
+    Met un titre ou un nom d'auteur sous sa forme canonique.
+
+    Args:
+        texte (str): Valeur stockée
+
+    Returns:
+        str: Valeur en forme Unicode composée (NFC), sans espaces superflus
+    """
+    return nettoyer_nom(unicodedata.normalize("NFC", texte))
+
+
+def verifier_lot(lignes: List[tuple]) -> Tuple[List[Correction], List[Anomalie]]:
+    """
+    Contrôle un lot de livres.
+
+    La fonction ne dépend que de ses arguments : elle peut être exécutée
+    dans un autre processus.
+
+    Args:
+        lignes (List[tuple]): Lignes (id, titre, auteur, date_publication)
+
+    Returns:
+        Tuple[List[Correction], List[Anomalie]]: Corrections proposées et
+            valeurs invalides sans correction possible
+    """
+    corrections = []
+    anomalies = []
+    dates = corriger_dates_iso(ligne[3] for ligne in lignes)
+    for (id, titre, auteur, date), date_iso in zip(lignes, dates):
+        for colonne, valeur in (("titre", titre), ("auteur", auteur)):
+            propre = nettoyer_texte(valeur) if isinstance(valeur, str) else ""
+            if not propre:
+                anomalies.append((id, colonne, valeur))
+            elif propre != valeur:
+                corrections.append((id, colonne, valeur, propre))
+        if date_iso is None:
+            anomalies.append((id, "date_publication", date))
+        elif date_iso != date:
+            corrections.append((id, "date_publication", date, date_iso))
+    return corrections, anomalies
+
+
+def _lots_de_livres(bibliotheque, taille_lot: int) -> Iterator[List[tuple]]:
+    """Lit les livres par lots de taille_lot lignes."""
+    lot = []
+    requete = "SELECT id, titre, auteur, date_publication FROM livres ORDER BY id"
+    for ligne in bibliotheque._iterer(requete, (), taille_lot):
+        lot.append(ligne)
+        if len(lot) == taille_lot:
+            yield lot
+            lot = []
+    if lot:
+        yield lot
+
+
+def _verifier_livres(bibliotheque, rapport: RapportNettoyage, processus: int, taille_lot: int):
+    """Contrôle tous les livres, en parallèle si processus > 0."""
+    def noter(lot: List[tuple], resultat: Tuple[List[Correction], List[Anomalie]]):
+        """Ajoute le résultat d'un lot au rapport."""
+        rapport.livres_verifies += len(lot)
+        rapport.corrections.extend(resultat[0])
+        rapport.anomalies.extend(resultat[1])
+
+    if processus <= 0:
+        for lot in _lots_de_livres(bibliotheque, taille_lot):
+            noter(lot, verifier_lot(lot))
+        return
+
+    # Au plus deux lots en attente par processus : la mémoire reste bornée
+    # quelle que soit la taille du catalogue, et les lots sont notés dans l'ordre
+    with ProcessPoolExecutor(processus) as executeur:
+        en_cours = deque()
+        for lot in _lots_de_livres(bibliotheque, taille_lot):
+            en_cours.append((lot, executeur.submit(verifier_lot, lot)))
+            if len(en_cours) >= 2 * processus:
+                lot_termine, tache = en_cours.popleft()
+                noter(lot_termine, tache.result())
+        while en_cours:
+            lot_termine, tache = en_cours.popleft()
+            noter(lot_termine, tache.result())
+
+
+def _chercher_incoherences(conn, rapport: RapportNettoyage):
+    """Cherche doublons, lignes orphelines et dates d'emprunts invalides."""
+    conn.create_function("normaliser_nom", 1, normaliser_nom, deterministic=True)
+    rapport.doublons = sorted(
+        sorted(int(id) for id in ids.split(","))
+        for (ids,) in conn.execute("""
+            SELECT group_concat(id) FROM livres
+            GROUP BY normaliser_nom(titre), normaliser_nom(auteur)
+            HAVING COUNT(*) > 1
+        """)
+    )
+    for table, attribut in (("emprunts", "emprunts_orphelins"),
+                            ("exemplaires", "exemplaires_orphelins")):
+        setattr(rapport, attribut, dict(conn.execute(f"""
+            SELECT t.livre_id, COUNT(*) FROM {table} t
+            WHERE NOT EXISTS (SELECT 1 FROM livres l WHERE l.id = t.livre_id)
+            GROUP BY t.livre_id ORDER BY t.livre_id
+        """)))
+    colonnes = COLONNES_DATES["emprunts"]
+    comptes = conn.execute(
+        "SELECT " + ", ".join(f"COUNT(*) FILTER (WHERE date({col}) IS NOT {col})" for col in colonnes)
+        + " FROM emprunts"
+    ).fetchone()
+    rapport.dates_emprunts_invalides = {
+        col: nombre for col, nombre in zip(colonnes, comptes) if nombre
+    }
+
+
+def analyser(bibliotheque, processus: int = 0, taille_lot: int = 10000) -> RapportNettoyage:
+    """
+    Contrôle les données sans les modifier.
+
+    Args:
+        bibliotheque (Bibliotheque): La bibliothèque contrôlée
+        processus (int): Nombre de processus de contrôle des livres (0 : processus courant)
+        taille_lot (int): Nombre de livres par lot
+
+    Returns:
+        RapportNettoyage: Problèmes trouvés et corrections proposées
+
+    Raises:
+        ValueError: Si la taille des lots n'est pas positive
+    """
+    if taille_lot < 1:
+        raise ValueError("La taille des lots doit être positive")
+    rapport = RapportNettoyage()
+    debut = time.perf_counter()
+    _verifier_livres(bibliotheque, rapport, processus, taille_lot)
+    with bibliotheque._lecture() as conn:
+        _chercher_incoherences(conn, rapport)
+    rapport.duree = time.perf_counter() - debut
+    return rapport
+
+
+def appliquer(bibliotheque, rapport: RapportNettoyage):
+    """
+    Applique les corrections d'un rapport en une seule transaction.
+
+    Les doublons sont fusionnés dans le livre de plus petit id (ses
+    exemplaires et ses emprunts lui sont rattachés), les lignes orphelines
+    supprimées, les valeurs corrigées sur place, puis les compteurs
+    d'exemplaires et les résumés statistiques recalculés. Les valeurs
+    invalides sans correction possible sont laissées telles quelles.
+
+    Args:
+        bibliotheque (Bibliotheque): La bibliothèque analysée par analyser()
+        rapport (RapportNettoyage): Le rapport d'analyse, complété par l'application
+    """
+    debut = time.perf_counter()
+    supprimes = set()
+    with bibliotheque.transaction() as b:
+        conn = b.conn
+        for groupe in rapport.doublons:
+            garde, autres = groupe[0], groupe[1:]
+            marques = ", ".join("?" * len(autres))
+            for table in ("exemplaires", "emprunts"):
+                conn.execute(f"UPDATE {table} SET livre_id = ? WHERE livre_id IN ({marques})",
+                             (garde, *autres))
+            conn.execute(f"DELETE FROM livres WHERE id IN ({marques})", autres)
+            supprimes.update(autres)
+
+        for table, orphelins in (("emprunts", rapport.emprunts_orphelins),
+                                 ("exemplaires", rapport.exemplaires_orphelins)):
+            conn.executemany(f"DELETE FROM {table} WHERE livre_id = ?",
+                             ((livre_id,) for livre_id in orphelins))
+
+        for colonne in ("titre", "auteur", "date_publication"):
+            conn.executemany(
+                f"UPDATE livres SET {colonne} = ? WHERE id = ?",
+                ((apres, id) for id, col, _, apres in rapport.corrections
+                 if col == colonne and id not in supprimes)
+            )
+
+        rapport.compteurs_corriges = recalculer_disponibilites(conn)
+        if resumes_statistiques_presents(conn):
+            for table, requete in AGREGATS_RESUME.items():
+                conn.execute(f"DELETE FROM {table}")
+                conn.execute(f"INSERT INTO {table} {requete}")
+
+        if supprimes:
+            b._notifier("livres", SUPPRIME, sorted(supprimes))
+        b._notifier("livres", MODIFIE, None)
+    if bibliotheque.cache is not None:
+        bibliotheque.cache.vider()
+    rapport.applique = True
+    rapport.duree += time.perf_counter() - debut
+
+
+def nettoyer(bibliotheque, corriger: bool = False, processus: int = 0,
+             taille_lot: int = 10000) -> RapportNettoyage:
+    """
+    Contrôle les données et, sur demande, les corrige.
+
+    Args:
+        bibliotheque (Bibliotheque): La bibliothèque contrôlée
+        corriger (bool): Appliquer les corrections (False : simple rapport)
+        processus (int): Nombre de processus de contrôle des livres (0 : processus courant)
+        taille_lot (int): Nombre de livres par lot
+
+    Returns:
+        RapportNettoyage: Problèmes trouvés (et corrigés si corriger=True)
+    """
+    rapport = analyser(bibliotheque, processus, taille_lot)
+    if corriger:
+        appliquer(bibliotheque, rapport)
+    return rapport
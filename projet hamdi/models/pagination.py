@@ -0,0 +1,48 @@
+"""
+Jetons de pagination par clé (keyset).
+
+Un jeton mémorise la clé de tri et l'identifiant de la dernière ligne
+d'une page ; la page suivante reprend strictement après ce couple, sans
+OFFSET, ce qui garde un coût constant quelle que soit la profondeur.
+"""
+
+import base64
+import json
+from typing import Optional, Tuple
+
+
+def encoder_jeton(cle, id: int) -> str:
+    """
+    Encode la position de la dernière ligne d'une page.
+
+    Args:
+        cle: Valeur de la colonne de tri pour cette ligne
+        id (int): Identifiant de la ligne
+
+    Returns:
+        str: Jeton opaque à transmettre pour obtenir la page suivante
+    """
+    brut = json.dumps([cle, id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(brut).decode("ascii")
+
+
+def decoder_jeton(jeton: Optional[str]) -> Optional[Tuple[object, int]]:
+    """
+    Décode un jeton de pagination.
+
+    Args:
+        jeton (Optional[str]): Jeton retourné par une page précédente
+
+    Returns:
+        Optional[Tuple[object, int]]: Clé de tri et identifiant, ou None pour la première page
+
+    Raises:
+        ValueError: Si le jeton est invalide
+    """
+    if jeton is None:
+        return None
+    try:
+        cle, id = json.loads(base64.urlsafe_b64decode(jeton.encode("ascii")))
+        return cle, int(id)
+    except (ValueError, TypeError):
+        raise ValueError("Jeton de pagination invalide")
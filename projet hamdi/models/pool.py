@@ -0,0 +1,187 @@
+"""
+Réserve de connexions SQLite partagée entre plusieurs threads.
+
+Une seule connexion écrit (SQLite n'accepte qu'un écrivain à la fois) ; son
+usage est protégé par un verrou réentrant. Les lectures passent par des
+connexions en lecture seule ouvertes à la demande, jusqu'à un maximum, et
+rendues à la réserve après chaque opération. En mode WAL les lecteurs
+travaillent en parallèle de l'écrivain sans le bloquer.
+"""
+
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Iterator, List
+from models.connexion import ouvrir_connexion, PROFIL_PAR_DEFAUT
+
+
+class PoolConnexions:
+    """
+    Une connexion d'écriture et jusqu'à `lecteurs` connexions de lecture.
+
+    Avec lecteurs=0 (ou une base ":memory:", invisible depuis une autre
+    connexion), les lectures utilisent la connexion d'écriture, sous son
+    verrou : elles attendent la fin d'une transaction d'un autre thread au
+    lieu d'en voir les modifications non validées. Les parcours par blocs
+    (voir parcours) ont alors leurs propres connexions de lecture, pour ne
+    pas réserver l'écrivain le temps de l'itération.
+    """
+
+    def __init__(self, db_path: str, profil: str = PROFIL_PAR_DEFAUT, lecteurs: int = 0,
+                 delai_attente: float = 30.0):
+        """
+        Ouvre la connexion d'écriture ; les connexions de lecture sont ouvertes à la demande.
+
+        Args:
+            db_path (str): Chemin vers le fichier de la base de données
+            profil (str): Profil de la connexion d'écriture (voir models.connexion)
+            lecteurs (int): Nombre maximal de connexions de lecture
+            delai_attente (float): Attente maximale d'un lecteur libre, en secondes
+
+        Raises:
+            ValueError: Si le nombre de lecteurs est négatif
+        """
+        if lecteurs < 0:
+            raise ValueError("Le nombre de lecteurs ne peut pas être négatif")
+        self.db_path = db_path
+        self.lecteurs_max = 0 if db_path == ":memory:" else lecteurs
+        self.delai_attente = delai_attente
+
+        self.ecrivain = ouvrir_connexion(db_path, profil, check_same_thread=False)
+        self.verrou_ecriture = threading.RLock()
+
+        self._libres = queue.LifoQueue()
+        self._parcours_libres = queue.LifoQueue()
+        self._ouverts: List[sqlite3.Connection] = []
+        self._verrou = threading.Lock()
+        self._local = threading.local()
+
+    @contextmanager
+    def ecriture(self) -> Iterator[sqlite3.Connection]:
+        """
+        Réserve la connexion d'écriture pour le thread courant.
+
+        Yields:
+            sqlite3.Connection: La connexion d'écriture
+        """
+        with self.verrou_ecriture:
+            yield self.ecrivain
+
+    @contextmanager
+    def lecteur(self) -> Iterator[sqlite3.Connection]:
+        """
+        Prête une connexion de lecture le temps d'une opération.
+
+        Un thread qui détient déjà un lecteur (parcours imbriqués) réutilise
+        le même : il ne peut pas se bloquer en attendant sa propre connexion.
+
+        Yields:
+            sqlite3.Connection: Une connexion en lecture seule
+
+        Raises:
+            TimeoutError: Si aucun lecteur ne s'est libéré dans le délai d'attente
+        """
+        if self.lecteurs_max == 0:
+            with self.verrou_ecriture:
+                yield self.ecrivain
+            return
+
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            self._local.profondeur += 1
+            try:
+                yield conn
+            finally:
+                self._local.profondeur -= 1
+            return
+
+        conn = self._prendre()
+        self._local.conn = conn
+        self._local.profondeur = 1
+        try:
+            yield conn
+        finally:
+            self._local.profondeur -= 1
+            if self._local.profondeur == 0:
+                self._local.conn = None
+                self._libres.put(conn)
+
+    @contextmanager
+    def parcours(self) -> Iterator[sqlite3.Connection]:
+        """
+        Prête une connexion de lecture le temps d'un parcours par blocs.
+
+        Avec des lecteurs, c'est un lecteur de la réserve (voir lecteur).
+        Sans lecteur, le parcours ne garde pas la connexion d'écriture, qui
+        resterait réservée jusqu'à la fin de l'itération : il lit sur une
+        connexion en lecture seule à part, ouverte au premier parcours et
+        rendue à la fin de chacun. Seule une base ":memory:", invisible
+        depuis une autre connexion, est parcourue sous le verrou de l'écrivain.
+
+        Yields:
+            sqlite3.Connection: Une connexion en lecture seule (ou l'écrivain d'une base ":memory:")
+        """
+        if self.lecteurs_max > 0 or self.db_path == ":memory:":
+            with self.lecteur() as conn:
+                yield conn
+            return
+
+        try:
+            conn = self._parcours_libres.get_nowait()
+        except queue.Empty:
+            conn = ouvrir_connexion(self.db_path, "lecture_seule", check_same_thread=False)
+            with self._verrou:
+                self._ouverts.append(conn)
+        try:
+            yield conn
+        finally:
+            self._parcours_libres.put(conn)
+
+    def _prendre(self) -> sqlite3.Connection:
+        """Retourne un lecteur libre, en ouvre un nouveau ou attend qu'un lecteur se libère."""
+        try:
+            return self._libres.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._verrou:
+            if len(self._ouverts) < self.lecteurs_max:
+                conn = ouvrir_connexion(self.db_path, "lecture_seule", check_same_thread=False)
+                self._ouverts.append(conn)
+                return conn
+
+        try:
+            return self._libres.get(timeout=self.delai_attente)
+        except queue.Empty:
+            raise TimeoutError(
+                f"Aucune connexion de lecture libre après {self.delai_attente} s"
+            ) from None
+
+    def statistiques(self) -> dict:
+        """
+        Décrit l'état de la réserve.
+
+        Returns:
+            dict: Nombre maximal de lecteurs, lecteurs ouverts et lecteurs libres
+        """
+        return {
+            "lecteurs_max": self.lecteurs_max,
+            "lecteurs_ouverts": len(self._ouverts),
+            "lecteurs_libres": self._libres.qsize(),
+        }
+
+    def interrompre(self):
+        """Interrompt les requêtes en cours sur toutes les connexions."""
+        self.ecrivain.interrupt()
+        with self._verrou:
+            for conn in self._ouverts:
+                conn.interrupt()
+
+    def fermer(self):
+        """Ferme toutes les connexions."""
+        with self._verrou:
+            for conn in self._ouverts:
+                conn.close()
+            self._ouverts.clear()
+        self.ecrivain.close()
@@ -0,0 +1,651 @@
+"""
+Définition et évolution du schéma de la base de données.
+
+La version du schéma est enregistrée dans PRAGMA user_version :
+    0 : dates stockées au format JJ/MM/AAAA
+    1 : dates stockées au format ISO AAAA-MM-JJ, colonnes de dates indexées
+    2 : table des lecteurs, emprunts reliés à leur lecteur par emprunts.lecteur_id
+    3 : exemplaires d'un livre, emprunts reliés à un exemplaire, compteurs de
+        disponibilité sur livres
+    4 : archive des emprunts (emprunts_archive), qui conserve l'historique des
+        livres supprimés et les emprunts retournés depuis longtemps
+    5 : unicité (titre, auteur) des livres garantie sur les bases anciennes,
+        dont la table livres a été créée sans contrainte UNIQUE
+    6 : résumés statistiques tenus à jour à la suppression d'un emprunt
+
+Les tables sont créées directement dans leur forme courante ; les bases plus
+anciennes sont mises à jour par models.migrations.
+"""
+
+import sqlite3
+from typing import List
+
+SCHEMA_VERSION = 7
+
+# Table des livres ; les compteurs d'exemplaires sont tenus à jour par
+# DECLENCHEURS_EXEMPLAIRES
+TABLE_LIVRES = """
+    CREATE TABLE IF NOT EXISTS livres (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        titre TEXT NOT NULL,
+        auteur TEXT NOT NULL,
+        date_publication TEXT NOT NULL,
+        nombre_exemplaires INTEGER NOT NULL DEFAULT 0,
+        exemplaires_disponibles INTEGER NOT NULL DEFAULT 0,
+        UNIQUE(titre, auteur)
+    )
+"""
+
+# Table des emprunts (emprunteur : nom du lecteur au moment de l'emprunt)
+TABLE_EMPRUNTS = """
+    CREATE TABLE IF NOT EXISTS emprunts (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        livre_id INTEGER NOT NULL,
+        emprunteur TEXT NOT NULL,
+        date_emprunt TEXT NOT NULL,
+        date_retour_prevue TEXT NOT NULL,
+        date_retour_reelle TEXT,
+        lecteur_id INTEGER REFERENCES lecteurs (id),
+        exemplaire_id INTEGER REFERENCES exemplaires (id),
+        FOREIGN KEY (livre_id) REFERENCES livres (id)
+    )
+"""
+
+# Colonnes de dates par table
+COLONNES_DATES = {
+    "livres": ["date_publication"],
+    "emprunts": ["date_emprunt", "date_retour_prevue", "date_retour_reelle"],
+}
+
+# Index sur les colonnes de dates
+INDEX_DATES = {
+    "idx_livres_date_publication":
+        "CREATE INDEX IF NOT EXISTS idx_livres_date_publication ON livres (date_publication)",
+    "idx_emprunts_date_emprunt":
+        "CREATE INDEX IF NOT EXISTS idx_emprunts_date_emprunt ON emprunts (date_emprunt)",
+    "idx_emprunts_date_retour_prevue":
+        "CREATE INDEX IF NOT EXISTS idx_emprunts_date_retour_prevue ON emprunts (date_retour_prevue)",
+}
+
+# Index secondaires de la table des emprunts
+INDEX_EMPRUNTS = {
+    "idx_emprunts_livre_id":
+        "CREATE INDEX IF NOT EXISTS idx_emprunts_livre_id ON emprunts (livre_id)",
+    # Index partiel unique : ne contient que les emprunts en cours (petit et très
+    # sélectif) et garantit qu'un exemplaire n'a jamais deux emprunts en cours
+    "idx_emprunts_exemplaire_en_cours":
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_emprunts_exemplaire_en_cours ON emprunts (exemplaire_id) "
+        "WHERE date_retour_reelle IS NULL",
+    "idx_emprunts_emprunteur":
+        "CREATE INDEX IF NOT EXISTS idx_emprunts_emprunteur ON emprunts (emprunteur)",
+    # Échéances des seuls emprunts en cours : recherche des retards par plage triée
+    "idx_emprunts_echeances":
+        "CREATE INDEX IF NOT EXISTS idx_emprunts_echeances ON emprunts (date_retour_prevue) "
+        "WHERE date_retour_reelle IS NULL",
+    # Historique d'un lecteur, trié par date sans tri en mémoire
+    "idx_emprunts_lecteur":
+        "CREATE INDEX IF NOT EXISTS idx_emprunts_lecteur ON emprunts (lecteur_id, date_emprunt)",
+    # Emprunts en cours d'un lecteur : contrôle de sa limite d'emprunts
+    "idx_emprunts_lecteur_en_cours":
+        "CREATE INDEX IF NOT EXISTS idx_emprunts_lecteur_en_cours ON emprunts (lecteur_id) "
+        "WHERE date_retour_reelle IS NULL",
+}
+
+
+# Index remplacés par une version plus récente, supprimés une fois celle-ci créée
+INDEX_OBSOLETES = {
+    "idx_emprunts_en_cours": "idx_emprunts_exemplaire_en_cours",
+    "idx_emprunts_en_cours_unique": "idx_emprunts_exemplaire_en_cours",
+}
+
+
+# Index de tri du catalogue : (colonne, id) est couvert par l'index, ce qui
+# permet la pagination par clé sans tri en mémoire
+INDEX_LIVRES = {
+    "idx_livres_titre": "CREATE INDEX IF NOT EXISTS idx_livres_titre ON livres (titre)",
+    "idx_livres_auteur": "CREATE INDEX IF NOT EXISTS idx_livres_auteur ON livres (auteur)",
+    # Livres sans exemplaire disponible (chargement du cache de disponibilité)
+    "idx_livres_indisponibles":
+        "CREATE INDEX IF NOT EXISTS idx_livres_indisponibles ON livres (id) "
+        "WHERE exemplaires_disponibles = 0",
+}
+
+# Exemplaires d'un livre : choix d'un exemplaire libre à l'emprunt
+INDEX_EXEMPLAIRES = {
+    "idx_exemplaires_livre":
+        "CREATE INDEX IF NOT EXISTS idx_exemplaires_livre ON exemplaires (livre_id)",
+}
+
+
+# Historique archivé d'un livre ou d'un lecteur, trié par date
+INDEX_ARCHIVE = {
+    "idx_emprunts_archive_livre":
+        "CREATE INDEX IF NOT EXISTS idx_emprunts_archive_livre ON emprunts_archive (livre_id, date_emprunt)",
+    "idx_emprunts_archive_lecteur":
+        "CREATE INDEX IF NOT EXISTS idx_emprunts_archive_lecteur "
+        "ON emprunts_archive (lecteur_id, date_emprunt)",
+}
+
+
+# Unicité des livres des bases dont la table a été créée sans UNIQUE(titre, auteur)
+INDEX_UNICITE_LIVRES = (
+    "CREATE UNIQUE INDEX IF NOT EXISTS idx_livres_titre_auteur ON livres (titre, auteur)"
+)
+
+
+def unicite_livres_presente(conn: sqlite3.Connection) -> bool:
+    """
+    Indique si un index unique (contrainte UNIQUE ou index créé) porte sur
+    le titre et l'auteur des livres.
+
+    Args:
+        conn (sqlite3.Connection): Connexion à la base de données
+
+    Returns:
+        bool: True si deux livres ne peuvent pas avoir le même titre et le même auteur
+    """
+    for _, nom, unique, _, partiel in conn.execute("PRAGMA index_list(livres)"):
+        colonnes = [row[2] for row in conn.execute(f"PRAGMA index_info('{nom}')")]
+        if unique and not partiel and colonnes == ["titre", "auteur"]:
+            return True
+    return False
+
+
+def index_attendus() -> dict:
+    """
+    Retourne l'ensemble des index que le schéma courant doit contenir.
+
+    Returns:
+        dict: Nom de l'index -> requête de création
+    """
+    return {**INDEX_DATES, **INDEX_EMPRUNTS, **INDEX_LIVRES, **INDEX_EXEMPLAIRES, **INDEX_ARCHIVE}
+
+
+def index_manquants(conn: sqlite3.Connection) -> List[str]:
+    """
+    Liste les index attendus absents de la base de données.
+
+    Args:
+        conn (sqlite3.Connection): Connexion à la base de données
+
+    Returns:
+        List[str]: Noms des index manquants
+    """
+    existants = {
+        nom for (nom,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+    }
+    return [nom for nom in index_attendus() if nom not in existants]
+
+
+def creer_index(conn: sqlite3.Connection):
+    """
+    Crée les index manquants et supprime ceux qu'ils remplacent.
+
+    Un index unique que les données existantes empêchent de créer (par exemple
+    un livre avec deux emprunts en cours) est laissé manquant : il reste
+    signalé par index_manquants et l'index qu'il remplace est conservé.
+
+    Args:
+        conn (sqlite3.Connection): Connexion à la base de données
+    """
+    manquants = index_manquants(conn)
+    if not manquants:
+        return
+    requetes = index_attendus()
+    for nom in manquants:
+        try:
+            conn.execute(requetes[nom])
+        except sqlite3.IntegrityError:
+            continue
+        for obsolete, remplacant in INDEX_OBSOLETES.items():
+            if remplacant == nom:
+                conn.execute(f"DROP INDEX IF EXISTS {obsolete}")
+    conn.commit()
+
+
+def lire_version(conn: sqlite3.Connection) -> int:
+    """
+    Lit la version du schéma.
+
+    Args:
+        conn (sqlite3.Connection): Connexion à la base de données
+
+    Returns:
+        int: Valeur de PRAGMA user_version
+    """
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def ecrire_version(conn: sqlite3.Connection, version: int):
+    """
+    Enregistre la version du schéma.
+
+    Args:
+        conn (sqlite3.Connection): Connexion à la base de données
+        version (int): Nouvelle version
+    """
+    conn.execute(f"PRAGMA user_version = {int(version)}")
+
+
+# Index plein texte sur les livres : table FTS5 à contenu externe, tenue à jour
+# par des déclencheurs. Le tokenizer ignore la casse et les accents, et les
+# index de préfixes accélèrent la recherche pendant la saisie.
+TABLE_PLEIN_TEXTE = """
+    CREATE VIRTUAL TABLE IF NOT EXISTS livres_fts USING fts5(
+        titre, auteur,
+        content='livres', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2',
+        prefix='1 2 3'
+    )
+"""
+
+DECLENCHEURS_PLEIN_TEXTE = {
+    "livres_fts_insertion": """
+        CREATE TRIGGER IF NOT EXISTS livres_fts_insertion AFTER INSERT ON livres BEGIN
+            INSERT INTO livres_fts (rowid, titre, auteur) VALUES (new.id, new.titre, new.auteur);
+        END
+    """,
+    "livres_fts_suppression": """
+        CREATE TRIGGER IF NOT EXISTS livres_fts_suppression AFTER DELETE ON livres BEGIN
+            INSERT INTO livres_fts (livres_fts, rowid, titre, auteur)
+            VALUES ('delete', old.id, old.titre, old.auteur);
+        END
+    """,
+    "livres_fts_modification": """
+        CREATE TRIGGER IF NOT EXISTS livres_fts_modification AFTER UPDATE OF titre, auteur ON livres BEGIN
+            INSERT INTO livres_fts (livres_fts, rowid, titre, auteur)
+            VALUES ('delete', old.id, old.titre, old.auteur);
+            INSERT INTO livres_fts (rowid, titre, auteur) VALUES (new.id, new.titre, new.auteur);
+        END
+    """,
+}
+
+
+def creer_recherche_plein_texte(conn: sqlite3.Connection) -> bool:
+    """
+    Crée l'index plein texte des livres et ses déclencheurs.
+
+    À la création, l'index est alimenté avec les livres existants. Si SQLite
+    a été compilé sans FTS5, les déclencheurs éventuellement hérités d'une
+    autre installation sont supprimés pour ne pas bloquer les écritures.
+
+    Args:
+        conn (sqlite3.Connection): Connexion à la base de données
+
+    Returns:
+        bool: True si la recherche plein texte est disponible
+    """
+    existe = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE name = 'livres_fts'"
+    ).fetchone() is not None
+    try:
+        conn.execute(TABLE_PLEIN_TEXTE)
+        for sql in DECLENCHEURS_PLEIN_TEXTE.values():
+            conn.execute(sql)
+        if not existe:
+            conn.execute("INSERT INTO livres_fts (livres_fts) VALUES ('rebuild')")
+        conn.commit()
+        return True
+    except sqlite3.OperationalError:
+        conn.rollback()
+        for nom in DECLENCHEURS_PLEIN_TEXTE:
+            conn.execute(f"DROP TRIGGER IF EXISTS {nom}")
+        conn.commit()
+        return False
+
+
+def recherche_plein_texte_disponible(conn: sqlite3.Connection) -> bool:
+    """
+    Indique si l'index plein texte existe et peut être interrogé, sans rien créer.
+
+    Args:
+        conn (sqlite3.Connection): Connexion à la base de données
+
+    Returns:
+        bool: True si la recherche plein texte est utilisable
+    """
+    try:
+        conn.execute("SELECT rowid FROM livres_fts LIMIT 0")
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+
+# Tables de résumé des statistiques de circulation (optionnelles, voir
+# models.statistiques). Elles sont tenues à jour par des déclencheurs sur
+# emprunts : un emprunt archivé reste compté dans l'historique de circulation,
+# un emprunt supprimé sans être archivé cesse de l'être, et un emprunt en
+# cours supprimé n'est plus compté en cours ; archivé, il est compté comme
+# retourné à la date de l'archivage (voir archiver_emprunts). La date du dernier
+# emprunt d'un emprunteur n'est pas recalculée à la suppression.
+TABLES_RESUME = {
+    "stats_livres": """
+        CREATE TABLE IF NOT EXISTS stats_livres (
+            livre_id INTEGER PRIMARY KEY,
+            emprunts INTEGER NOT NULL DEFAULT 0,
+            retours INTEGER NOT NULL DEFAULT 0,
+            duree_totale REAL NOT NULL DEFAULT 0
+        )
+    """,
+    "stats_mois": """
+        CREATE TABLE IF NOT EXISTS stats_mois (
+            mois TEXT PRIMARY KEY,
+            emprunts INTEGER NOT NULL DEFAULT 0,
+            retours INTEGER NOT NULL DEFAULT 0,
+            duree_totale REAL NOT NULL DEFAULT 0
+        )
+    """,
+    "stats_emprunteurs": """
+        CREATE TABLE IF NOT EXISTS stats_emprunteurs (
+            emprunteur TEXT PRIMARY KEY,
+            emprunts INTEGER NOT NULL DEFAULT 0,
+            en_cours INTEGER NOT NULL DEFAULT 0,
+            dernier_emprunt TEXT
+        )
+    """,
+}
+
+INDEX_RESUME = {
+    "idx_stats_livres_emprunts":
+        "CREATE INDEX IF NOT EXISTS idx_stats_livres_emprunts ON stats_livres (emprunts)",
+    "idx_stats_emprunteurs_en_cours":
+        "CREATE INDEX IF NOT EXISTS idx_stats_emprunteurs_en_cours ON stats_emprunteurs (en_cours) "
+        "WHERE en_cours > 0",
+}
+
+# Durée d'un emprunt retourné, en jours
+_DUREE = "julianday(new.date_retour_reelle) - julianday(new.date_emprunt)"
+
+# Emprunt supprimé après avoir été copié dans l'archive (il reste compté)
+_ARCHIVE = "EXISTS (SELECT 1 FROM emprunts_archive WHERE id = old.id)"
+
+# Durée d'un emprunt en cours clos par son archivage, en jours
+_DUREE_CLOTURE = """(SELECT julianday(date_retour_reelle) FROM emprunts_archive WHERE id = old.id)
+                    - julianday(old.date_emprunt)"""
+
+# Totaux retirés pour un emprunt supprimé sans être archivé
+_RETRAIT = """emprunts = emprunts - 1,
+                retours = retours - (old.date_retour_reelle IS NOT NULL),
+                duree_totale = duree_totale
+                    - coalesce(julianday(old.date_retour_reelle) - julianday(old.date_emprunt), 0)"""
+
+DECLENCHEURS_RESUME = {
+    "stats_emprunt_insertion": f"""
+        CREATE TRIGGER IF NOT EXISTS stats_emprunt_insertion AFTER INSERT ON emprunts BEGIN
+            INSERT INTO stats_livres (livre_id, emprunts, retours, duree_totale)
+            VALUES (new.livre_id, 1, new.date_retour_reelle IS NOT NULL,
+                    coalesce({_DUREE}, 0))
+            ON CONFLICT (livre_id) DO UPDATE SET
+                emprunts = emprunts + 1,
+                retours = retours + excluded.retours,
+                duree_totale = duree_totale + excluded.duree_totale;
+            INSERT INTO stats_mois (mois, emprunts, retours, duree_totale)
+            VALUES (substr(new.date_emprunt, 1, 7), 1, new.date_retour_reelle IS NOT NULL,
+                    coalesce({_DUREE}, 0))
+            ON CONFLICT (mois) DO UPDATE SET
+                emprunts = emprunts + 1,
+                retours = retours + excluded.retours,
+                duree_totale = duree_totale + excluded.duree_totale;
+            INSERT INTO stats_emprunteurs (emprunteur, emprunts, en_cours, dernier_emprunt)
+            VALUES (new.emprunteur, 1, new.date_retour_reelle IS NULL, new.date_emprunt)
+            ON CONFLICT (emprunteur) DO UPDATE SET
+                emprunts = emprunts + 1,
+                en_cours = en_cours + excluded.en_cours,
+                dernier_emprunt = max(coalesce(dernier_emprunt, ''), excluded.dernier_emprunt);
+        END
+    """,
+    "stats_emprunt_retour": f"""
+        CREATE TRIGGER IF NOT EXISTS stats_emprunt_retour AFTER UPDATE OF date_retour_reelle ON emprunts
+        WHEN old.date_retour_reelle IS NULL AND new.date_retour_reelle IS NOT NULL BEGIN
+            UPDATE stats_livres
+            SET retours = retours + 1, duree_totale = duree_totale + {_DUREE}
+            WHERE livre_id = new.livre_id;
+            UPDATE stats_mois
+            SET retours = retours + 1, duree_totale = duree_totale + {_DUREE}
+            WHERE mois = substr(new.date_emprunt, 1, 7);
+            UPDATE stats_emprunteurs
+            SET en_cours = max(en_cours - 1, 0)
+            WHERE emprunteur = new.emprunteur;
+        END
+    """,
+    "stats_emprunt_suppression": f"""
+        CREATE TRIGGER IF NOT EXISTS stats_emprunt_suppression AFTER DELETE ON emprunts BEGIN
+            UPDATE stats_emprunteurs
+            SET en_cours = max(en_cours - (old.date_retour_reelle IS NULL), 0),
+                emprunts = emprunts - NOT {_ARCHIVE}
+            WHERE emprunteur = old.emprunteur;
+            DELETE FROM stats_emprunteurs WHERE emprunteur = old.emprunteur AND emprunts <= 0;
+            UPDATE stats_livres SET {_RETRAIT}
+            WHERE livre_id = old.livre_id AND NOT {_ARCHIVE};
+            UPDATE stats_livres SET retours = retours + 1, duree_totale = duree_totale + {_DUREE_CLOTURE}
+            WHERE livre_id = old.livre_id AND old.date_retour_reelle IS NULL AND {_ARCHIVE};
+            DELETE FROM stats_livres WHERE livre_id = old.livre_id AND emprunts <= 0;
+            UPDATE stats_mois SET {_RETRAIT}
+            WHERE mois = substr(old.date_emprunt, 1, 7) AND NOT {_ARCHIVE};
+            UPDATE stats_mois SET retours = retours + 1, duree_totale = duree_totale + {_DUREE_CLOTURE}
+            WHERE mois = substr(old.date_emprunt, 1, 7) AND old.date_retour_reelle IS NULL AND {_ARCHIVE};
+            DELETE FROM stats_mois WHERE mois = substr(old.date_emprunt, 1, 7) AND emprunts <= 0;
+        END
+    """,
+}
+
+
+# Emprunts actifs et archivés (colonnes utiles aux statistiques) : un emprunt
+# archivé reste compté dans l'historique de circulation, mais jamais en cours
+EMPRUNTS_ET_ARCHIVE = """(
+    SELECT livre_id, emprunteur, date_emprunt, date_retour_reelle,
+           date_retour_reelle IS NULL AS en_cours
+    FROM emprunts
+    UNION ALL
+    SELECT livre_id, emprunteur, date_emprunt, date_retour_reelle, 0 FROM emprunts_archive
+)"""
+
+# Agrégats des emprunts et de leur archive, de la même forme que les tables
+# de résumé : calcul initial et recalcul des résumés
+AGREGATS_RESUME = {
+    "stats_livres": f"""
+        SELECT livre_id, COUNT(*), COUNT(date_retour_reelle),
+               coalesce(SUM(julianday(date_retour_reelle) - julianday(date_emprunt)), 0)
+        FROM {EMPRUNTS_ET_ARCHIVE} GROUP BY livre_id
+    """,
+    "stats_mois": f"""
+        SELECT substr(date_emprunt, 1, 7), COUNT(*), COUNT(date_retour_reelle),
+               coalesce(SUM(julianday(date_retour_reelle) - julianday(date_emprunt)), 0)
+        FROM {EMPRUNTS_ET_ARCHIVE} GROUP BY 1
+    """,
+    "stats_emprunteurs": f"""
+        SELECT emprunteur, COUNT(*), SUM(en_cours), MAX(date_emprunt)
+        FROM {EMPRUNTS_ET_ARCHIVE} GROUP BY emprunteur
+    """,
+}
+
+
+def resumes_statistiques_presents(conn: sqlite3.Connection) -> bool:
+    """
+    Indique si les tables de résumé et leurs déclencheurs existent.
+
+    Args:
+        conn (sqlite3.Connection): Connexion à la base de données
+
+    Returns:
+        bool: True si les résumés sont tenus à jour par la base
+    """
+    noms = {nom for (nom,) in conn.execute("SELECT name FROM sqlite_master")}
+    return all(nom in noms for nom in (*TABLES_RESUME, *DECLENCHEURS_RESUME))
+
+
+def creer_resumes_statistiques(conn: sqlite3.Connection) -> bool:
+    """
+    Crée les tables de résumé, leurs index et leurs déclencheurs.
+
+    Args:
+        conn (sqlite3.Connection): Connexion à la base de données
+
+    Returns:
+        bool: True si les résumés viennent d'être créés (ils sont alors vides
+            et doivent être calculés une première fois)
+    """
+    if resumes_statistiques_presents(conn):
+        return False
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        for sql in (*TABLES_RESUME.values(), *INDEX_RESUME.values(), *DECLENCHEURS_RESUME.values()):
+            conn.execute(sql)
+        conn.commit()
+    except sqlite3.Error:
+        conn.rollback()
+        raise
+    return True
+
+
+# Table des lecteurs : la clé normalisée (voir models.lecteur.normaliser_nom)
+# est unique, la recherche d'un lecteur par son nom passe par son index
+TABLE_LECTEURS = """
+    CREATE TABLE IF NOT EXISTS lecteurs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        nom TEXT NOT NULL,
+        cle TEXT NOT NULL UNIQUE,
+        limite_emprunts INTEGER
+    )
+"""
+
+
+# Exemplaires physiques des livres. Les compteurs livres.nombre_exemplaires et
+# livres.exemplaires_disponibles sont tenus à jour par des déclencheurs, dans
+# la transaction de l'écriture qui les modifie : la disponibilité d'un livre
+# se lit sur sa ligne, sans compter ses emprunts.
+TABLE_EXEMPLAIRES = """
+    CREATE TABLE IF NOT EXISTS exemplaires (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        livre_id INTEGER NOT NULL REFERENCES livres (id) ON DELETE CASCADE
+    )
+"""
+
+DECLENCHEURS_EXEMPLAIRES = {
+    # Tout nouveau livre a un premier exemplaire
+    "livres_exemplaire_initial": """
+        CREATE TRIGGER IF NOT EXISTS livres_exemplaire_initial AFTER INSERT ON livres BEGIN
+            INSERT INTO exemplaires (livre_id) VALUES (new.id);
+        END
+    """,
+    "exemplaires_insertion": """
+        CREATE TRIGGER IF NOT EXISTS exemplaires_insertion AFTER INSERT ON exemplaires BEGIN
+            UPDATE livres
+            SET nombre_exemplaires = nombre_exemplaires + 1,
+                exemplaires_disponibles = exemplaires_disponibles + 1
+            WHERE id = new.livre_id;
+        END
+    """,
+    "exemplaires_suppression": """
+        CREATE TRIGGER IF NOT EXISTS exemplaires_suppression AFTER DELETE ON exemplaires BEGIN
+            UPDATE livres
+            SET nombre_exemplaires = nombre_exemplaires - 1,
+                exemplaires_disponibles = exemplaires_disponibles - 1
+            WHERE id = old.livre_id;
+        END
+    """,
+    "disponibilite_emprunt": """
+        CREATE TRIGGER IF NOT EXISTS disponibilite_emprunt AFTER INSERT ON emprunts
+        WHEN new.date_retour_reelle IS NULL BEGIN
+            UPDATE livres SET exemplaires_disponibles = exemplaires_disponibles - 1
+            WHERE id = new.livre_id;
+        END
+    """,
+    "disponibilite_retour": """
+        CREATE TRIGGER IF NOT EXISTS disponibilite_retour AFTER UPDATE OF date_retour_reelle ON emprunts
+        WHEN old.date_retour_reelle IS NULL AND new.date_retour_reelle IS NOT NULL BEGIN
+            UPDATE livres SET exemplaires_disponibles = exemplaires_disponibles + 1
+            WHERE id = new.livre_id;
+        END
+    """,
+    "disponibilite_suppression_emprunt": """
+        CREATE TRIGGER IF NOT EXISTS disponibilite_suppression_emprunt AFTER DELETE ON emprunts
+        WHEN old.date_retour_reelle IS NULL BEGIN
+            UPDATE livres SET exemplaires_disponibles = exemplaires_disponibles + 1
+            WHERE id = old.livre_id;
+        END
+    """,
+}
+
+
+def recalculer_disponibilites(conn: sqlite3.Connection) -> int:
+    """
+    Recalcule les compteurs d'exemplaires de tous les livres en une requête.
+
+    Args:
+        conn (sqlite3.Connection): Connexion à la base de données (la validation
+            est laissée à l'appelant)
+
+    Returns:
+        int: Nombre de livres dont un compteur a été corrigé
+    """
+    curseur = conn.execute("""
+        UPDATE livres
+        SET nombre_exemplaires = comptes.nombre,
+            exemplaires_disponibles = comptes.nombre - comptes.en_cours
+        FROM (
+            SELECT livres.id AS livre_id,
+                   (SELECT COUNT(*) FROM exemplaires x WHERE x.livre_id = livres.id) AS nombre,
+                   (SELECT COUNT(*) FROM emprunts e
+                    WHERE e.livre_id = livres.id AND e.date_retour_reelle IS NULL) AS en_cours
+            FROM livres
+        ) AS comptes
+        WHERE livres.id = comptes.livre_id
+        AND (livres.nombre_exemplaires, livres.exemplaires_disponibles)
+            IS NOT (comptes.nombre, comptes.nombre - comptes.en_cours)
+    """)
+    return curseur.rowcount
+
+
+# Archive des emprunts : mêmes identifiants que dans emprunts, avec le titre,
+# l'auteur et la date de publication du livre au moment de l'archivage. Sans
+# clé étrangère : l'historique d'un livre supprimé y reste lisible. Un emprunt
+# n'est jamais à la fois dans emprunts et dans l'archive : il y est copié puis
+# supprimé de emprunts dans la même transaction.
+TABLE_EMPRUNTS_ARCHIVE = """
+    CREATE TABLE IF NOT EXISTS emprunts_archive (
+        id INTEGER PRIMARY KEY,
+        livre_id INTEGER NOT NULL,
+        emprunteur TEXT NOT NULL,
+        date_emprunt TEXT NOT NULL,
+        date_retour_prevue TEXT NOT NULL,
+        date_retour_reelle TEXT,
+        lecteur_id INTEGER,
+        exemplaire_id INTEGER,
+        titre TEXT,
+        auteur TEXT,
+        date_publication TEXT,
+        date_archivage TEXT NOT NULL
+    )
+"""
+
+
+def archiver_emprunts(conn: sqlite3.Connection, condition: str, params: tuple = ()) -> int:
+    """
+    Copie des emprunts dans l'archive (sans les retirer de la table emprunts).
+
+    Un emprunt encore en cours est archivé comme retourné à la date de
+    l'archivage : l'archive ne contient que des emprunts clos.
+
+    Args:
+        conn (sqlite3.Connection): Connexion d'écriture (la validation est
+            laissée à l'appelant)
+        condition (str): Condition SQL sur les emprunts copiés (alias e)
+        params (tuple): Paramètres de la condition
+
+    Returns:
+        int: Nombre d'emprunts copiés (ceux déjà archivés sont ignorés)
+    """
+    curseur = conn.execute(f"""
+        INSERT INTO emprunts_archive (
+            id, livre_id, emprunteur, date_emprunt, date_retour_prevue, date_retour_reelle,
+            lecteur_id, exemplaire_id, titre, auteur, date_publication, date_archivage
+        )
+        SELECT e.id, e.livre_id, e.emprunteur, e.date_emprunt, e.date_retour_prevue,
+               coalesce(e.date_retour_reelle, date('now', 'localtime')), e.lecteur_id, e.exemplaire_id,
+               l.titre, l.auteur, l.date_publication, date('now', 'localtime')
+        FROM emprunts e LEFT JOIN livres l ON l.id = e.livre_id
+        WHERE {condition}
+        ON CONFLICT (id) DO NOTHING
+    """, params)
+    return curseur.rowcount
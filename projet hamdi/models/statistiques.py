@@ -0,0 +1,192 @@
+"""
+Statistiques de circulation : livres les plus empruntés, emprunts par mois,
+emprunteurs actifs et durée moyenne des emprunts.
+
+Tous les calculs sont faits en SQL. Avec les tables de résumé (voir
+models.schema.TABLES_RESUME), tenues à jour par des déclencheurs à chaque
+emprunt et retour, les requêtes du tableau de bord ne lisent que quelques
+lignes, quelle que soit la taille de l'historique. Sans elles, les mêmes
+statistiques sont agrégées directement sur les emprunts et leur archive.
+"""
+
+from typing import List, Optional, Tuple
+from models.bibliotheque import Bibliotheque, COLONNES_LIVRE
+from models.livre import Livre
+from models.schema import (AGREGATS_RESUME, EMPRUNTS_ET_ARCHIVE, creer_resumes_statistiques,
+                           resumes_statistiques_presents)
+
+
+class Statistiques:
+    """
+    Statistiques de circulation d'une bibliothèque.
+
+    Attributes:
+        bibliotheque (Bibliotheque): La bibliothèque interrogée
+        resumes (bool): True si les tables de résumé sont utilisées
+    """
+
+    def __init__(self, bibliotheque: Bibliotheque, resumes: bool = True):
+        """
+        Prépare les statistiques.
+
+        Avec resumes=True, les tables de résumé sont créées (et calculées une
+        première fois) si elles n'existent pas encore ; elles restent ensuite
+        tenues à jour par la base. Une bibliothèque en lecture seule les
+        utilise seulement si elles existent déjà.
+
+        Args:
+            bibliotheque (Bibliotheque): La bibliothèque interrogée
+            resumes (bool): Utiliser les tables de résumé
+        """
+        self.bibliotheque = bibliotheque
+        self.resumes = resumes and self._preparer_resumes()
+
+    def _preparer_resumes(self) -> bool:
+        """Crée les tables de résumé si possible ; retourne True si elles sont utilisables."""
+        with self.bibliotheque._lecture() as conn:
+            if resumes_statistiques_presents(conn):
+                return True
+        if self.bibliotheque.profil == "lecture_seule":
+            return False
+        with self.bibliotheque._ecriture() as conn:
+            if creer_resumes_statistiques(conn):
+                self.recalculer()
+        return True
+
+    def recalculer(self):
+        """
+        Recalcule les tables de résumé à partir des emprunts et de leur archive.
+
+        Les emprunts supprimés sans être archivés depuis la création des
+        résumés cessent alors d'être comptés.
+        """
+        with self.bibliotheque.transaction() as bibliotheque:
+            conn = bibliotheque.conn
+            for table, requete in AGREGATS_RESUME.items():
+                conn.execute(f"DELETE FROM {table}")
+                conn.execute(f"INSERT INTO {table} {requete}")
+
+    def livres_les_plus_empruntes(self, limite: int = 10) -> List[Tuple[Livre, int]]:
+        """
+        Retourne les livres les plus empruntés.
+
+        Args:
+            limite (int): Nombre de livres retournés
+
+        Returns:
+            List[Tuple[Livre, int]]: Chaque livre avec son nombre d'emprunts, du plus emprunté au moins emprunté
+        """
+        if self.resumes:
+            requete = f"""
+                SELECT {COLONNES_LIVRE}, s.emprunts
+                FROM stats_livres s JOIN livres ON livres.id = s.livre_id
+                ORDER BY s.emprunts DESC, s.livre_id
+                LIMIT ?
+            """
+        else:
+            requete = f"""
+                SELECT {COLONNES_LIVRE}, s.emprunts
+                FROM (
+                    SELECT livre_id, COUNT(*) AS emprunts FROM {EMPRUNTS_ET_ARCHIVE} GROUP BY livre_id
+                ) AS s JOIN livres ON livres.id = s.livre_id
+                ORDER BY s.emprunts DESC, s.livre_id
+                LIMIT ?
+            """
+        with self.bibliotheque._lecture() as conn:
+            return [(Livre.depuis_base(*row[:6]), row[6])
+                    for row in conn.execute(requete, (limite,))]
+
+    def emprunts_par_mois(self, derniers: Optional[int] = None) -> List[Tuple[str, int]]:
+        """
+        Retourne le nombre d'emprunts de chaque mois.
+
+        Args:
+            derniers (Optional[int]): Ne retourner que les N mois les plus récents
+
+        Returns:
+            List[Tuple[str, int]]: Mois (AAAA-MM) et nombre d'emprunts, du plus ancien au plus récent
+        """
+        if self.resumes:
+            source = "stats_mois"
+        else:
+            source = f"""(
+                SELECT substr(date_emprunt, 1, 7) AS mois, COUNT(*) AS emprunts
+                FROM {EMPRUNTS_ET_ARCHIVE} GROUP BY mois
+            )"""
+        requete = f"""
+            SELECT mois, emprunts FROM (
+                SELECT mois, emprunts FROM {source} ORDER BY mois DESC LIMIT ?
+            ) ORDER BY mois
+        """
+        with self.bibliotheque._lecture() as conn:
+            return [(row[0], row[1]) for row in conn.execute(requete, (derniers or -1,))]
+
+    def emprunteurs_actifs(self, limite: Optional[int] = None) -> List[Tuple[str, int]]:
+        """
+        Retourne les emprunteurs ayant au moins un emprunt en cours.
+
+        Args:
+            limite (Optional[int]): Nombre maximal d'emprunteurs retournés
+
+        Returns:
+            List[Tuple[str, int]]: Emprunteur et nombre d'emprunts en cours, du plus grand au plus petit
+        """
+        if self.resumes:
+            requete = """
+                SELECT emprunteur, en_cours FROM stats_emprunteurs
+                WHERE en_cours > 0 ORDER BY en_cours DESC, emprunteur LIMIT ?
+            """
+        else:
+            requete = """
+                SELECT emprunteur, COUNT(*) FROM emprunts
+                WHERE date_retour_reelle IS NULL
+                GROUP BY emprunteur ORDER BY 2 DESC, emprunteur LIMIT ?
+            """
+        with self.bibliotheque._lecture() as conn:
+            return [(row[0], row[1]) for row in conn.execute(requete, (limite or -1,))]
+
+    def duree_moyenne(self) -> Optional[float]:
+        """
+        Retourne la durée moyenne des emprunts retournés.
+
+        Returns:
+            Optional[float]: Durée moyenne en jours, ou None si aucun emprunt n'a été retourné
+        """
+        if self.resumes:
+            requete = "SELECT SUM(duree_totale) / SUM(retours) FROM stats_mois"
+        else:
+            requete = f"""
+                SELECT AVG(julianday(date_retour_reelle) - julianday(date_emprunt))
+                FROM {EMPRUNTS_ET_ARCHIVE} WHERE date_retour_reelle IS NOT NULL
+            """
+        with self.bibliotheque._lecture() as conn:
+            return conn.execute(requete).fetchone()[0]
+
+    def tableau_de_bord(self, limite: int = 10, mois: int = 12) -> dict:
+        """
+        Rassemble les statistiques principales.
+
+        Args:
+            limite (int): Nombre de livres et d'emprunteurs listés
+            mois (int): Nombre de mois de l'historique mensuel
+
+        Returns:
+            dict: Totaux, durée moyenne, livres les plus empruntés, emprunts
+                par mois et emprunteurs actifs
+        """
+        if self.resumes:
+            requete = "SELECT coalesce(SUM(emprunts), 0), coalesce(SUM(retours), 0) FROM stats_mois"
+        else:
+            requete = f"SELECT COUNT(*), COUNT(date_retour_reelle) FROM {EMPRUNTS_ET_ARCHIVE}"
+        with self.bibliotheque._lecture() as conn:
+            emprunts, retours = conn.execute(requete).fetchone()
+        return {
+            "emprunts": emprunts,
+            "retours": retours,
+            "en_cours": self.bibliotheque.compter_emprunts_en_cours(),
+            "en_retard": self.bibliotheque.compter_emprunts_en_retard(),
+            "duree_moyenne": self.duree_moyenne(),
+            "livres_les_plus_empruntes": self.livres_les_plus_empruntes(limite),
+            "emprunts_par_mois": self.emprunts_par_mois(mois),
+            "emprunteurs_actifs": self.emprunteurs_actifs(limite),
+        }
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Test de charge des emprunts : plusieurs processus empruntent et rendent les
+exemplaires des mêmes livres en même temps sur une base temporaire.
+
+À la fin, vérifie qu'aucun exemplaire n'a jamais plus d'un emprunt en cours,
+que les compteurs de disponibilité des livres sont exacts et que le nombre
+d'emprunts en cours correspond aux opérations réussies.
+Usage:
+    python stress_emprunts.py [processus] [operations] [livres] [exemplaires]   # 8 2000 20 2 par défaut
+"""
+
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+from models.bibliotheque import Bibliotheque
+from models.livre import Livre
+
+def travailler(db_path: str, numero: int, operations: int, livres: int, depart) -> tuple:
+    """
+    Enchaîne des emprunts et des retours aléatoires (chaque processus rend
+    les exemplaires qu'il a empruntés).
+
+    Returns:
+        tuple: Nombre d'emprunts réussis, de retours réussis et de refus
+    """
+    bibliotheque = Bibliotheque(db_path)
+    hasard = random.Random(numero)
+    emprunts = retours = refus = 0
+    en_main = []
+    depart.wait()
+    for _ in range(operations):
+        try:
+            if hasard.random() < 0.6 or not en_main:
+                emprunt = bibliotheque.emprunter_livre(hasard.randint(1, livres), f"Processus {numero}")
+                en_main.append(emprunt)
+                emprunts += 1
+            else:
+                emprunt = en_main.pop(hasard.randrange(len(en_main)))
+                bibliotheque.retourner_livre(emprunt.livre_id, emprunt.exemplaire_id)
+                retours += 1
+        except ValueError:
+            refus += 1
+    bibliotheque.deconnecter()
+    return emprunts, retours, refus
+
+def main():
+    """Lance les processus puis contrôle la cohérence de la base."""
+    processus = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    operations = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    livres = int(sys.argv[3]) if len(sys.argv) > 3 else 20
+    exemplaires = int(sys.argv[4]) if len(sys.argv) > 4 else 2
+
+    with tempfile.TemporaryDirectory() as dossier:
+        db_path = os.path.join(dossier, "stress.db")
+        bibliotheque = Bibliotheque(db_path)
+        bibliotheque.ajouter_livres(
+            (f"Livre {i}", "Auteur", "01/01/2000") for i in range(1, livres + 1)
+        )
+        if exemplaires > 1:
+            for livre_id in range(1, livres + 1):
+                bibliotheque.ajouter_exemplaires(livre_id, exemplaires - 1)
+
+        print(f"{processus} processus x {operations} opérations sur {livres} livres "
+              f"de {exemplaires} exemplaire(s)...")
+        with multiprocessing.Manager() as gestionnaire:
+            depart = gestionnaire.Event()
+            with multiprocessing.Pool(processus) as pool:
+                taches = [
+                    pool.apply_async(travailler, (db_path, numero, operations, livres, depart))
+                    for numero in range(processus)
+                ]
+                debut = time.perf_counter()
+                depart.set()
+                resultats = [tache.get() for tache in taches]
+                duree = time.perf_counter() - debut
+
+        emprunts = sum(r[0] for r in resultats)
+        retours = sum(r[1] for r in resultats)
+        refus = sum(r[2] for r in resultats)
+        total = processus * operations
+        print(f"{emprunts} emprunts, {retours} retours, {refus} refus "
+              f"en {duree:.2f} s ({total / duree:.0f} opérations/s)")
+
+        doublons = bibliotheque.conn.execute(
+            """
+            SELECT exemplaire_id, COUNT(*) FROM emprunts
+            WHERE date_retour_reelle IS NULL
+            GROUP BY exemplaire_id HAVING COUNT(*) > 1
+            """
+        ).fetchall()
+        compteurs_faux = bibliotheque.conn.execute(
+            """
+            SELECT id, exemplaires_disponibles FROM livres
+            WHERE exemplaires_disponibles != nombre_exemplaires - (
+                SELECT COUNT(*) FROM emprunts
+                WHERE livre_id = livres.id AND date_retour_reelle IS NULL
+            )
+            """
+        ).fetchall()
+        en_cours = bibliotheque.compter_emprunts_en_cours()
+        bibliotheque.deconnecter()
+
+    erreurs = []
+    if doublons:
+        erreurs.append(f"exemplaires avec plusieurs emprunts en cours : {doublons}")
+    if compteurs_faux:
+        erreurs.append(f"compteurs de disponibilité faux : {compteurs_faux}")
+    if en_cours != emprunts - retours:
+        erreurs.append(f"{en_cours} emprunts en cours pour {emprunts - retours} attendus")
+    for erreur in erreurs:
+        print(f"ÉCHEC : {erreur}")
+    if not erreurs:
+        print("OK : aucun exemplaire n'a eu deux emprunts en cours, compteurs exacts")
+    return 1 if erreurs else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
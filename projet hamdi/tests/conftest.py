@@ -0,0 +1,26 @@
+"""
+Fixtures communes des tests : une bibliothèque neuve dans un dossier temporaire.
+"""
+
+import os
+import sys
+import pytest
+
+# Les modules de l'application (models, views) sont importés depuis la racine du projet
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.bibliotheque import Bibliotheque
+
+
+@pytest.fixture
+def chemin_base(tmp_path):
+    """Chemin d'une base de données temporaire (créée au premier usage)."""
+    return str(tmp_path / "bibliotheque.db")
+
+
+@pytest.fixture
+def bibliotheque(chemin_base):
+    """Bibliothèque neuve sur une base temporaire, fermée à la fin du test."""
+    b = Bibliotheque(chemin_base)
+    yield b
+    b.deconnecter()
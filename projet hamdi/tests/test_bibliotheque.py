@@ -0,0 +1,314 @@
+"""
+Tests de la bibliothèque : emprunts concurrents, compteurs de disponibilité,
+résumés statistiques, archive de l'historique, unicité des livres et
+isolation des lectures.
+"""
+
+import sqlite3
+import threading
+import time
+import pytest
+
+from models.bibliotheque import Bibliotheque
+from models.livre import Livre
+from models.schema import AGREGATS_RESUME, unicite_livres_presente
+from models.statistiques import Statistiques
+
+
+def ajouter(bibliotheque, titre, auteur="Auteur"):
+    """Ajoute un livre (un exemplaire) et retourne son ID."""
+    return bibliotheque.ajouter_livre(Livre(titre, auteur, "01/01/2000"))
+
+
+def compteurs(bibliotheque, livre_id):
+    """Retourne (nombre_exemplaires, exemplaires_disponibles) d'un livre."""
+    return bibliotheque.conn.execute(
+        "SELECT nombre_exemplaires, exemplaires_disponibles FROM livres WHERE id = ?", (livre_id,)
+    ).fetchone()
+
+
+def resumes_coherents(bibliotheque) -> bool:
+    """Compare les tables de résumé à un recalcul complet (hors date du dernier emprunt)."""
+    conn = bibliotheque.conn
+    for table, requete in AGREGATS_RESUME.items():
+        tenus = sorted(row[:3] for row in conn.execute(f"SELECT * FROM {table}"))
+        recalcules = sorted(row[:3] for row in conn.execute(requete))
+        if tenus != recalcules:
+            return False
+    return True
+
+
+# Emprunts et compteurs
+
+def test_second_emprunt_du_meme_exemplaire_refuse(bibliotheque):
+    livre_id = ajouter(bibliotheque, "Dune")
+    bibliotheque.emprunter_livre(livre_id, "Dupont")
+    with pytest.raises(ValueError):
+        bibliotheque.emprunter_livre(livre_id, "Martin")
+    assert compteurs(bibliotheque, livre_id) == (1, 0)
+
+
+def test_emprunts_simultanes_un_seul_accepte(bibliotheque, chemin_base):
+    livre_id = ajouter(bibliotheque, "Dune")
+    acceptes, refuses = [], []
+    depart = threading.Barrier(4)
+
+    def emprunter(nom):
+        b = Bibliotheque(chemin_base)
+        try:
+            depart.wait()
+            b.emprunter_livre(livre_id, nom)
+            acceptes.append(nom)
+        except ValueError:
+            refuses.append(nom)
+        finally:
+            b.deconnecter()
+
+    threads = [threading.Thread(target=emprunter, args=(f"Lecteur {i}",)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(acceptes) == 1 and len(refuses) == 3
+    assert compteurs(bibliotheque, livre_id) == (1, 0)
+
+
+def test_emprunts_sans_limite_par_defaut(bibliotheque):
+    livres = [ajouter(bibliotheque, f"Livre {i}") for i in range(8)]
+    for livre_id in livres:
+        bibliotheque.emprunter_livre(livre_id, "Dupont")
+    assert len(bibliotheque.obtenir_emprunts_en_cours()) == 8
+
+
+def test_limite_propre_d_un_lecteur(bibliotheque):
+    livres = [ajouter(bibliotheque, f"Livre {i}") for i in range(3)]
+    bibliotheque.inscrire_lecteur("Dupont", limite_emprunts=2)
+    bibliotheque.emprunter_livre(livres[0], "Dupont")
+    bibliotheque.emprunter_livre(livres[1], "dupont ")
+    with pytest.raises(ValueError, match="limite"):
+        bibliotheque.emprunter_livre(livres[2], "Dupont")
+    assert compteurs(bibliotheque, livres[2]) == (1, 1)
+
+
+def test_compteurs_apres_retour_et_suppression(bibliotheque):
+    livre_id = ajouter(bibliotheque, "Dune")
+    bibliotheque.ajouter_exemplaires(livre_id, 2)
+    bibliotheque.emprunter_livre(livre_id, "Dupont")
+    bibliotheque.emprunter_livre(livre_id, "Martin")
+    assert compteurs(bibliotheque, livre_id) == (3, 1)
+
+    exemplaire_id = bibliotheque.obtenir_emprunts_en_cours()[0][0].exemplaire_id
+    assert bibliotheque.retourner_livre(livre_id, exemplaire_id)
+    assert compteurs(bibliotheque, livre_id) == (3, 2)
+
+    with pytest.raises(ValueError):
+        bibliotheque.supprimer_livre(livre_id)
+    assert compteurs(bibliotheque, livre_id) == (3, 2)
+
+
+def test_resumes_apres_suppression_archivee(chemin_base):
+    bibliotheque = Bibliotheque(chemin_base, suppression="archiver")
+    try:
+        statistiques = Statistiques(bibliotheque)
+        livre_id = ajouter(bibliotheque, "Dune")
+        autre_id = ajouter(bibliotheque, "Fondation")
+        bibliotheque.emprunter_livre(livre_id, "Dupont")
+        bibliotheque.emprunter_livre(autre_id, "Martin")
+        bibliotheque.retourner_livre(autre_id)
+
+        assert bibliotheque.supprimer_livre(livre_id)
+        assert resumes_coherents(bibliotheque)
+        tableau = statistiques.tableau_de_bord()
+        assert tableau["en_cours"] == 0
+        assert tableau["emprunteurs_actifs"] == []
+        # L'emprunt archivé reste compté
+        assert tableau["emprunts"] == 2
+
+        bibliotheque.suppression = "bloquer"
+        assert bibliotheque.supprimer_livre(autre_id)
+        assert resumes_coherents(bibliotheque)
+        assert statistiques.tableau_de_bord()["emprunts"] == 2
+    finally:
+        bibliotheque.deconnecter()
+
+
+def test_suppression_bloquee_garde_l_historique(bibliotheque):
+    livre_id = ajouter(bibliotheque, "Dune")
+    bibliotheque.emprunter_livre(livre_id, "Dupont")
+    with pytest.raises(ValueError):
+        bibliotheque.supprimer_livre(livre_id)
+    bibliotheque.retourner_livre(livre_id)
+
+    assert bibliotheque.supprimer_livre(livre_id)
+    [(emprunt, livre)] = bibliotheque.obtenir_historique_emprunts(livre_id)
+    assert emprunt.emprunteur == "Dupont" and livre.titre == "Dune"
+    assert not emprunt.est_en_cours
+
+
+def test_suppression_archivee_clot_les_emprunts_en_cours(chemin_base):
+    bibliotheque = Bibliotheque(chemin_base, suppression="archiver")
+    try:
+        statistiques = Statistiques(bibliotheque)
+        livre_id = ajouter(bibliotheque, "Dune")
+        bibliotheque.emprunter_livre(livre_id, "Dupont")
+        # Emprunt en retard au moment de la suppression
+        bibliotheque.conn.execute(
+            "UPDATE emprunts SET date_emprunt = '2000-01-01', date_retour_prevue = '2000-01-15'"
+        )
+        bibliotheque.conn.commit()
+        statistiques.recalculer()
+
+        assert bibliotheque.supprimer_livre(livre_id)
+        [(emprunt, _)] = bibliotheque.obtenir_historique_emprunts(livre_id)
+        assert not emprunt.est_en_cours
+        assert not emprunt.en_retard
+        assert bibliotheque.obtenir_emprunts_en_retard() == []
+        assert resumes_coherents(bibliotheque)
+        retours = bibliotheque.conn.execute("SELECT SUM(retours) FROM stats_mois").fetchone()
+        assert retours == (1,)
+    finally:
+        bibliotheque.deconnecter()
+
+
+def test_migration_clot_les_emprunts_archives_en_cours(chemin_base):
+    bibliotheque = Bibliotheque(chemin_base)
+    bibliotheque.conn.execute(
+        "INSERT INTO emprunts_archive (id, livre_id, emprunteur, date_emprunt, date_retour_prevue, "
+        "date_archivage) VALUES (1, 1, 'Dupont', '2000-01-01', '2000-01-15', '2000-02-01')"
+    )
+    bibliotheque.conn.execute("PRAGMA user_version = 6")
+    bibliotheque.conn.commit()
+    bibliotheque.deconnecter()
+
+    bibliotheque = Bibliotheque(chemin_base)
+    try:
+        row = bibliotheque.conn.execute("SELECT date_retour_reelle FROM emprunts_archive").fetchone()
+        assert row == ("2000-02-01",)
+    finally:
+        bibliotheque.deconnecter()
+
+
+# Archive de l'historique
+
+def test_historique_lit_emprunts_et_archive(bibliotheque):
+    livre_id = ajouter(bibliotheque, "Dune")
+    for nom in ("Dupont", "Martin", "Durand"):
+        bibliotheque.emprunter_livre(livre_id, nom)
+        bibliotheque.retourner_livre(livre_id)
+    bibliotheque.emprunter_livre(livre_id, "Bernard")
+    # Deux retours anciens, déplaçables dans l'archive
+    bibliotheque.conn.execute(
+        "UPDATE emprunts SET date_emprunt = '2000-01-01', date_retour_reelle = '2000-01-10' "
+        "WHERE emprunteur IN ('Dupont', 'Martin')"
+    )
+    bibliotheque.conn.commit()
+    avant = [emprunt.id for emprunt, _ in bibliotheque.iter_historique(livre_id)]
+
+    assert bibliotheque.archiver_historique(age_jours=365, taille_lot=1) == 2
+    actifs = bibliotheque.conn.execute("SELECT emprunteur FROM emprunts ORDER BY id").fetchall()
+    assert actifs == [("Durand",), ("Bernard",)]
+
+    assert [emprunt.id for emprunt, _ in bibliotheque.iter_historique(livre_id)] == avant
+    assert len(bibliotheque.obtenir_historique_emprunts()) == 4
+    assert bibliotheque.compter_historique(livre_id) == 4
+    page, jeton = bibliotheque.obtenir_historique_apres(taille_page=3)
+    suite, _ = bibliotheque.obtenir_historique_apres(jeton, taille_page=3)
+    assert [emprunt.id for emprunt, _ in page + suite] == avant
+    assert all(livre.titre == "Dune" for _, livre in bibliotheque.iter_historique(livre_id))
+    # Les emprunts en cours ne lisent que la table active
+    assert [emprunt.emprunteur for emprunt, _ in bibliotheque.obtenir_emprunts_en_cours()] == ["Bernard"]
+
+
+# Unicité des livres
+
+def test_migration_fusionne_les_doublons_d_une_ancienne_base(chemin_base):
+    conn = sqlite3.connect(chemin_base)
+    conn.execute("CREATE TABLE livres (id INTEGER PRIMARY KEY AUTOINCREMENT, titre TEXT NOT NULL, "
+                 "auteur TEXT NOT NULL, annee INTEGER NOT NULL)")
+    conn.executemany("INSERT INTO livres (titre, auteur, annee) VALUES (?, ?, ?)",
+                     [("Dune", "Herbert", 1965), ("Dune", "Herbert", 1966), ("Fondation", "Asimov", 1951)])
+    conn.commit()
+    conn.close()
+
+    bibliotheque = Bibliotheque(chemin_base)
+    try:
+        assert unicite_livres_presente(bibliotheque.conn)
+        livres = bibliotheque.conn.execute("SELECT id, titre, nombre_exemplaires FROM livres ORDER BY id")
+        assert livres.fetchall() == [(1, "Dune", 2), (3, "Fondation", 1)]
+        rapport = bibliotheque.ajouter_livres([("Solaris", "Lem", "01/01/1961")] * 2)
+        assert rapport.inseres == 1 and len(rapport.erreurs) == 1
+    finally:
+        bibliotheque.deconnecter()
+
+
+# Recherche et lectures
+
+def test_recherche_like_memorisee_sous_le_terme(chemin_base):
+    bibliotheque = Bibliotheque(chemin_base, cache=True)
+    try:
+        bibliotheque.recherche_plein_texte = False
+        ajouter(bibliotheque, "Dune")
+        assert [livre.titre for livre in bibliotheque.rechercher_livre("Dun")] == ["Dune"]
+        assert bibliotheque.cache.recherche("Dun", 100) is not None
+    finally:
+        bibliotheque.deconnecter()
+
+
+def test_recherche_plein_texte_classe_toutes_les_correspondances(bibliotheque):
+    if not bibliotheque.recherche_plein_texte:
+        pytest.skip("FTS5 indisponible")
+    bibliotheque.CANDIDATS_RECHERCHE = 5
+    bibliotheque.ajouter_livres([(f"Rome {i}", f"Auteur {i}", "01/01/2000") for i in range(20)])
+    ajouter(bibliotheque, "Rome Rome Rome", "Rome")
+    assert bibliotheque.rechercher_livre("rome", 1)[0].titre == "Rome Rome Rome"
+
+
+@pytest.mark.parametrize("chemin", [":memory:", None])
+def test_lecture_ne_voit_pas_une_transaction_en_cours(chemin, chemin_base):
+    bibliotheque = Bibliotheque(chemin or chemin_base)
+    dans_transaction = threading.Event()
+    vus = []
+
+    def ecrire():
+        try:
+            with bibliotheque.transaction():
+                ajouter(bibliotheque, "Dune")
+                dans_transaction.set()
+                time.sleep(0.2)
+                raise RuntimeError("transaction annulée")
+        except RuntimeError:
+            pass
+
+    def lire():
+        dans_transaction.wait()
+        vus.append(len(bibliotheque.obtenir_tous_les_livres()))
+
+    try:
+        threads = [threading.Thread(target=ecrire), threading.Thread(target=lire)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert vus == [0]
+    finally:
+        bibliotheque.deconnecter()
+
+
+def test_parcours_ne_reserve_pas_la_connexion_d_ecriture(bibliotheque):
+    for titre in ("Dune", "Fondation", "Solaris"):
+        ajouter(bibliotheque, titre)
+    parcours = bibliotheque.iter_livres(arraysize=1)
+    premier = next(parcours)
+
+    ecrivain = threading.Thread(target=ajouter, args=(bibliotheque, "Hypérion"))
+    ecrivain.start()
+    ecrivain.join(timeout=5)
+    try:
+        assert not ecrivain.is_alive()
+        # Le parcours continue sur l'état de la base à son début
+        assert [premier.titre, *(livre.titre for livre in parcours)] == ["Dune", "Fondation", "Solaris"]
+    finally:
+        parcours.close()
+        ecrivain.join()
+    assert len(bibliotheque.obtenir_tous_les_livres()) == 4
@@ -5,6 +5,8 @@ from datetime import datetime
 from models.livre import Livre
 from models.emprunt import Emprunt
 from models.bibliotheque import Bibliotheque
+from models.evenements import Changement, INSERE, MODIFIE
+from views.tableau_virtuel import TableauVirtuel
 
 class InterfaceEmprunts(ctk.CTkFrame):
     """Interface de gestion des emprunts."""
@@ -23,6 +25,7 @@ class InterfaceEmprunts(ctk.CTkFrame):
         self._creer_widgets()
         self._placer_widgets()
         self.rafraichir_liste()
+        self.bibliotheque.abonner(self._sur_changement)
     
     def _creer_widgets(self):
         """Crée les widgets de l'interface des emprunts."""
@@ -47,6 +50,14 @@ class InterfaceEmprunts(ctk.CTkFrame):
             width=200
         )
         
+        # Exemplaire rendu : nécessaire au retour d'un livre dont plusieurs
+        # exemplaires sont empruntés
+        self.entry_exemplaire = ctk.CTkEntry(
+            self.frame_emprunt,
+            placeholder_text="N° d'exemplaire (retour)",
+            width=160
+        )
+        
         # Boutons d'action
         self.btn_emprunter = ctk.CTkButton(
             self.frame_emprunt,
@@ -70,51 +81,16 @@ class InterfaceEmprunts(ctk.CTkFrame):
             font=ctk.CTkFont(size=16, weight="bold")
         )
         
-        # Tableau des emprunts avec scrollbar
-        self.frame_tableau = ctk.CTkScrollableFrame(
+        # Tableau virtualisé des emprunts : seules les lignes visibles sont créées
+        self.tableau = TableauVirtuel(
             self.frame_liste,
+            colonnes=[("ID", 50), ("Livre", 250), ("Emprunteur", 150),
+                      ("Emprunté le", 100), ("Retour prévu", 100), ("Statut", 100)],
+            formater=self._cellules_emprunt,
+            cle=lambda ligne: ligne[0].id,
             width=800,
             height=400
         )
-        
-        # En-têtes du tableau
-        self.frame_entetes = ctk.CTkFrame(self.frame_tableau)
-        self.label_id = ctk.CTkLabel(
-            self.frame_entetes,
-            text="ID",
-            width=50,
-            font=ctk.CTkFont(weight="bold")
-        )
-        self.label_livre = ctk.CTkLabel(
-            self.frame_entetes,
-            text="Livre",
-            width=250,
-            font=ctk.CTkFont(weight="bold")
-        )
-        self.label_emprunteur_col = ctk.CTkLabel(
-            self.frame_entetes,
-            text="Emprunteur",
-            width=150,
-            font=ctk.CTkFont(weight="bold")
-        )
-        self.label_date_emprunt = ctk.CTkLabel(
-            self.frame_entetes,
-            text="Emprunté le",
-            width=100,
-            font=ctk.CTkFont(weight="bold")
-        )
-        self.label_date_retour = ctk.CTkLabel(
-            self.frame_entetes,
-            text="Retour prévu",
-            width=100,
-            font=ctk.CTkFont(weight="bold")
-        )
-        self.label_statut = ctk.CTkLabel(
-            self.frame_entetes,
-            text="Statut",
-            width=100,
-            font=ctk.CTkFont(weight="bold")
-        )
     
     def _placer_widgets(self):
         """Place les widgets dans l'interface."""
@@ -128,6 +104,7 @@ class InterfaceEmprunts(ctk.CTkFrame):
         
         self.entry_livre_id.pack(side="left", padx=5)
         self.entry_emprunteur.pack(side="left", padx=5)
+        self.entry_exemplaire.pack(side="left", padx=5)
         
         # Frame pour les boutons
         frame_boutons = ctk.CTkFrame(self.frame_emprunt)
@@ -139,16 +116,7 @@ class InterfaceEmprunts(ctk.CTkFrame):
         # Frame de la liste
         self.frame_liste.pack(pady=10, padx=10, fill="both", expand=True)
         self.label_liste.pack(pady=5)
-        self.frame_tableau.pack(expand=True, fill="both", padx=10, pady=10)
-        
-        # En-têtes du tableau
-        self.frame_entetes.pack(fill="x", padx=5, pady=5)
-        self.label_id.pack(side="left", padx=5)
-        self.label_livre.pack(side="left", padx=5)
-        self.label_emprunteur_col.pack(side="left", padx=5)
-        self.label_date_emprunt.pack(side="left", padx=5)
-        self.label_date_retour.pack(side="left", padx=5)
-        self.label_statut.pack(side="left", padx=5)
+        self.tableau.pack(expand=True, fill="both", padx=10, pady=10)
     
     def _emprunter_livre(self):
         """Gère l'emprunt d'un livre."""
@@ -163,7 +131,6 @@ class InterfaceEmprunts(ctk.CTkFrame):
             emprunt = self.bibliotheque.emprunter_livre(livre_id, emprunteur)
             messagebox.showinfo("Succès", "Livre emprunté avec succès")
             self._vider_champs()
-            self.rafraichir_liste()
             
         except ValueError as e:
             messagebox.showerror("Erreur", str(e))
@@ -181,14 +148,15 @@ class InterfaceEmprunts(ctk.CTkFrame):
                 
             try:
                 livre_id = int(livre_id_str)
+                exemplaire_str = self.entry_exemplaire.get().strip()
+                exemplaire_id = int(exemplaire_str) if exemplaire_str else None
             except ValueError:
-                messagebox.showerror("Erreur", "L'ID du livre doit être un nombre")
+                messagebox.showerror("Erreur", "Les numéros de livre et d'exemplaire doivent être des nombres")
                 return
             
-            if self.bibliotheque.retourner_livre(livre_id):
+            if self.bibliotheque.retourner_livre(livre_id, exemplaire_id):
                 messagebox.showinfo("Succès", "Livre retourné avec succès")
                 self._vider_champs()
-                self.rafraichir_liste()
             
         except ValueError as e:
             messagebox.showerror("Erreur", str(e))
@@ -199,21 +167,21 @@ class InterfaceEmprunts(ctk.CTkFrame):
         """Vide les champs de saisie."""
         self.entry_livre_id.delete(0, "end")
         self.entry_emprunteur.delete(0, "end")
+        self.entry_exemplaire.delete(0, "end")
     
-    def _creer_ligne_emprunt(self, emprunt: Emprunt, livre: Livre) -> ctk.CTkFrame:
+    def _cellules_emprunt(self, ligne: Tuple[Emprunt, Livre]) -> List:
         """
-        Crée une ligne dans le tableau pour un emprunt.
+        Retourne le contenu des cellules d'une ligne du tableau.
         
         Args:
-            emprunt (Emprunt): L'emprunt à afficher
-            livre (Livre): Le livre emprunté
+            ligne (Tuple[Emprunt, Livre]): L'emprunt et le livre emprunté
             
         Returns:
-            ctk.CTkFrame: La frame contenant la ligne
+            List: Textes des cellules, le statut étant accompagné de sa couleur
         """
-        frame = ctk.CTkFrame(self.frame_tableau)
+        emprunt, livre = ligne
         
-        # Déterminer le statut et la couleur
+        # Déterminer le statut et la couleur (retard calculé par la requête SQL)
         if emprunt.est_en_retard:
             status = "En retard"
             color = "red"
@@ -224,24 +192,56 @@ class InterfaceEmprunts(ctk.CTkFrame):
             status = "Retourné"
             color = "gray"
         
-        ctk.CTkLabel(frame, text=str(emprunt.id), width=50).pack(side="left", padx=5)
-        ctk.CTkLabel(frame, text=f"{livre.titre} ({livre.auteur})", width=250).pack(side="left", padx=5)
-        ctk.CTkLabel(frame, text=emprunt.emprunteur, width=150).pack(side="left", padx=5)
-        ctk.CTkLabel(frame, text=emprunt.date_emprunt, width=100).pack(side="left", padx=5)
-        ctk.CTkLabel(frame, text=emprunt.date_retour_prevue, width=100).pack(side="left", padx=5)
-        ctk.CTkLabel(frame, text=status, width=100, text_color=color).pack(side="left", padx=5)
+        return [
+            str(emprunt.id),
+            f"{livre.titre} ({livre.auteur}) - ex. {emprunt.exemplaire_id}",
+            emprunt.emprunteur,
+            emprunt.date_emprunt,
+            emprunt.date_retour_prevue,
+            (status, color),
+        ]
+    
+    def _sur_changement(self, changement: Changement):
+        """
+        Reporte un changement validé dans le tableau, sans recharger la liste.
         
-        return frame
+        Les lignes sont identifiées par l'ID de l'emprunt. Un nouvel emprunt a
+        la date de retour prévue la plus tardive : il se place en fin de liste.
+        Un livre modifié met à jour les lignes de ses exemplaires empruntés.
+        
+        Args:
+            changement (Changement): Le changement notifié par la bibliothèque
+        """
+        if changement.ids is None:
+            return
+        if changement.table == "livres":
+            if changement.action == MODIFIE:
+                for livre_id in changement.ids:
+                    for ligne in self.bibliotheque.obtenir_emprunts_en_cours_livre(livre_id):
+                        self.tableau.remplacer(ligne[0].id, ligne)
+            return
+        
+        self._mettre_a_jour_titre()
+        for emprunt_id in changement.ids:
+            if changement.action == INSERE:
+                ligne = self.bibliotheque.obtenir_emprunt(emprunt_id)
+                if ligne is not None:
+                    self.tableau.ajouter(ligne)
+            elif not self.tableau.retirer(emprunt_id):
+                # Emprunt retourné hors des pages en mémoire : positions inconnues
+                self.rafraichir_liste()
+    
+    def _mettre_a_jour_titre(self):
+        """Affiche le nombre d'emprunts en retard dans le titre de la liste."""
+        en_retard = self.bibliotheque.compter_emprunts_en_retard()
+        self.label_liste.configure(
+            text=f"Emprunts en cours ({en_retard} en retard)" if en_retard else "Emprunts en cours"
+        )
     
     def rafraichir_liste(self):
-        """Rafraîchit la liste des emprunts."""
-        # Supprimer toutes les lignes existantes sauf les en-têtes
-        for widget in self.frame_tableau.winfo_children():
-            if widget != self.frame_entetes:
-                widget.destroy()
-        
-        # Récupérer et afficher les emprunts en cours
-        emprunts = self.bibliotheque.obtenir_emprunts_en_cours()
-        for emprunt, livre in emprunts:
-            ligne = self._creer_ligne_emprunt(emprunt, livre)
-            ligne.pack(fill="x", padx=5, pady=2) 
\ No newline at end of file
+        """Rafraîchit la liste des emprunts (chargée page par page pendant le défilement)."""
+        self._mettre_a_jour_titre()
+        self.tableau.definir_source(
+            self.bibliotheque.compter_emprunts_en_cours(),
+            lambda debut, nombre: self.bibliotheque.obtenir_emprunts_en_cours_page(debut // nombre, nombre)
+        )
\ No newline at end of file
@@ -4,19 +4,23 @@ from typing import Callable, List, Optional
 from datetime import datetime
 from models.livre import Livre
 from models.bibliotheque import Bibliotheque
+from models.evenements import Changement, INSERE, MODIFIE, SUPPRIME
 from views.interface_emprunts import InterfaceEmprunts
+from views.recherche_asynchrone import RechercheAsynchrone
+from views.tableau_virtuel import TableauVirtuel
 
 class InterfaceGraphique:
     """
     Classe gérant l'interface graphique moderne de l'application avec CustomTkinter.
     """
     
-    def __init__(self, bibliotheque: Bibliotheque):
+    def __init__(self, bibliotheque: Bibliotheque, delai_recherche_ms: int = 250):
         """
         Initialise l'interface graphique moderne.
         
         Args:
             bibliotheque (Bibliotheque): Instance de la classe Bibliotheque
+            delai_recherche_ms (int): Délai d'anti-rebond de la recherche dynamique
         """
         # Configuration de CustomTkinter
         ctk.set_appearance_mode("system")  # Modes: system (default), light, dark
@@ -41,9 +45,19 @@ class InterfaceGraphique:
         # Onglet Emprunts
         self.tab_emprunts = self.notebook.add("Emprunts")
         
+        # Recherche exécutée hors du thread de l'interface
+        self.terme_recherche = ""
+        self.recherche = RechercheAsynchrone(
+            self.fenetre,
+            bibliotheque.db_path,
+            self._afficher_resultats_recherche,
+            delai_ms=delai_recherche_ms
+        )
+        
         self._creer_widgets()
         self._placer_widgets()
         self.rafraichir_liste()
+        self.bibliotheque.abonner(self._sur_changement)
     
     def _creer_widgets(self):
         """Crée tous les widgets modernes de l'interface."""
@@ -127,40 +141,17 @@ class InterfaceGraphique:
             font=ctk.CTkFont(size=20, weight="bold")
         )
         
-        # Tableau des livres avec scrollbar
-        self.frame_tableau = ctk.CTkScrollableFrame(
+        # Tableau virtualisé des livres : seules les lignes visibles sont créées
+        self.tableau = TableauVirtuel(
             self.frame_liste,
-            width=700,
+            colonnes=[("ID", 50), ("Titre", 300), ("Auteur", 200), ("Date", 100),
+                      ("Disponibles", 100)],
+            formater=self._cellules_livre,
+            sur_selection=self._selection_livre,
+            width=800,
             height=600
         )
         
-        # En-têtes du tableau
-        self.frame_entetes = ctk.CTkFrame(self.frame_tableau)
-        self.label_id = ctk.CTkLabel(
-            self.frame_entetes,
-            text="ID",
-            width=50,
-            font=ctk.CTkFont(weight="bold")
-        )
-        self.label_titre_col = ctk.CTkLabel(
-            self.frame_entetes,
-            text="Titre",
-            width=300,
-            font=ctk.CTkFont(weight="bold")
-        )
-        self.label_auteur_col = ctk.CTkLabel(
-            self.frame_entetes,
-            text="Auteur",
-            width=200,
-            font=ctk.CTkFont(weight="bold")
-        )
-        self.label_date_col = ctk.CTkLabel(
-            self.frame_entetes,
-            text="Date",
-            width=100,
-            font=ctk.CTkFont(weight="bold")
-        )
-        
         # Switch pour le thème
         self.switch_theme = ctk.CTkSwitch(
             self.frame_controles,
@@ -229,14 +220,7 @@ class InterfaceGraphique:
         # Frame de la liste (droite)
         self.frame_liste.grid(row=0, column=1, padx=20, pady=20, sticky="nsew")
         self.label_liste.pack(pady=10)
-        self.frame_tableau.pack(expand=True, fill="both", padx=10, pady=10)
-        
-        # En-têtes du tableau
-        self.frame_entetes.pack(fill="x", padx=5, pady=5)
-        self.label_id.pack(side="left", padx=5)
-        self.label_titre_col.pack(side="left", padx=5)
-        self.label_auteur_col.pack(side="left", padx=5)
-        self.label_date_col.pack(side="left", padx=5)
+        self.tableau.pack(expand=True, fill="both", padx=10, pady=10)
         
         # Interface des emprunts
         self.interface_emprunts.pack(expand=True, fill="both")
@@ -322,24 +306,41 @@ class InterfaceGraphique:
             self.bibliotheque.ajouter_livre(livre)
             messagebox.showinfo("Succès", "Le livre a été ajouté avec succès")
             self._vider_champs()
-            self.rafraichir_liste()
         except ValueError as e:
             messagebox.showerror("Erreur", str(e))
     
     def _recherche_dynamique(self, event):
         """
-        Effectue une recherche dynamique lors de la saisie.
+        Programme une recherche dynamique lors de la saisie.
+        
+        La recherche est exécutée en arrière-plan après un délai d'anti-rebond ;
+        les frappes suivantes annulent les recherches devenues obsolètes.
         
         Args:
             event: L'événement de saisie
         """
         terme = self.entry_recherche.get().strip()
+        if terme == self.terme_recherche:
+            return
+        self.terme_recherche = terme
+        
         if not terme:
+            self.recherche.annuler()
             self.rafraichir_liste()
             return
         
-        livres = self.bibliotheque.rechercher_livre(terme)
-        self._afficher_livres(livres)
+        self.recherche.lancer(terme)
+    
+    def _afficher_resultats_recherche(self, terme: str, livres: List[Livre]):
+        """
+        Affiche les résultats d'une recherche terminée.
+        
+        Args:
+            terme (str): Le terme recherché
+            livres (List[Livre]): Les livres trouvés
+        """
+        if terme == self.terme_recherche:
+            self._afficher_livres(livres)
     
     def _mettre_a_jour_livre(self):
         """Met à jour le livre sélectionné."""
@@ -361,7 +362,6 @@ class InterfaceGraphique:
             if self.bibliotheque.mettre_a_jour_livre(livre):
                 messagebox.showinfo("Succès", "Le livre a été mis à jour avec succès")
                 self._vider_champs()
-                self.rafraichir_liste()
                 self.btn_modifier.configure(state="disabled")
                 self.btn_supprimer.configure(state="disabled")
             else:
@@ -394,25 +394,18 @@ class InterfaceGraphique:
         if hasattr(self, 'livre_selectionne'):
             delattr(self, 'livre_selectionne')
     
-    def _creer_ligne_livre(self, livre: Livre) -> ctk.CTkFrame:
+    def _cellules_livre(self, livre: Livre) -> List[str]:
         """
-        Crée une ligne dans le tableau pour un livre.
+        Retourne le contenu des cellules d'une ligne du tableau.
         
         Args:
             livre (Livre): Le livre à afficher
             
         Returns:
-            ctk.CTkFrame: La frame contenant la ligne du livre
+            List[str]: ID, titre, auteur, date de publication et exemplaires disponibles
         """
-        frame = ctk.CTkFrame(self.frame_tableau)
-        
-        ctk.CTkLabel(frame, text=str(livre.id), width=50).pack(side="left", padx=5)
-        ctk.CTkLabel(frame, text=livre.titre, width=300).pack(side="left", padx=5)
-        ctk.CTkLabel(frame, text=livre.auteur, width=200).pack(side="left", padx=5)
-        ctk.CTkLabel(frame, text=livre.date_publication, width=100).pack(side="left", padx=5)
-        
-        frame.bind("<Button-1>", lambda e, l=livre: self._selection_livre(l))
-        return frame
+        return [str(livre.id), livre.titre, livre.auteur, livre.date_publication,
+                f"{livre.exemplaires_disponibles} / {livre.nombre_exemplaires}"]
     
     def _afficher_livres(self, livres: List[Livre]):
         """
@@ -421,19 +414,47 @@ class InterfaceGraphique:
         Args:
             livres (List[Livre]): La liste des livres à afficher
         """
-        # Supprime toutes les lignes existantes sauf les en-têtes
-        for widget in self.frame_tableau.winfo_children():
-            if widget != self.frame_entetes:
-                widget.destroy()
-        
-        # Ajoute les nouvelles lignes
-        for livre in livres:
-            ligne = self._creer_ligne_livre(livre)
-            ligne.pack(fill="x", padx=5, pady=2)
+        self.tableau.afficher_liste(livres)
+    
+    def _sur_changement(self, changement: Changement):
+        """
+        Reporte un changement validé dans le tableau, sans recharger la liste.
+        
+        Le catalogue est trié par ID : un nouveau livre se place en fin de
+        liste. Pendant une recherche, un ajout relance la recherche.
+        
+        Args:
+            changement (Changement): Le changement notifié par la bibliothèque
+        """
+        if changement.table != "livres":
+            return
+        if changement.ids is None or (changement.action == INSERE and self.terme_recherche):
+            if self.terme_recherche:
+                self.recherche.lancer(self.terme_recherche)
+            else:
+                self.rafraichir_liste()
+            return
+        
+        for livre_id in changement.ids:
+            if changement.action == SUPPRIME:
+                if not self.tableau.retirer(livre_id) and not self.terme_recherche:
+                    # Livre hors des pages en mémoire : positions inconnues
+                    self.rafraichir_liste()
+            else:
+                livre = self.bibliotheque.obtenir_livre(livre_id)
+                if livre is None:
+                    continue
+                if changement.action == MODIFIE:
+                    self.tableau.remplacer(livre_id, livre)
+                else:
+                    self.tableau.ajouter(livre)
     
     def rafraichir_liste(self):
-        """Rafraîchit la liste des livres."""
-        self._afficher_livres(self.bibliotheque.obtenir_tous_les_livres())
+        """Rafraîchit la liste des livres (chargée page par page pendant le défilement)."""
+        self.tableau.definir_source(
+            self.bibliotheque.compter_livres(),
+            lambda debut, nombre: self.bibliotheque.obtenir_livres_page(debut // nombre, nombre)
+        )
     
     def _supprimer_livre(self):
         """Supprime le livre sélectionné."""
@@ -444,10 +465,15 @@ class InterfaceGraphique:
         if not messagebox.askyesno("Confirmation", "Voulez-vous vraiment supprimer ce livre ?"):
             return
         
-        if self.bibliotheque.supprimer_livre(self.livre_selectionne.id):
+        try:
+            supprime = self.bibliotheque.supprimer_livre(self.livre_selectionne.id)
+        except ValueError as e:
+            messagebox.showerror("Erreur", str(e))
+            return
+        
+        if supprime:
             messagebox.showinfo("Succès", "Le livre a été supprimé avec succès")
             self._vider_champs()
-            self.rafraichir_liste()
             self.btn_modifier.configure(state="disabled")
             self.btn_supprimer.configure(state="disabled")
         else:
@@ -455,4 +481,7 @@ class InterfaceGraphique:
     
     def demarrer(self):
         """Démarre l'application."""
-        self.fenetre.mainloop() 
\ No newline at end of file
+        try:
+            self.fenetre.mainloop()
+        finally:
+            self.recherche.arreter() 
\ No newline at end of file
@@ -0,0 +1,145 @@
+import queue
+import sqlite3
+import threading
+from typing import Callable, List
+from models.livre import Livre
+from models.bibliotheque import Bibliotheque
+
+class RechercheAsynchrone:
+    """
+    Exécute les recherches de livres hors du thread de l'interface.
+
+    Les recherches sont retardées d'un délai d'anti-rebond : chaque frappe
+    annule la recherche programmée par la précédente. Un thread de travail
+    dispose de sa propre connexion SQLite en lecture seule ; une recherche devenue obsolète
+    est interrompue (Connection.interrupt) ou son résultat ignoré. Les
+    résultats sont rendus au thread Tk par after(), jamais directement
+    depuis le thread de travail.
+    """
+
+    INTERVALLE_SURVEILLANCE = 20  # Intervalle de lecture des résultats (ms)
+
+    def __init__(self, widget, db_path: str, rappel: Callable[[str, List[Livre]], None],
+                 delai_ms: int = 250):
+        """
+        Initialise la recherche asynchrone et démarre le thread de travail.
+
+        Args:
+            widget: Widget Tk servant à programmer les appels after()
+            db_path (str): Chemin de la base de données (fichier, pas ":memory:")
+            rappel (Callable): Appelée dans le thread Tk avec le terme et les livres trouvés
+            delai_ms (int): Délai d'anti-rebond en millisecondes
+        """
+        self.widget = widget
+        self.rappel = rappel
+        self.delai_ms = delai_ms
+
+        self._generation = 0
+        self._id_programmation = None
+        self._id_surveillance = None
+        self._generation_attendue = None
+        self._requetes = queue.Queue()
+        self._resultats = queue.Queue()
+        self._connexion = None
+        self._en_cours = threading.Event()
+
+        self._thread = threading.Thread(target=self._travailler, args=(db_path,), daemon=True)
+        self._thread.start()
+
+    def lancer(self, terme: str):
+        """
+        Programme une recherche après le délai d'anti-rebond.
+
+        Args:
+            terme (str): Terme de recherche
+        """
+        generation = self.annuler()
+        self._id_programmation = self.widget.after(
+            self.delai_ms, lambda: self._soumettre(generation, terme)
+        )
+
+    def annuler(self) -> int:
+        """
+        Annule la recherche programmée et rend obsolète celle en cours.
+
+        Returns:
+            int: Nouvelle génération de recherche
+        """
+        self._generation += 1
+        if self._id_programmation is not None:
+            self.widget.after_cancel(self._id_programmation)
+            self._id_programmation = None
+        if self._en_cours.is_set() and self._connexion is not None:
+            self._connexion.interrupt()
+        return self._generation
+
+    def arreter(self):
+        """Arrête le thread de travail."""
+        self.annuler()
+        if self._id_surveillance is not None:
+            self.widget.after_cancel(self._id_surveillance)
+            self._id_surveillance = None
+        self._requetes.put((None, None))
+
+    def _soumettre(self, generation: int, terme: str):
+        """Transmet la recherche au thread de travail (thread Tk)."""
+        self._id_programmation = None
+        self._generation_attendue = generation
+        self._requetes.put((generation, terme))
+        if self._id_surveillance is None:
+            self._surveiller()
+
+    def _surveiller(self):
+        """Livre les résultats disponibles à l'interface (thread Tk)."""
+        self._id_surveillance = None
+        while True:
+            try:
+                generation, terme, livres = self._resultats.get_nowait()
+            except queue.Empty:
+                break
+            if generation == self._generation:
+                self._generation_attendue = None
+                self.rappel(terme, livres)
+
+        # Continuer tant que la recherche courante n'a pas livré son résultat
+        if self._generation_attendue == self._generation:
+            self._id_surveillance = self.widget.after(self.INTERVALLE_SURVEILLANCE, self._surveiller)
+
+    def _travailler(self, db_path: str):
+        """Boucle du thread de travail : une connexion dédiée, une recherche à la fois."""
+        bibliotheque = Bibliotheque(db_path, profil="lecture_seule")
+        self._connexion = bibliotheque.conn
+        try:
+            while True:
+                generation, terme = self._requetes.get()
+                # Seule la requête la plus récente compte
+                while not self._requetes.empty():
+                    generation, terme = self._requetes.get_nowait()
+                if generation is None:
+                    break
+                if generation != self._generation:
+                    continue
+
+                livres = self._rechercher(bibliotheque, generation, terme)
+                if generation == self._generation:
+                    self._resultats.put((generation, terme, livres))
+        finally:
+            bibliotheque.deconnecter()
+
+    def _rechercher(self, bibliotheque: Bibliotheque, generation: int, terme: str) -> List[Livre]:
+        """
+        Exécute une recherche dans le thread de travail.
+
+        Une recherche encore d'actualité mais interrompue (l'interruption visait
+        la précédente) est relancée une fois.
+        """
+        for _ in range(2):
+            self._en_cours.set()
+            try:
+                return bibliotheque.rechercher_livre(terme)
+            except sqlite3.OperationalError:
+                if generation != self._generation:
+                    break
+            finally:
+                self._en_cours.clear()
+        return []
@@ -0,0 +1,345 @@
+import customtkinter as ctk
+from collections import OrderedDict
+from typing import Callable, List, Optional, Sequence, Tuple
+
+class TableauVirtuel(ctk.CTkFrame):
+    """
+    Tableau virtualisé : seules les lignes visibles existent sous forme de widgets.
+
+    Le tableau crée un nombre fixe de lignes (autant que la hauteur visible
+    en permet) et les réutilise lors du défilement en changeant simplement
+    leur texte. Les données sont demandées par pages à une fonction de
+    chargement ; seules quelques pages sont gardées en mémoire.
+
+    Après une modification, ajouter, remplacer et retirer corrigent les pages
+    en mémoire et ne redessinent que les lignes visibles concernées, sans
+    recharger la liste.
+    """
+
+    PAGES_EN_MEMOIRE = 8
+
+    def __init__(self, parent, colonnes: List[Tuple[str, int]],
+                 formater: Callable[[object], Sequence],
+                 sur_selection: Optional[Callable[[object], None]] = None,
+                 hauteur_ligne: int = 32, taille_page: int = 200,
+                 cle: Callable[[object], object] = lambda element: element.id, **kwargs):
+        """
+        Initialise le tableau.
+
+        Args:
+            parent: Widget parent
+            colonnes (List[Tuple[str, int]]): Titre et largeur de chaque colonne
+            formater (Callable): Retourne les cellules d'un élément ; une cellule est
+                un texte ou un couple (texte, couleur)
+            sur_selection (Callable, optional): Appelée avec l'élément cliqué
+            hauteur_ligne (int): Hauteur d'une ligne en pixels
+            taille_page (int): Nombre d'éléments chargés à la fois
+            cle (Callable): Retourne l'identifiant d'un élément (par défaut son attribut id)
+        """
+        super().__init__(parent, **kwargs)
+        self.colonnes = colonnes
+        self.formater = formater
+        self.sur_selection = sur_selection
+        self.hauteur_ligne = hauteur_ligne
+        self.taille_page = taille_page
+        self.cle = cle
+
+        self.total = 0
+        self.charger: Callable[[int, int], Sequence] = lambda debut, nombre: []
+        self.liste: Optional[list] = None
+        self.premier = 0
+        self.pages = OrderedDict()
+        self.lignes = []
+        self.nb_visibles = 1
+        self.couleur_texte = None
+
+        self._creer_widgets()
+
+    def _creer_widgets(self):
+        """Crée les en-têtes, la zone des lignes et la barre de défilement."""
+        self.grid_rowconfigure(1, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+
+        self.frame_entetes = ctk.CTkFrame(self)
+        for titre, largeur in self.colonnes:
+            ctk.CTkLabel(
+                self.frame_entetes,
+                text=titre,
+                width=largeur,
+                font=ctk.CTkFont(weight="bold")
+            ).pack(side="left", padx=5)
+        self.frame_entetes.grid(row=0, column=0, columnspan=2, sticky="ew", padx=5, pady=5)
+
+        self.frame_lignes = ctk.CTkFrame(self, fg_color="transparent")
+        self.frame_lignes.grid(row=1, column=0, sticky="nsew")
+        # La taille de la zone ne dépend pas des lignes : c'est elle qui fixe leur nombre
+        self.frame_lignes.pack_propagate(False)
+        self.frame_lignes.bind("<Configure>", self._redimensionner)
+
+        self.scrollbar = ctk.CTkScrollbar(self, command=self._defiler)
+        self.scrollbar.grid(row=1, column=1, sticky="ns")
+
+        self._lier_molette(self.frame_lignes)
+
+    def _lier_molette(self, widget):
+        """Associe la molette de la souris au défilement du tableau."""
+        widget.bind("<MouseWheel>", self._molette)
+        widget.bind("<Button-4>", lambda e: self._deplacer(-3))
+        widget.bind("<Button-5>", lambda e: self._deplacer(3))
+
+    def _creer_ligne(self) -> Tuple[ctk.CTkFrame, List[ctk.CTkLabel]]:
+        """
+        Crée une ligne réutilisable du tableau.
+
+        Returns:
+            Tuple[ctk.CTkFrame, List[ctk.CTkLabel]]: La ligne et ses cellules
+        """
+        position = len(self.lignes)
+        frame = ctk.CTkFrame(self.frame_lignes, height=self.hauteur_ligne - 4)
+        labels = []
+        for _, largeur in self.colonnes:
+            label = ctk.CTkLabel(frame, text="", width=largeur)
+            label.pack(side="left", padx=5)
+            label.bind("<Button-1>", lambda e, p=position: self._clic(p))
+            self._lier_molette(label)
+            labels.append(label)
+        frame.bind("<Button-1>", lambda e, p=position: self._clic(p))
+        self._lier_molette(frame)
+        if self.couleur_texte is None:
+            self.couleur_texte = labels[0].cget("text_color")
+        return frame, labels
+
+    def definir_source(self, total: int, charger: Callable[[int, int], Sequence]):
+        """
+        Définit la source de données du tableau.
+
+        Args:
+            total (int): Nombre total d'éléments
+            charger (Callable[[int, int], Sequence]): Retourne les éléments à partir
+                d'une position (début, nombre)
+        """
+        self.total = total
+        self.charger = charger
+        self.liste = None
+        self.pages.clear()
+        self.premier = min(self.premier, max(0, total - self.nb_visibles))
+        self._rendre()
+
+    def afficher_liste(self, elements: Sequence):
+        """
+        Affiche une liste déjà chargée en mémoire.
+
+        Args:
+            elements (Sequence): Les éléments à afficher
+        """
+        liste = list(elements)
+        self.premier = 0
+        self.definir_source(len(liste), lambda debut, nombre: liste[debut:debut + nombre])
+        self.liste = liste
+
+    def rafraichir(self):
+        """Oublie les pages chargées et redessine les lignes visibles."""
+        self.pages.clear()
+        self._rendre()
+
+    def ajouter(self, element):
+        """
+        Ajoute un élément à la fin du tableau.
+
+        Args:
+            element: L'élément ajouté
+        """
+        index = self.total
+        self.total += 1
+        if self.liste is not None:
+            self.liste.append(element)
+        numero_page, position = divmod(index, self.taille_page)
+        page = self.pages.get(numero_page)
+        if page is not None:
+            if len(page) == position:
+                page.append(element)
+            else:
+                del self.pages[numero_page]
+
+        if self.premier <= index < self.premier + self.nb_visibles:
+            self._rendre_ligne(index - self.premier)
+        self._mettre_a_jour_defilement()
+
+    def remplacer(self, cle, element) -> bool:
+        """
+        Remplace l'élément ayant un identifiant donné.
+
+        Args:
+            cle: Identifiant de l'élément (voir le paramètre cle du constructeur)
+            element: Le nouvel élément
+
+        Returns:
+            bool: True si l'élément était chargé (donc remplacé)
+        """
+        if self.liste is not None:
+            for index, ancien in enumerate(self.liste):
+                if self.cle(ancien) == cle:
+                    self.liste[index] = element
+                    break
+        emplacement = self._localiser(cle)
+        if emplacement is None:
+            return False
+
+        numero_page, position = emplacement
+        self.pages[numero_page][position] = element
+        index = numero_page * self.taille_page + position
+        if self.premier <= index < self.premier + self.nb_visibles:
+            self._rendre_ligne(index - self.premier)
+        return True
+
+    def retirer(self, cle) -> bool:
+        """
+        Retire l'élément ayant un identifiant donné.
+
+        Les pages qui suivent l'élément sont oubliées (leurs positions sont
+        décalées) ; seules les lignes visibles sont redessinées.
+
+        Args:
+            cle: Identifiant de l'élément (voir le paramètre cle du constructeur)
+
+        Returns:
+            bool: True si l'élément était chargé (donc retiré) ; sinon la source
+                doit être redéfinie pour tenir compte de la suppression
+        """
+        if self.liste is not None:
+            for index, ancien in enumerate(self.liste):
+                if self.cle(ancien) == cle:
+                    del self.liste[index]
+                    break
+        emplacement = self._localiser(cle)
+        if emplacement is None:
+            return False
+
+        numero_page, position = emplacement
+        for numero in [numero for numero in self.pages if numero >= numero_page]:
+            del self.pages[numero]
+        index = numero_page * self.taille_page + position
+        self.total -= 1
+        self.premier = max(0, min(self.premier, self.total - self.nb_visibles))
+        if index < self.premier + self.nb_visibles:
+            self._rendre()
+        else:
+            self._mettre_a_jour_defilement()
+        return True
+
+    def _localiser(self, cle) -> Optional[Tuple[int, int]]:
+        """
+        Cherche un élément parmi les pages en mémoire.
+
+        Args:
+            cle: Identifiant de l'élément
+
+        Returns:
+            Optional[Tuple[int, int]]: Numéro de page et position dans la page, ou None
+        """
+        for numero_page, page in self.pages.items():
+            for position, element in enumerate(page):
+                if self.cle(element) == cle:
+                    return numero_page, position
+        return None
+
+    def _element(self, index: int):
+        """
+        Retourne l'élément à une position, en chargeant sa page si besoin.
+
+        Args:
+            index (int): Position de l'élément
+        """
+        numero_page = index // self.taille_page
+        page = self.pages.get(numero_page)
+        if page is None:
+            page = list(self.charger(numero_page * self.taille_page, self.taille_page))
+            self.pages[numero_page] = page
+            if len(self.pages) > self.PAGES_EN_MEMOIRE:
+                self.pages.popitem(last=False)
+        else:
+            self.pages.move_to_end(numero_page)
+        position = index - numero_page * self.taille_page
+        return page[position] if position < len(page) else None
+
+    def _rendre(self):
+        """Met à jour le texte des lignes visibles et la barre de défilement."""
+        for position in range(len(self.lignes)):
+            self._rendre_ligne(position)
+        self._mettre_a_jour_defilement()
+
+    def _rendre_ligne(self, position: int):
+        """
+        Met à jour une ligne du tableau.
+
+        Args:
+            position (int): Position de la ligne parmi les lignes visibles
+        """
+        if position >= len(self.lignes):
+            return
+        frame, labels = self.lignes[position]
+        index = self.premier + position
+        element = None
+        if position < self.nb_visibles and index < self.total:
+            element = self._element(index)
+        if element is None:
+            # Lignes inutilisées : masquées mais conservées pour être réutilisées
+            frame.pack_forget()
+            return
+
+        for label, cellule in zip(labels, self.formater(element)):
+            texte, couleur = cellule if isinstance(cellule, tuple) else (cellule, None)
+            label.configure(text=texte, text_color=couleur or self.couleur_texte)
+        if not frame.winfo_manager():
+            frame.pack(fill="x", padx=5, pady=2)
+
+    def _mettre_a_jour_defilement(self):
+        """Met à jour la barre de défilement."""
+        if self.total:
+            self.scrollbar.set(self.premier / self.total,
+                               min(1.0, (self.premier + self.nb_visibles) / self.total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def _redimensionner(self, event):
+        """Ajuste le nombre de lignes réutilisables à la hauteur disponible."""
+        nb_visibles = max(1, event.height // self.hauteur_ligne)
+        if nb_visibles == self.nb_visibles and self.lignes:
+            return
+        self.nb_visibles = nb_visibles
+        while len(self.lignes) < nb_visibles:
+            self.lignes.append(self._creer_ligne())
+        self.premier = max(0, min(self.premier, self.total - self.nb_visibles))
+        self._rendre()
+
+    def _deplacer(self, nombre: int):
+        """
+        Fait défiler le tableau d'un nombre de lignes.
+
+        Args:
+            nombre (int): Nombre de lignes (négatif vers le haut)
+        """
+        premier = max(0, min(self.premier + nombre, self.total - self.nb_visibles))
+        if premier != self.premier:
+            self.premier = premier
+            self._rendre()
+
+    def _defiler(self, action, valeur, unite=None):
+        """Gère les commandes de la barre de défilement (moveto / scroll)."""
+        if action == "moveto":
+            self._deplacer(int(float(valeur) * self.total) - self.premier)
+        elif action == "scroll":
+            pas = self.nb_visibles if unite == "pages" else 1
+            self._deplacer(int(valeur) * pas)
+
+    def _molette(self, event):
+        """Gère la molette de la souris (Windows et macOS)."""
+        self._deplacer(-3 if event.delta > 0 else 3)
+
+    def _clic(self, position: int):
+        """Transmet l'élément de la ligne cliquée."""
+        index = self.premier + position
+        if self.sur_selection and index < self.total:
+            element = self._element(index)
+            if element is not None:
+                self.sur_selection(element)